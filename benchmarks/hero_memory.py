@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""Память на одного героя после загрузки базы.
+
+Запуск из корня репозитория:
+    python benchmarks/hero_memory.py [путь к json]
+"""
+import gc
+import sys
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.data.loader import load_heroes  # noqa: E402
+
+DEFAULT_FILE = ROOT / "src" / "data" / "heroes_extended.json"
+
+
+def measure(path: Path):
+    gc.collect()
+    tracemalloc.start()
+    heroes = load_heroes(path)
+    gc.collect()
+    core, _ = tracemalloc.get_traced_memory()
+
+    # описания и билды создаются лениво: считаем их отдельно
+    for hero in heroes.values():
+        hero.builds
+    gc.collect()
+    full, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    count = len(heroes)
+    print(f"{path.name}: {count} heroes")
+    print(f"  core:           {core / 1024:8.1f} KiB total, {core / count:7.0f} B/hero")
+    print(f"  with details:   {full / 1024:8.1f} KiB total, {full / count:7.0f} B/hero")
+    return heroes
+
+
+if __name__ == "__main__":
+    measure(Path(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_FILE)
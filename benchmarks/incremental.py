@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""Пошаговая оценка драфта: сверка IncrementalScorer с predict и скорость шага.
+
+Запуск из корня репозитория:
+    python benchmarks/incremental.py [число шагов]
+
+Случайно добавляет, убирает и меняет героев; после каждого шага оценка
+сравнивается с полным predict. Прогон идёт по графу контрпиков и со
+случайной матрицей матчапов (нужен numpy, как в predict_batch.py).
+"""
+import asyncio
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.data.heroes_db import HeroDatabase  # noqa: E402
+from src.data.matchup_matrix import set_matchup_matrix  # noqa: E402
+from src.ml.incremental import DIRE, RADIANT, IncrementalScorer  # noqa: E402
+from src.ml.predictor import MatchPredictor  # noqa: E402
+
+HEROES_FILE = ROOT / "src" / "data" / "heroes_extended.json"
+
+
+def make_steps(db: HeroDatabase, count: int, seed: int = 0):
+    """Случайные шаги (действие, сторона, герой[, новый герой]) вокруг драфта 5 на 5"""
+    rng = random.Random(seed)
+    heroes = list(range(len(db.index)))
+    teams = {RADIANT: [], DIRE: []}
+    steps = []
+    while len(steps) < count:
+        side = rng.choice((RADIANT, DIRE))
+        team = teams[side]
+        free = [h for h in heroes if h not in teams[RADIANT] and h not in teams[DIRE]]
+        action = rng.choice(("add", "remove", "swap"))
+        if action == "add" and len(team) < 5:
+            hero = rng.choice(free)
+            team.append(hero)
+            steps.append(("add", side, hero))
+        elif action == "remove" and team:
+            hero = rng.choice(team)
+            team.remove(hero)
+            steps.append(("remove", side, hero))
+        elif action == "swap" and team:
+            old, new = rng.choice(team), rng.choice(free)
+            team[team.index(old)] = new
+            steps.append(("swap", side, old, new))
+    return steps
+
+
+def apply(scorer: IncrementalScorer, step):
+    getattr(scorer, step[0])(*step[1:])
+
+
+async def compare(predictor: MatchPredictor, db: HeroDatabase, steps) -> float:
+    scorer = IncrementalScorer(predictor=predictor, db=db)
+    worst = 0.0
+    for step in steps:
+        apply(scorer, step)
+        got = scorer.score()
+        want = await predictor.predict(scorer.heroes(RADIANT), scorer.heroes(DIRE), db)
+        worst = max(
+            worst,
+            abs(got.win_probability_radiant - want.win_probability_radiant),
+            abs(got.synergy[0] - want.radiant.synergy_score),
+            abs(got.synergy[1] - want.dire.synergy_score),
+            abs(got.draft[0] - want.radiant.draft_score),
+            abs(got.draft[1] - want.dire.draft_score),
+            abs(got.meta[0] - want.radiant.meta_score),
+            abs(got.meta[1] - want.dire.meta_score),
+        )
+    return worst
+
+
+async def full(predictor: MatchPredictor, db: HeroDatabase, drafts):
+    for radiant, dire in drafts:
+        await predictor.predict(radiant, dire, db)
+
+
+def check(predictor: MatchPredictor, db: HeroDatabase, steps):
+    worst = asyncio.run(compare(predictor, db, steps))
+
+    # драфты после каждого шага — для замера полного пересчёта
+    scorer = IncrementalScorer(predictor=predictor, db=db)
+    drafts = []
+    for step in steps:
+        apply(scorer, step)
+        drafts.append((scorer.heroes(RADIANT), scorer.heroes(DIRE)))
+
+    start = time.perf_counter()
+    asyncio.run(full(predictor, db, drafts))
+    full_time = time.perf_counter() - start
+
+    scorer = IncrementalScorer(predictor=predictor, db=db)
+    start = time.perf_counter()
+    for step in steps:
+        apply(scorer, step)
+        scorer.score()
+    step_time = time.perf_counter() - start
+
+    count = len(steps)
+    print(f"  max abs difference: {worst:.2e}")
+    print(f"  predict:     {full_time / count * 1e6:8.1f} us/step")
+    print(f"  incremental: {step_time / count * 1e6:8.1f} us/step ({full_time / step_time:.0f}x)")
+    return worst
+
+
+def main(count: int):
+    db = HeroDatabase.load(HEROES_FILE)
+    steps = make_steps(db, count)
+    predictor = MatchPredictor()
+
+    print(f"{count} steps, {len(db)} heroes")
+    print("counter graph:")
+    worst = check(predictor, db, steps)
+
+    try:
+        from predict_batch import random_matrix
+    except ImportError:
+        print("random matrix: skipped (numpy is not installed)")
+    else:
+        set_matchup_matrix(random_matrix())
+        print("random matrix:")
+        worst = max(worst, check(predictor, db, steps))
+
+    if worst > 1e-9:
+        sys.exit(f"incremental scores differ from predict by {worst:.2e}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
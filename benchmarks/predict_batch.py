@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""Пакетное предсказание: сверка с predict и пропускная способность.
+
+Запуск из корня репозитория (нужен numpy):
+    python benchmarks/predict_batch.py [число драфтов]
+
+Прогон идёт дважды: по графу контрпиков и со случайной матрицей
+матчапов, покрывающей половину ростера.
+"""
+import asyncio
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import numpy as np  # noqa: E402
+
+from src.data.hero_roster import get_hero_roster  # noqa: E402
+from src.data.heroes_db import HeroDatabase  # noqa: E402
+from src.data.matchup_matrix import MatchupMatrix, set_matchup_matrix  # noqa: E402
+from src.ml.predictor import MatchPredictor  # noqa: E402
+
+HEROES_FILE = ROOT / "src" / "data" / "heroes_extended.json"
+
+
+def make_drafts(db: HeroDatabase, count: int, seed: int = 0):
+    rng = random.Random(seed)
+    heroes = range(len(db.index))
+    drafts = []
+    for _ in range(count):
+        picked = rng.sample(heroes, 10)
+        # неполные составы тоже проверяем
+        size = rng.choice((5, 5, 5, 4, 3, 1))
+        drafts.append((picked[:size], picked[5:]))
+    return drafts
+
+
+def random_matrix(seed: int = 0) -> MatchupMatrix:
+    rng = random.Random(seed)
+    roster = get_hero_roster()
+    ids = roster.ids()
+    matrix = MatchupMatrix(max(ids) + 1)
+    for hero_id in ids[::2]:
+        matrix.set_row(hero_id, [
+            {"hero_id": vs, "wins": rng.randint(0, 60), "games_played": rng.choice((0, 10, 60))}
+            for vs in ids if vs != hero_id
+        ])
+    return matrix
+
+
+async def scalar(predictor: MatchPredictor, db: HeroDatabase, drafts):
+    return [await predictor.predict(radiant, dire, db) for radiant, dire in drafts]
+
+
+def check(predictor: MatchPredictor, db: HeroDatabase, drafts):
+    start = time.perf_counter()
+    expected = asyncio.run(scalar(predictor, db, drafts))
+    scalar_time = time.perf_counter() - start
+
+    predictor.predict_batch(drafts[:10], db)
+    start = time.perf_counter()
+    batch = predictor.predict_batch(drafts, db)
+    batch_time = time.perf_counter() - start
+
+    columns = {
+        "radiant": (batch.win_probability_radiant, [p.win_probability_radiant for p in expected]),
+        "synergy": (batch.synergy, [(p.radiant.synergy_score, p.dire.synergy_score) for p in expected]),
+        "draft": (batch.draft, [(p.radiant.draft_score, p.dire.draft_score) for p in expected]),
+        "meta": (batch.meta, [(p.radiant.meta_score, p.dire.meta_score) for p in expected]),
+    }
+    worst = max(float(np.max(np.abs(got - np.array(want)))) for got, want in columns.values())
+
+    count = len(drafts)
+    print(f"  max abs difference: {worst:.2e}")
+    print(f"  scalar: {count / scalar_time:10.0f} drafts/s")
+    print(f"  batch:  {count / batch_time:10.0f} drafts/s ({scalar_time / batch_time:.0f}x)")
+    return worst
+
+
+def main(count: int):
+    db = HeroDatabase.load(HEROES_FILE)
+    drafts = make_drafts(db, count)
+    predictor = MatchPredictor()
+
+    worst = 0.0
+    for title, matrix in (("counter graph", None), ("matchup matrix", random_matrix())):
+        set_matchup_matrix(matrix)
+        print(f"{count} drafts, {len(db)} heroes, {title}")
+        worst = max(worst, check(predictor, db, drafts))
+
+    if worst > 1e-9:
+        sys.exit("batch results differ from predict")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
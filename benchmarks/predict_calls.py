@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""Сколько вызовов и времени уходит на одно предсказание.
+
+Запуск из корня репозитория:
+    python benchmarks/predict_calls.py [число драфтов]
+"""
+import asyncio
+import cProfile
+import pstats
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.data.heroes_db import HeroDatabase  # noqa: E402
+from src.ml.predictor import MatchPredictor  # noqa: E402
+
+HEROES_FILE = ROOT / "src" / "data" / "heroes_extended.json"
+# функции, вызовы которых считаем отдельно
+WATCHED = ("extract", "calculate_synergy", "calculate_counter_score", "team_context")
+
+
+def make_drafts(db: HeroDatabase, count: int, seed: int = 0):
+    rng = random.Random(seed)
+    heroes = range(len(db.index))
+    drafts = []
+    for _ in range(count):
+        picked = rng.sample(heroes, 10)
+        drafts.append((picked[:5], picked[5:]))
+    return drafts
+
+
+async def run(predictor: MatchPredictor, db: HeroDatabase, drafts):
+    for radiant, dire in drafts:
+        await predictor.predict(radiant, dire, db)
+
+
+def main(count: int):
+    db = HeroDatabase.load(HEROES_FILE)
+    drafts = make_drafts(db, count)
+    predictor = MatchPredictor()
+
+    asyncio.run(run(predictor, db, drafts[:50]))
+
+    start = time.perf_counter()
+    asyncio.run(run(predictor, db, drafts))
+    elapsed = time.perf_counter() - start
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    asyncio.run(run(predictor, db, drafts))
+    profiler.disable()
+    stats = pstats.Stats(profiler)
+
+    calls = {name: 0 for name in WATCHED}
+    for (_, _, func), (_, ncalls, *_rest) in stats.stats.items():
+        if func in calls:
+            calls[func] += ncalls
+
+    print(f"{count} predictions, {len(db)} heroes")
+    print(f"  latency:        {elapsed / count * 1e6:8.1f} us/prediction")
+    print(f"  function calls: {stats.total_calls / count:8.1f} per prediction")
+    for name, n in calls.items():
+        print(f"  {name + ':':24s}{n / count:6.1f} per prediction")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""Подбор следующего пика: сверка PickService с predict и время на весь пул героев.
+
+Запуск из корня репозитория:
+    python benchmarks/suggest.py [число драфтов]
+
+Для каждого драфта 4 на 5 (союзники за Свет и за Тьму) ранжируются все
+свободные герои; вероятность каждого кандидата сравнивается с predict.
+"""
+import asyncio
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.data.heroes_db import HeroDatabase  # noqa: E402
+from src.ml.incremental import DIRE, RADIANT  # noqa: E402
+from src.ml.predictor import MatchPredictor  # noqa: E402
+from src.services.pick_service import PickService  # noqa: E402
+
+HEROES_FILE = ROOT / "src" / "data" / "heroes_extended.json"
+
+
+def make_drafts(db: HeroDatabase, count: int, seed: int = 0):
+    rng = random.Random(seed)
+    heroes = range(len(db.index))
+    drafts = []
+    for _ in range(count):
+        picked = rng.sample(heroes, 9)
+        drafts.append((picked[:4], picked[4:]))
+    return drafts
+
+
+async def brute_force(predictor: MatchPredictor, db: HeroDatabase, allies, enemies, side: str):
+    """То, что раньше делал пользователь: /predict на каждого кандидата"""
+    result = {}
+    for hero in range(len(db.index)):
+        if hero in allies or hero in enemies:
+            continue
+        team = list(allies) + [hero]
+        if side == RADIANT:
+            pred = await predictor.predict(team, enemies, db)
+            result[hero] = pred.win_probability_radiant
+        else:
+            pred = await predictor.predict(enemies, team, db)
+            result[hero] = pred.win_probability_dire
+    return result
+
+
+def main(count: int):
+    db = HeroDatabase.load(HEROES_FILE)
+    drafts = make_drafts(db, count)
+    predictor = MatchPredictor()
+
+    worst = 0.0
+    rank_time = brute_time = 0.0
+    for side in (RADIANT, DIRE):
+        for allies, enemies in drafts:
+            start = time.perf_counter()
+            picks = PickService.rank_picks(allies, enemies, side, predictor, db)
+            rank_time += time.perf_counter() - start
+
+            start = time.perf_counter()
+            expected = asyncio.run(brute_force(predictor, db, allies, enemies, side))
+            brute_time += time.perf_counter() - start
+
+            worst = max([worst] + [abs(p.win_probability - expected[p.index]) for p in picks])
+
+    runs = 2 * count
+    print(f"{runs} rankings, {len(db)} heroes, {len(db) - 9} candidates each")
+    print(f"  max abs difference: {worst:.2e}")
+    print(f"  predict per candidate: {brute_time / runs * 1e3:6.2f} ms/ranking")
+    print(f"  rank_picks:            {rank_time / runs * 1e3:6.2f} ms/ranking ({brute_time / rank_time:.0f}x)")
+
+    if worst > 1e-9:
+        sys.exit(f"rank_picks differs from predict by {worst:.2e}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
@@ -1,11 +1,58 @@
+import asyncio
+import signal
+
 from telegram.ext import Application, CommandHandler, MessageHandler, CallbackQueryHandler, filters
-from config import BOT_TOKEN, logger
+from config import (
+    BOT_TOKEN, CACHE_DIR, OPENDOTA_CACHE_TTL, OPENDOTA_MAX_STALENESS, MAX_API_RETRIES,
+    OPENDOTA_RATE_PER_MINUTE, OPENDOTA_RATE_PER_DAY, UPDATE_INTERVAL,
+    CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RESET_TIMEOUT, CIRCUIT_LATENCY_THRESHOLD,
+    PREDICTION_NOISE, PREDICTION_CACHE_SIZE, PREDICTION_CACHE_TTL,
+    PREDICTION_STORE_SIZE, PREDICTION_STORE_TTL, logger
+)
+from src.api.circuit_breaker import CircuitBreaker
+from src.api.disk_cache import DiskCache
+from src.api.opendota import OpenDotaAPI
+from src.api.rate_limiter import RateLimiter
+from src.data.heroes_db import reload_hero_db
+from src.data.loader import HeroDataError
 from handlers.commands import CommandHandlers
 from handlers.heroes import HeroHandlers
-from handlers.stats import StatsHandlers
-from handlers.predict import PredictionHandlers
+from handlers.stats import StatsHandlers, STATS_SERVICE_KEY
+from handlers.predict import PredictionHandlers, PREDICTION_HANDLERS_KEY
 from handlers.callbacks import CallbackHandlers
 from handlers.errors import ErrorHandlers
+from src.services.stats_service import StatsService
+from src.services.prefetch import PrefetchScheduler
+from src.services.prediction_store import PredictionStore
+from src.ml.predictor import MatchPredictor
+from src.utils.cache import BoundedCache
+
+PREFETCH_KEY = "prefetch_scheduler"
+
+
+async def _on_startup(application: Application):
+    await application.bot_data[STATS_SERVICE_KEY].start()
+    logger.info("OpenDota session opened")
+    application.bot_data[PREFETCH_KEY].start()
+    
+    # kill -HUP <pid> перечитывает heroes.json без рестарта
+    if hasattr(signal, "SIGHUP"):
+        asyncio.get_running_loop().add_signal_handler(
+            signal.SIGHUP, lambda: asyncio.create_task(_reload_heroes())
+        )
+
+
+async def _reload_heroes():
+    try:
+        await reload_hero_db()
+    except HeroDataError as e:
+        logger.error(f"Hero database reload failed, keeping the previous one: {e}")
+
+
+async def _on_shutdown(application: Application):
+    await application.bot_data[PREFETCH_KEY].stop()
+    await application.bot_data[STATS_SERVICE_KEY].close()
+    logger.info("OpenDota session closed")
 
 
 def create_application():
@@ -14,15 +61,52 @@ def create_application():
     if not BOT_TOKEN:
         raise ValueError("BOT_TOKEN is empty!")
     
-    application = Application.builder().token(BOT_TOKEN).build()
+    application = (
+        Application.builder()
+        .token(BOT_TOKEN)
+        .post_init(_on_startup)
+        .post_shutdown(_on_shutdown)
+        .build()
+    )
+    
+    # Одна сессия OpenDota и общие кэши на весь процесс
+    api = OpenDotaAPI(
+        cache_ttl=OPENDOTA_CACHE_TTL,
+        max_staleness=OPENDOTA_MAX_STALENESS,
+        max_retries=MAX_API_RETRIES,
+        rate_limiter=RateLimiter(per_minute=OPENDOTA_RATE_PER_MINUTE, per_day=OPENDOTA_RATE_PER_DAY),
+        disk_cache=DiskCache(CACHE_DIR / "opendota.sqlite3"),
+        circuit_breaker=CircuitBreaker(
+            failure_threshold=CIRCUIT_FAILURE_THRESHOLD,
+            reset_timeout=CIRCUIT_RESET_TIMEOUT,
+            latency_threshold=CIRCUIT_LATENCY_THRESHOLD
+        )
+    )
+    stats_service = StatsService(
+        api=api,
+        matrix_path=CACHE_DIR / "matchups.bin",
+        roster_path=CACHE_DIR / "heroes.json"
+    )
+    application.bot_data[STATS_SERVICE_KEY] = stats_service
+    application.bot_data[PREFETCH_KEY] = PrefetchScheduler(stats_service, interval=UPDATE_INTERVAL)
     
-    predict_handlers = PredictionHandlers()
+    # Один предсказатель с кэшем на все команды и кнопки;
+    # кнопки предсказания берут готовый результат из хранилища по токену
+    predict_handlers = PredictionHandlers(
+        MatchPredictor(
+            noise=PREDICTION_NOISE,
+            cache=BoundedCache(max_entries=PREDICTION_CACHE_SIZE, ttl=PREDICTION_CACHE_TTL)
+        ),
+        PredictionStore(max_entries=PREDICTION_STORE_SIZE, ttl=PREDICTION_STORE_TTL)
+    )
+    application.bot_data[PREDICTION_HANDLERS_KEY] = predict_handlers
     
     # Команды
     application.add_handler(CommandHandler("start", CommandHandlers.start))
     application.add_handler(CommandHandler("help", CommandHandlers.help_command))
     application.add_handler(CommandHandler("list", CommandHandlers.list_heroes))
     application.add_handler(CommandHandler("about", CommandHandlers.about))
+    application.add_handler(CommandHandler("reload", CommandHandlers.reload_command))
     
     # Герои
     application.add_handler(CommandHandler("hero", HeroHandlers.hero_command))
@@ -37,6 +121,8 @@ def create_application():
     
     # Предсказания
     application.add_handler(CommandHandler("predict", predict_handlers.predict_quick))
+    application.add_handler(CommandHandler("whatif", predict_handlers.whatif))
+    application.add_handler(CommandHandler("suggest", predict_handlers.suggest))
     
     # Callbacks
     application.add_handler(CallbackQueryHandler(CallbackHandlers.handle_callback))
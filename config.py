@@ -11,6 +11,9 @@ load_dotenv()
 BASE_DIR = Path(__file__).parent.parent
 LOGS_DIR = BASE_DIR / "logs"
 LOGS_DIR.mkdir(exist_ok=True)
+# кэш OpenDota и матрицы матчапов — в папке репозитория (/app/cache в Docker)
+CACHE_DIR = Path(os.getenv("CACHE_DIR", Path(__file__).resolve().parent / "cache"))
+CACHE_DIR.mkdir(exist_ok=True)
 
 # Токен (обязательно!)
 BOT_TOKEN = os.getenv("BOT_TOKEN", "").strip()
@@ -25,6 +28,25 @@ try:
 except:
     pass
 
+# OpenDota
+OPENDOTA_CACHE_TTL = int(os.getenv("OPENDOTA_CACHE_TTL", "3600"))
+OPENDOTA_MAX_STALENESS = int(os.getenv("OPENDOTA_MAX_STALENESS", "21600"))
+UPDATE_INTERVAL = int(os.getenv("UPDATE_INTERVAL", "3600"))
+MAX_API_RETRIES = int(os.getenv("MAX_API_RETRIES", "3"))
+OPENDOTA_RATE_PER_MINUTE = int(os.getenv("OPENDOTA_RATE_PER_MINUTE", "60"))
+OPENDOTA_RATE_PER_DAY = int(os.getenv("OPENDOTA_RATE_PER_DAY", "2000"))
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))
+CIRCUIT_RESET_TIMEOUT = float(os.getenv("CIRCUIT_RESET_TIMEOUT", "30"))
+CIRCUIT_LATENCY_THRESHOLD = float(os.getenv("CIRCUIT_LATENCY_THRESHOLD", "5"))
+
+# Предсказания: разброс вероятности (0 — без разброса), кэш готовых предсказаний
+# и хранилище предсказаний за токенами кнопок
+PREDICTION_NOISE = float(os.getenv("PREDICTION_NOISE", "3"))
+PREDICTION_CACHE_SIZE = int(os.getenv("PREDICTION_CACHE_SIZE", "1024"))
+PREDICTION_CACHE_TTL = int(os.getenv("PREDICTION_CACHE_TTL", "3600"))
+PREDICTION_STORE_SIZE = int(os.getenv("PREDICTION_STORE_SIZE", "1000"))
+PREDICTION_STORE_TTL = int(os.getenv("PREDICTION_STORE_TTL", "86400"))
+
 # Логирование
 logging.basicConfig(
     level=logging.INFO,
@@ -56,6 +78,8 @@ MESSAGES = {
 /hero [имя] — информация о герое
 /counter [имя] — контрпики
 /predict [A] vs [B] — ML-предсказание
+/whatif [A] vs [B] : [замены] — что если поменять героя
+/suggest [A] vs [B] — лучший следующий пик для A
 /stats [имя] — винрейт, тир
 /meta — топ пиков
 /search [запрос] — поиск
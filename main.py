@@ -7,8 +7,9 @@ import asyncio
 import logging
 import sys
 import os
-import random
-from dataclasses import dataclass, field
+import signal
+from dataclasses import dataclass, field, replace
+from functools import lru_cache
 from typing import List, Dict, Optional, Tuple
 from datetime import datetime
 from pathlib import Path
@@ -20,6 +21,15 @@ from telegram.ext import (
     CallbackQueryHandler, ContextTypes, filters
 )
 
+from src.data.heroes_db import HeroDatabase, get_hero_db, reload_hero_db, set_hero_db
+from src.data.hero_index import CARRY, DISABLER, HEALER, INITIATOR, MELEE, NUKER, SUPPORT
+from src.data.loader import HeroDataError
+from src.data.synergy_rules import SynergyRules
+from src.ml.noise import draft_seed, seed_to_noise
+from src.models.hero import Hero
+from src.services.prediction_store import PredictionStore
+from src.utils.cache import BoundedCache
+
 try:
     from dotenv import load_dotenv
     load_dotenv()
@@ -35,6 +45,9 @@ try:
 except:
     pass
 
+# Разброс вероятности ±N процентов, свой для каждого драфта; 0 — выключен
+PREDICTION_NOISE = float(os.getenv("PREDICTION_NOISE", "3"))
+
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
@@ -44,47 +57,6 @@ logger = logging.getLogger(__name__)
 
 # ==================== МОДЕЛИ ====================
 
-@dataclass
-class HeroStats:
-    win_rate: Optional[float] = None
-    pick_rate: Optional[float] = None
-    tier: Optional[str] = None
-
-@dataclass
-class HeroBuild:
-    starting_items: List[str] = field(default_factory=list)
-    early_game: List[str] = field(default_factory=list)
-    mid_game: List[str] = field(default_factory=list)
-    late_game: List[str] = field(default_factory=list)
-    situational: List[str] = field(default_factory=list)
-
-@dataclass
-class HeroCounters:
-    strong_against: List[str] = field(default_factory=list)
-    weak_against: List[str] = field(default_factory=list)
-    counter_items: List[str] = field(default_factory=list)
-    core_items: List[str] = field(default_factory=list)
-    countered_by: Dict = field(default_factory=dict)
-
-@dataclass
-class Hero:
-    id: str
-    name: str
-    localized_name: Optional[str] = None
-    primary_attr: str = "str"
-    attack_type: str = "Melee"
-    roles: List[str] = field(default_factory=list)
-    description: str = ""
-    strengths: List[str] = field(default_factory=list)
-    weaknesses: List[str] = field(default_factory=list)
-    counters: HeroCounters = field(default_factory=HeroCounters)
-    builds: Optional[HeroBuild] = None
-    stats: Optional[HeroStats] = None
-    
-    def __post_init__(self):
-        if self.localized_name is None:
-            self.localized_name = self.name
-
 class PredictionResult(Enum):
     RADIANT_WIN = "radiant_win"
     DIRE_WIN = "dire_win"
@@ -135,868 +107,32 @@ class MatchPrediction:
 
 # ==================== РАСШИРЕННАЯ БАЗА ГЕРОЕВ (30+ героев) ====================
 
-HEROES_DATABASE = {
-    # CARRY
-    "kez": Hero(
-        id="kez",
-        name="Kez",
-        localized_name="Kez",
-        primary_attr="agi",
-        attack_type="Melee",
-        roles=["Carry", "Escape", "Nuker"],
-        description="Мобильный agility-carry с двумя стилями боя.",
-        strengths=["Высокая мобильность", "Взрывной урон", "Два режима атаки"],
-        weaknesses=["Зависим от предметов", "Сложная механика", "Проблемы против иллюзий"],
-        counters=HeroCounters(
-            weak_against=["Phantom Lancer", "Chaos Knight", "Tidehunter", "Axe", "Puck"],
-            counter_items=["Ghost Scepter", "Eul's Scepter", "Heaven's Halberd", "Force Staff", "Silver Edge"],
-            countered_by={"heroes": ["Phantom Lancer", "Meepo", "Naga Siren"], "description": "Silver Edge брейкает пассивку"}
-        ),
-        builds=HeroBuild(
-            starting_items=["Tango", "Salve", "Quelling Blade", "Circlet", "Branches"],
-            early_game=["Power Treads", "Magic Wand", "Echo Sabre"],
-            mid_game=["Black King Bar", "Disperser", "Crystalys"],
-            late_game=["Daedalus", "Satanic", "Butterfly", "Swift Blink"],
-            situational=["Bloodthorn", "Monkey King Bar", "Abyssal Blade"]
-        ),
-        stats=HeroStats(win_rate=52.3, pick_rate=15.2, tier="A")
-    ),
-    
-    "muerta": Hero(
-        id="muerta",
-        name="Muerta",
-        localized_name="Muerta",
-        primary_attr="int",
-        attack_type="Ranged",
-        roles=["Carry", "Nuker", "Disabler"],
-        description="Гибридный carry с формой призрака.",
-        strengths=["Огромный урон в лейте", "Форма призрака", "Смешанный урон"],
-        weaknesses=["Медленный фарм", "Уязвима до BKB", "Контрится silence"],
-        counters=HeroCounters(
-            weak_against=["Anti-Mage", "Nyx Assassin", "Silencer", "Phantom Assassin"],
-            counter_items=["Bloodthorn", "Silver Edge", "Orchid Malevolence", "Scythe of Vyse"],
-            countered_by={"heroes": ["Anti-Mage", "Silencer"], "description": "Silencer отключает способности"}
-        ),
-        builds=HeroBuild(
-            starting_items=["Tango", "Salve", "Circlet", "Branches"],
-            early_game=["Power Treads", "Magic Wand", "Maelstrom"],
-            mid_game=["Black King Bar", "Gleipnir", "Dragon Lance"],
-            late_game=["Daedalus", "Satanic", "Bloodthorn", "Hurricane Pike"],
-            situational=["Monkey King Bar", "Silver Edge"]
-        ),
-        stats=HeroStats(win_rate=51.8, pick_rate=12.5, tier="A")
-    ),
-    
-    "phantom_lancer": Hero(
-        id="phantom_lancer",
-        name="Phantom Lancer",
-        localized_name="Phantom Lancer",
-        primary_attr="agi",
-        attack_type="Melee",
-        roles=["Carry", "Escape", "Pusher"],
-        description="Carry с армией иллюзий. Сильнейший лейт.",
-        strengths=["Армия иллюзий", "Высокая мобильность", "Сложно найти настоящего"],
-        weaknesses=["Слаб рано", "Уязвим к AoE", "Требует фарма"],
-        counters=HeroCounters(
-            weak_against=["Axe", "Earthshaker", "Sven", "Medusa"],
-            counter_items=["Battle Fury", "Mjollnir", "Radiance", "Shiva's Guard"],
-            countered_by={"heroes": ["Axe", "Earthshaker"], "description": "AoE урон уничтожает иллюзии"}
-        ),
-        builds=HeroBuild(
-            starting_items=["Tango", "Quelling Blade", "Circlet", "Branches"],
-            early_game=["Power Treads", "Wraith Band", "Diffusal Blade"],
-            mid_game=["Manta Style", "Heart of Tarrasque", "Butterfly"],
-            late_game=["Satanic", "Bloodthorn", "Skadi", "Boots of Travel"],
-            situational=["Black King Bar", "Silver Edge"]
-        ),
-        stats=HeroStats(win_rate=53.2, pick_rate=9.8, tier="S")
-    ),
-    
-    "anti_mage": Hero(
-        id="anti_mage",
-        name="Anti-Mage",
-        localized_name="Anti-Mage",
-        primary_attr="agi",
-        attack_type="Melee",
-        roles=["Carry", "Escape", "Nuker"],
-        description="Быстрый фармер с мана-бёрном.",
-        strengths=["Быстрый фарм", "Мана Break", "Blink для escape"],
-        weaknesses=["Слаб рано", "Требует много фарма", "Уязвим к контролю"],
-        counters=HeroCounters(
-            weak_against=["Phantom Assassin", "Legion Commander", "Meepo", "Chaos Knight"],
-            counter_items=["Silver Edge", "Bloodthorn", "Orchid Malevolence", "Scythe of Vyse"],
-            countered_by={"heroes": ["Phantom Assassin", "Legion Commander"], "description": "Legion Duel игнорирует BKB"}
-        ),
-        builds=HeroBuild(
-            starting_items=["Tango", "Salve", "Quelling Blade", "Shield"],
-            early_game=["Power Treads", "Magic Wand", "Ring of Health"],
-            mid_game=["Battle Fury", "Manta Style", "Black King Bar"],
-            late_game=["Butterfly", "Abyssal Blade", "Satanic"],
-            situational=["Monkey King Bar", "Bloodthorn"]
-        ),
-        stats=HeroStats(win_rate=49.5, pick_rate=12.1, tier="B")
-    ),
-    
-    "spectre": Hero(
-        id="spectre",
-        name="Spectre",
-        localized_name="Spectre",
-        primary_attr="agi",
-        attack_type="Melee",
-        roles=["Carry", "Durable", "Escape"],
-        description="Керри с глобальным присутствием. Ультимейт Haunt разрывает файты.",
-        strengths=["Глобальное присутствие", "Отражение урона", "Сильный лейт"],
-        weaknesses=["Медленный фарм", "Слаб рано", "Зависит от Radiance"],
-        counters=HeroCounters(
-            weak_against=["Anti-Mage", "Necrophos", "Viper", "Omniknight"],
-            counter_items=["Silver Edge", "Diffusal Blade", "Scythe of Vyse"],
-            countered_by={"heroes": ["Anti-Mage", "Necrophos"], "description": "Anti-Mage сжигает ману, Necrophos замедляет"}
-        ),
-        builds=HeroBuild(
-            starting_items=["Tango", "Salve", "Quelling Blade", "Shield"],
-            early_game=["Power Treads", "Magic Wand", "Urn of Shadows"],
-            mid_game=["Radiance", "Manta Style", "Blade Mail"],
-            late_game=["Heart of Tarrasque", "Butterfly", "Abyssal Blade", "Refresher Orb"],
-            situational=["Silver Edge", "Bloodthorn", "Nullifier"]
-        ),
-        stats=HeroStats(win_rate=51.2, pick_rate=11.5, tier="A")
-    ),
-    
-    "faceless_void": Hero(
-        id="faceless_void",
-        name="Faceless Void",
-        localized_name="Faceless Void",
-        primary_attr="agi",
-        attack_type="Melee",
-        roles=["Carry", "Initiator", "Disabler", "Escape"],
-        description="Керри с Chronosphere — лучшим станом в игре.",
-        strengths=["Chronosphere", "Time Walk для escape", "Бэкдор потенциал"],
-        weaknesses=["Сильно зависит от ультимейта", "Слаб без предметов", "Контрится"],
-        counters=HeroCounters(
-            weak_against=["Axe", "Silencer", "Viper", "Winter Wyvern"],
-            counter_items=["Force Staff", "Eul's Scepter", "Ghost Scepter", "Aeon Disk"],
-            countered_by={"heroes": ["Axe", "Silencer"], "description": "Axe Call в хроносфере, Silencer ульт"}
-        ),
-        builds=HeroBuild(
-            starting_items=["Tango", "Salve", "Quelling Blade", "Circlet"],
-            early_game=["Power Treads", "Magic Wand", "Mask of Madness"],
-            mid_game=["Battle Fury", "Black King Bar", "Maelstrom"],
-            late_game=["Butterfly", "Satanic", "Abyssal Blade", "Refresher Orb"],
-            situational=["Silver Edge", "Monkey King Bar", "Bloodthorn"]
-        ),
-        stats=HeroStats(win_rate=50.8, pick_rate=13.2, tier="A")
-    ),
-    
-    # MID
-    "void_spirit": Hero(
-        id="void_spirit",
-        name="Void Spirit",
-        localized_name="Void Spirit",
-        primary_attr="int",
-        attack_type="Melee",
-        roles=["Carry", "Escape", "Nuker", "Disabler"],
-        description="Мобильный mid с высоким взрывным уроном.",
-        strengths=["Высокая мобильность", "Взрывной магический урон", "Сложно поймать"],
-        weaknesses=["Уязвим к silence", "Нужна мана", "Падает в лейте"],
-        counters=HeroCounters(
-            weak_against=["Silencer", "Doom", "Bloodseeker", "Anti-Mage"],
-            counter_items=["Orchid Malevolence", "Bloodthorn", "Scythe of Vyse", "Abyssal Blade"],
-            countered_by={"heroes": ["Silencer", "Doom"], "description": "Silence отключает способности"}
-        ),
-        builds=HeroBuild(
-            starting_items=["Tango", "Circlet", "Branches", "Faerie Fire"],
-            early_game=["Bottle", "Power Treads", "Magic Wand", "Kaya"],
-            mid_game=["Orchid Malevolence", "Black King Bar", "Sange and Kaya"],
-            late_game=["Bloodthorn", "Refresher Orb", "Octarine Core"],
-            situational=["Eul's Scepter", "Shiva's Guard", "Scythe of Vyse"]
-        ),
-        stats=HeroStats(win_rate=50.5, pick_rate=18.3, tier="A")
-    ),
-    
-    "ember_spirit": Hero(
-        id="ember_spirit",
-        name="Ember Spirit",
-        localized_name="Ember Spirit",
-        primary_attr="agi",
-        attack_type="Melee",
-        roles=["Carry", "Escape", "Nuker", "Disabler", "Initiator"],
-        description="Мобильный carry с физическим и магическим уроном.",
-        strengths=["Высочайшая мобильность", "Смешанный урон", "Силен на всех стадиях"],
-        weaknesses=["Уязвим к silence", "Требует маны", "Сложная механика"],
-        counters=HeroCounters(
-            weak_against=["Silencer", "Faceless Void", "Storm Spirit", "Void Spirit"],
-            counter_items=["Orchid Malevolence", "Bloodthorn", "Scythe of Vyse", "Abyssal Blade"],
-            countered_by={"heroes": ["Silencer", "Faceless Void"], "description": "Silencer и Faceless Void контрят мобильность"}
-        ),
-        builds=HeroBuild(
-            starting_items=["Tango", "Circlet", "Branches", "Faerie Fire"],
-            early_game=["Bottle", "Phase Boots", "Magic Wand", "Maelstrom"],
-            mid_game=["Black King Bar", "Mjollnir", "Crystalys"],
-            late_game=["Daedalus", "Octarine Core", "Refresher Orb", "Boots of Travel"],
-            situational=["Radiance", "Linken's Sphere", "Shiva's Guard"]
-        ),
-        stats=HeroStats(win_rate=51.2, pick_rate=16.7, tier="S")
-    ),
-    
-    "invoker": Hero(
-        id="invoker",
-        name="Invoker",
-        localized_name="Invoker",
-        primary_attr="uni",
-        attack_type="Ranged",
-        roles=["Carry", "Nuker", "Disabler", "Escape", "Pusher"],
-        description="Самый сложный герой с 10 способностями.",
-        strengths=["Огромный урон", "Много способностей", "Сильный на всех стадиях"],
-        weaknesses=["Сложная механика", "Уязвим к ганкам", "Нужна мана"],
-        counters=HeroCounters(
-            weak_against=["Anti-Mage", "Nyx Assassin", "Silencer", "Pugna"],
-            counter_items=["Orchid Malevolence", "Bloodthorn", "Scythe of Vyse", "Black King Bar"],
-            countered_by={"heroes": ["Anti-Mage", "Nyx Assassin"], "description": "Anti-Mage сжигает ману, Nyx взрывает ману"}
-        ),
-        builds=HeroBuild(
-            starting_items=["Tango", "Circlet", "Branches", "Faerie Fire"],
-            early_game=["Null Talisman", "Boots of Speed", "Magic Wand"],
-            mid_game=["Aghanim's Scepter", "Octarine Core", "Black King Bar"],
-            late_game=["Refresher Orb", "Shiva's Guard", "Scythe of Vyse", "Bloodthorn"],
-            situational=["Linken's Sphere", "Eul's Scepter", "Blink Dagger"]
-        ),
-        stats=HeroStats(win_rate=49.8, pick_rate=14.5, tier="A")
-    ),
-    
-    "storm_spirit": Hero(
-        id="storm_spirit",
-        name="Storm Spirit",
-        localized_name="Storm Spirit",
-        primary_attr="int",
-        attack_type="Ranged",
-        roles=["Carry", "Escape", "Nuker", "Initiator", "Disabler"],
-        description="Мобильный маг с Ball Lightning.",
-        strengths=["Бесконечная мобильность", "Высокий урон", "Соло убийства"],
-        weaknesses=["Зависим от Bloodstone", "Уязвим к silence", "Нужна мана"],
-        counters=HeroCounters(
-            weak_against=["Anti-Mage", "Silencer", "Doom", "Nyx Assassin"],
-            counter_items=["Orchid Malevolence", "Bloodthorn", "Scythe of Vyse", "Abyssal Blade"],
-            countered_by={"heroes": ["Anti-Mage", "Silencer"], "description": "Silence и мана-бёрн контрят"}
-        ),
-        builds=HeroBuild(
-            starting_items=["Tango", "Circlet", "Branches", "Faerie Fire"],
-            early_game=["Null Talisman", "Boots of Speed", "Magic Wand"],
-            mid_game=["Bloodstone", "Black King Bar", "Kaya and Sange"],
-            late_game=["Bloodthorn", "Shiva's Guard", "Scythe of Vyse", "Refresher Orb"],
-            situational=["Linken's Sphere", "Octarine Core", "Hurricane Pike"]
-        ),
-        stats=HeroStats(win_rate=48.5, pick_rate=10.2, tier="B")
-    ),
-    
-    # OFFLANE
-    "slardar": Hero(
-        id="slardar",
-        name="Slardar",
-        localized_name="Slardar",
-        primary_attr="str",
-        attack_type="Melee",
-        roles=["Carry", "Durable", "Initiator", "Disabler", "Escape"],
-        description="Сильный инициатор с минус броней.",
-        strengths=["Сильная инициация", "Минус броня", "Высокая мобильность"],
-        weaknesses=["Уязвим к kiting'у", "Проблемы против иллюзий", "Требует Blink"],
-        counters=HeroCounters(
-            weak_against=["Phantom Lancer", "Terrorblade", "Naga Siren", "Tinker"],
-            counter_items=["Force Staff", "Ghost Scepter", "Eul's Scepter", "Silver Edge"],
-            countered_by={"heroes": ["Phantom Lancer", "Terrorblade"], "description": "Silver Edge брейкает пассивку"}
-        ),
-        builds=HeroBuild(
-            starting_items=["Tango", "Salve", "Quelling Blade", "Shield"],
-            early_game=["Phase Boots", "Magic Wand", "Blink Dagger"],
-            mid_game=["Black King Bar", "Aghanim's Scepter", "Force Staff"],
-            late_game=["Assault Cuirass", "Shiva's Guard", "Lotus Orb", "Abyssal Blade"],
-            situational=["Lotus Orb", "Heaven's Halberd", "Guardian Greaves"]
-        ),
-        stats=HeroStats(win_rate=49.8, pick_rate=8.5, tier="B")
-    ),
-    
-    "tidehunter": Hero(
-        id="tidehunter",
-        name="Tidehunter",
-        localized_name="Tidehunter",
-        primary_attr="str",
-        attack_type="Melee",
-        roles=["Initiator", "Durable", "Disabler", "Nuker"],
-        description="Мощный танк с лучшим AoE контролем (Ravage).",
-        strengths=["Ravage — лучший AoE стан", "Высокая живучесть", "Anchor Smash"],
-        weaknesses=["Долгий кд на Ravage", "Уязвим к silence", "Медленный фарм"],
-        counters=HeroCounters(
-            weak_against=["Silencer", "Enigma", "Rubick", "Doom"],
-            counter_items=["Black King Bar", "Linken's Sphere", "Lotus Orb", "Silver Edge"],
-            countered_by={"heroes": ["Silencer", "Enigma"], "description": "Silencer ульт, Enigma Black Hole"}
-        ),
-        builds=HeroBuild(
-            starting_items=["Tango", "Salve", "Clarity", "Shield"],
-            early_game=["Arcane Boots", "Magic Wand", "Blink Dagger"],
-            mid_game=["Black King Bar", "Force Staff", "Mekansm"],
-            late_game=["Refresher Orb", "Shiva's Guard", "Lotus Orb", "Guardian Greaves"],
-            situational=["Pipe of Insight", "Crimson Guard", "Aghanim's Scepter"]
-        ),
-        stats=HeroStats(win_rate=50.1, pick_rate=10.2, tier="A")
-    ),
-    
-    "axe": Hero(
-        id="axe",
-        name="Axe",
-        localized_name="Axe",
-        primary_attr="str",
-        attack_type="Melee",
-        roles=["Initiator", "Durable", "Disabler", "Jungler"],
-        description="Инициатор с Berserker's Call и Culling Blade.",
-        strengths=["Мощный дизейбл", "True damage ульт", "Быстрый фарм леса"],
-        weaknesses=["Уязвим к магии", "Зависит от Blink", "Контрится"],
-        counters=HeroCounters(
-            weak_against=["Viper", "Venomancer", "Necrophos", "Pugna"],
-            counter_items=["Force Staff", "Ghost Scepter", "Eul's Scepter", "Glimmer Cape"],
-            countered_by={"heroes": ["Viper", "Venomancer"], "description": "Магический урон и замедление"}
-        ),
-        builds=HeroBuild(
-            starting_items=["Tango", "Salve", "Stout Shield", "Iron Branch"],
-            early_game=["Tranquil Boots", "Magic Wand", "Blink Dagger"],
-            mid_game=["Black King Bar", "Blade Mail", "Force Staff"],
-            late_game=["Heart of Tarrasque", "Lotus Orb", "Aghanim's Scepter", "Shiva's Guard"],
-            situational=["Crimson Guard", "Pipe of Insight", "Heaven's Halberd"]
-        ),
-        stats=HeroStats(win_rate=51.5, pick_rate=12.8, tier="A")
-    ),
-    
-    "mars": Hero(
-        id="mars",
-        name="Mars",
-        localized_name="Mars",
-        primary_attr="str",
-        attack_type="Melee",
-        roles=["Carry", "Initiator", "Disabler", "Durable"],
-        description="Инициатор с Arena of Blood.",
-        strengths=["Сильный контроль", "Блокирование атак", "Высокий урон"],
-        weaknesses=["Уязвим к магии", "Зависит от ультимейта", "Мана-зависимый"],
-        counters=HeroCounters(
-            weak_against=["Viper", "Venomancer", "Lifestealer", "Riki"],
-            counter_items=["Force Staff", "Blink Dagger", "Eul's Scepter", "Black King Bar"],
-            countered_by={"heroes": ["Viper", "Lifestealer"], "description": "Rage игнорирует стан, Viper замедляет"}
-        ),
-        builds=HeroBuild(
-            starting_items=["Tango", "Salve", "Quelling Blade", "Circlet"],
-            early_game=["Phase Boots", "Magic Wand", "Blink Dagger"],
-            mid_game=["Black King Bar", "Desolator", "Aghanim's Scepter"],
-            late_game=["Satanic", "Assault Cuirass", "Daedalus", "Refresher Orb"],
-            situational=["Silver Edge", "Bloodthorn", "Heaven's Halberd"]
-        ),
-        stats=HeroStats(win_rate=50.2, pick_rate=11.3, tier="A")
-    ),
-    
-    "doom": Hero(
-        id="doom",
-        name="Doom",
-        localized_name="Doom",
-        primary_attr="str",
-        attack_type="Melee",
-        roles=["Carry", "Disabler", "Initiator", "Durable", "Nuker"],
-        description="Оффлейнер с Doom — сильнейшим silence в игре.",
-        strengths=["Doom отключает героя", "Быстрый фарм", "Танк"],
-        weaknesses=["Медленный", "Зависим от фарма", "Контрится Linken's"],
-        counters=HeroCounters(
-            weak_against=["Lifestealer", "Weaver", "Phantom Lancer", "Anti-Mage"],
-            counter_items=["Linken's Sphere", "Lotus Orb", "Black King Bar", "Aghanim's Scepter"],
-            countered_by={"heroes": ["Lifestealer", "Weaver"], "description": "Rage и Time Lapse снимают Doom"}
-        ),
-        builds=HeroBuild(
-            starting_items=["Tango", "Salve", "Quelling Blade", "Shield"],
-            early_game=["Phase Boots", "Magic Wand", "Hand of Midas"],
-            mid_game=["Black King Bar", "Shiva's Guard", "Aghanim's Scepter"],
-            late_game=["Refresher Orb", "Octarine Core", "Assault Cuirass", "Bloodthorn"],
-            situational=["Silver Edge", "Heaven's Halberd", "Lotus Orb"]
-        ),
-        stats=HeroStats(win_rate=49.2, pick_rate=8.7, tier="B")
-    ),
-    
-    # SUPPORTS
-    "shadow_shaman": Hero(
-        id="shadow_shaman",
-        name="Shadow Shaman",
-        localized_name="Shadow Shaman",
-        primary_attr="int",
-        attack_type="Ranged",
-        roles=["Support", "Pusher", "Disabler", "Nuker", "Initiator"],
-        description="Сильнейший пушер с длиннейшим станом.",
-        strengths=["Длинный стан", "Мощный пуш", "Hex для дизейбла"],
-        weaknesses=["Очень хрупкий", "Медленный", "Легко убивается"],
-        counters=HeroCounters(
-            weak_against=["Pudge", "Clockwerk", "Spirit Breaker", "Night Stalker"],
-            counter_items=["Force Staff", "Glimmer Cape", "Ghost Scepter", "Black King Bar"],
-            countered_by={"heroes": ["Pudge", "Clockwerk"], "description": "Гэпклоуэры убивают"}
-        ),
-        builds=HeroBuild(
-            starting_items=["Tango", "Salve", "Clarity", "Observer Ward", "Sentry Ward"],
-            early_game=["Arcane Boots", "Magic Wand", "Wind Lace"],
-            mid_game=["Aether Lens", "Glimmer Cape", "Aghanim's Scepter"],
-            late_game=["Refresher Orb", "Octarine Core", "Force Staff", "Ghost Scepter"],
-            situational=["Blink Dagger", "Aeon Disk", "Ghost Scepter"]
-        ),
-        stats=HeroStats(win_rate=48.5, pick_rate=14.3, tier="B")
-    ),
-    
-    "lich": Hero(
-        id="lich",
-        name="Lich",
-        localized_name="Lich",
-        primary_attr="int",
-        attack_type="Ranged",
-        roles=["Support", "Nuker", "Disabler"],
-        description="Support с Chain Frost — разрывом в файтах.",
-        strengths=["Chain Frost", "Ice Armor", "Sacrifice для контроля линии"],
-        weaknesses=["Хрупкий", "Мана зависимость", "Уязвим к мана-бёрну"],
-        counters=HeroCounters(
-            weak_against=["Anti-Mage", "Nyx Assassin", "Pugna", "Morphling"],
-            counter_items=["Black King Bar", "Glimmer Cape", "Force Staff", "Lotus Orb"],
-            countered_by={"heroes": ["Anti-Mage", "Nyx Assassin"], "description": "Anti-Mage сжигает ману"}
-        ),
-        builds=HeroBuild(
-            starting_items=["Tango", "Salve", "Mango", "Observer Ward"],
-            early_game=["Tranquil Boots", "Magic Wand", "Wind Lace"],
-            mid_game=["Glimmer Cape", "Force Staff", "Aghanim's Scepter"],
-            late_game=["Octarine Core", "Refresher Orb", "Ghost Scepter", "Lotus Orb"],
-            situational=["Aether Lens", "Ghost Scepter", "Solar Crest"]
-        ),
-        stats=HeroStats(win_rate=51.5, pick_rate=11.8, tier="A")
-    ),
-    
-    "lion": Hero(
-        id="lion",
-        name="Lion",
-        localized_name="Lion",
-        primary_attr="int",
-        attack_type="Ranged",
-        roles=["Support", "Disabler", "Nuker", "Initiator"],
-        description="Дизейблер с двумя станами и Finger of Death.",
-        strengths=["Два disables", "Finger of Death", "Mana Drain", "Сильный в ганках"],
-        weaknesses=["Очень хрупкий", "Медленный", "Зависим от позиционирования"],
-        counters=HeroCounters(
-            weak_against=["Nyx Assassin", "Pudge", "Clockwerk", "Lifestealer"],
-            counter_items=["Force Staff", "Glimmer Cape", "Black King Bar", "Lotus Orb"],
-            countered_by={"heroes": ["Nyx Assassin", "Pudge"], "description": "Nyx отражает Finger"}
-        ),
-        builds=HeroBuild(
-            starting_items=["Tango", "Salve", "Clarity", "Observer Ward"],
-            early_game=["Tranquil Boots", "Magic Wand", "Wind Lace"],
-            mid_game=["Blink Dagger", "Aether Lens", "Force Staff"],
-            late_game=["Aghanim's Scepter", "Octarine Core", "Refresher Orb", "Glimmer Cape"],
-            situational=["Aeon Disk", "Ghost Scepter", "Lotus Orb"]
-        ),
-        stats=HeroStats(win_rate=47.8, pick_rate=13.5, tier="B")
-    ),
-    
-    "pudge": Hero(
-        id="pudge",
-        name="Pudge",
-        localized_name="Pudge",
-        primary_attr="str",
-        attack_type="Melee",
-        roles=["Disabler", "Initiator", "Durable", "Nuker"],
-        description="Гэпклоуэр с Meat Hook.",
-        strengths=["Meat Hook", "Dismember", "Высокое HP", "Фановый герой"],
-        weaknesses=["Зависит от хука", "Медленный", "Фидит если промахивается"],
-        counters=HeroCounters(
-            weak_against=["Vengeful Spirit", "Chen", "Kunkka", "Lifestealer"],
-            counter_items=["Force Staff", "Glimmer Cape", "Black King Bar", "Lotus Orb"],
-            countered_by={"heroes": ["Vengeful Spirit", "Lifestealer"], "description": "Rage игнорирует ульт, Venge свопает"}
-        ),
-        builds=HeroBuild(
-            starting_items=["Tango", "Salve", "Gauntlets of Strength", "Iron Branch"],
-            early_game=["Tranquil Boots", "Magic Wand", "Soul Ring"],
-            mid_game=["Blink Dagger", "Black King Bar", "Aghanim's Scepter"],
-            late_game=["Heart of Tarrasque", "Lotus Orb", "Shiva's Guard", "Force Staff"],
-            situational=["Pipe of Insight", "Crimson Guard", "Heaven's Halberd"]
-        ),
-        stats=HeroStats(win_rate=52.8, pick_rate=22.5, tier="S")
-    ),
-    
-    "crystal_maiden": Hero(
-        id="crystal_maiden",
-        name="Crystal Maiden",
-        localized_name="Crystal Maiden",
-        primary_attr="int",
-        attack_type="Ranged",
-        roles=["Support", "Disabler", "Nuker", "Jungler"],
-        description="Support с Arcane Aura для команды.",
-        strengths=["Arcane Aura — реген маны", "Freezing Field", "Сильный ранний гейм"],
-        weaknesses=["Очень медленная", "Хрупкая", "Легкая цель"],
-        counters=HeroCounters(
-            weak_against=["Bounty Hunter", "Riki", "Spirit Breaker", "Nyx Assassin"],
-            counter_items=["Force Staff", "Glimmer Cape", "Ghost Scepter", "Black King Bar"],
-            countered_by={"heroes": ["Bounty Hunter", "Riki"], "description": "Инвиз герои убивают легко"}
-        ),
-        builds=HeroBuild(
-            starting_items=["Tango", "Salve", "Clarity", "Observer Ward"],
-            early_game=["Arcane Boots", "Magic Wand", "Wind Lace"],
-            mid_game=["Glimmer Cape", "Force Staff", "Aghanim's Scepter"],
-            late_game=["Black King Bar", "Ghost Scepter", "Aether Lens", "Lotus Orb"],
-            situational=["Blink Dagger", "Aeon Disk", "Eul's Scepter"]
-        ),
-        stats=HeroStats(win_rate=48.2, pick_rate=9.8, tier="C")
-    ),
-    
-    "rubick": Hero(
-        id="rubick",
-        name="Rubick",
-        localized_name="Rubick",
-        primary_attr="int",
-        attack_type="Ranged",
-        roles=["Support", "Disabler", "Nuker"],
-        description="Support с Spell Steal — ворует способности.",
-        strengths=["Spell Steal", "Телекинезис", "Сильный против магов"],
-        weaknesses=["Хрупкий", "Зависит от вражеских способностей", "Сложный"],
-        counters=HeroCounters(
-            weak_against=["Silencer", "Nyx Assassin", "Bounty Hunter", "Riki"],
-            counter_items=["Force Staff", "Glimmer Cape", "Ghost Scepter", "Black King Bar"],
-            countered_by={"heroes": ["Silencer", "Nyx Assassin"], "description": "Silencer ульт, Nyx мана-бёрн"}
-        ),
-        builds=HeroBuild(
-            starting_items=["Tango", "Salve", "Mango", "Observer Ward"],
-            early_game=["Arcane Boots", "Magic Wand", "Wind Lace"],
-            mid_game=["Blink Dagger", "Aether Lens", "Force Staff"],
-            late_game=["Aghanim's Scepter", "Octarine Core", "Refresher Orb", "Glimmer Cape"],
-            situational=["Black King Bar", "Ghost Scepter", "Lotus Orb"]
-        ),
-        stats=HeroStats(win_rate=49.5, pick_rate=8.2, tier="B")
-    ),
-    
-    # HARD CARRY
-    "terrorblade": Hero(
-        id="terrorblade",
-        name="Terrorblade",
-        localized_name="Terrorblade",
-        primary_attr="agi",
-        attack_type="Melee",
-        roles=["Carry", "Pusher", "Nuker"],
-        description="Керри с Metamorphosis и иллюзиями.",
-        strengths=["Высокий урон", "Иллюзии", "Сильный пуш", "Reflection"],
-        weaknesses=["Слаб рано", "Зависит от Metamorphosis", "Контрится AoE"],
-        counters=HeroCounters(
-            weak_against=["Axe", "Earthshaker", "Sven", "Naga Siren"],
-            counter_items=["Battle Fury", "Mjollnir", "Radiance", "Shiva's Guard"],
-            countered_by={"heroes": ["Axe", "Earthshaker"], "description": "Axe Call, Earthshaker Echo Slam"}
-        ),
-        builds=HeroBuild(
-            starting_items=["Tango", "Salve", "Quelling Blade", "Circlet"],
-            early_game=["Power Treads", "Magic Wand", "Wraith Band"],
-            mid_game=["Dragon Lance", "Black King Bar", "Manta Style"],
-            late_game=["Satanic", "Butterfly", "Skadi", "Bloodthorn"],
-            situational=["Silver Edge", "Hurricane Pike", "Monkey King Bar"]
-        ),
-        stats=HeroStats(win_rate=50.5, pick_rate=10.8, tier="A")
-    ),
-    
-    "medusa": Hero(
-        id="medusa",
-        name="Medusa",
-        localized_name="Medusa",
-        primary_attr="agi",
-        attack_type="Ranged",
-        roles=["Carry", "Durable", "Disabler"],
-        description="Супер-лейт керри с Mana Shield.",
-        strengths=["Невероятный лейт", "Mana Shield", "Split Shot", "Stone Gaze"],
-        weaknesses=["Медленный фарм", "Слаб рано", "Зависит от предметов"],
-        counters=HeroCounters(
-            weak_against=["Anti-Mage", "Nyx Assassin", "Invoker", "Silencer"],
-            counter_items=["Diffusal Blade", "Necronomicon", "Mana Void", "Orchid Malevolence"],
-            countered_by={"heroes": ["Anti-Mage", "Nyx Assassin"], "description": "Мана-бёрн убивает"}
-        ),
-        builds=HeroBuild(
-            starting_items=["Tango", "Salve", "Circlet", "Branches"],
-            early_game=["Power Treads", "Magic Wand", "Wraith Band"],
-            mid_game=["Linken's Sphere", "Manta Style", "Skadi"],
-            late_game=["Butterfly", "Satanic", "Bloodthorn", "Refresher Orb"],
-            situational=["Silver Edge", "Monkey King Bar", "Hurricane Pike"]
-        ),
-        stats=HeroStats(win_rate=51.8, pick_rate=9.5, tier="A")
-    ),
-    
-    "juggernaut": Hero(
-        id="juggernaut",
-        name="Juggernaut",
-        localized_name="Juggernaut",
-        primary_attr="agi",
-        attack_type="Melee",
-        roles=["Carry", "Pusher", "Escape"],
-        description="Универсальный керри с Blade Fury и Omnislash.",
-        strengths=["Универсальный", "Быстрый фарм", "Healing Ward", "Omnislash"],
-        weaknesses=["Уязвим к контролю", "Omnislash контрится", "Средний лейт"],
-        counters=HeroCounters(
-            weak_against=["Axe", "Lion", "Shadow Shaman", "Ursa"],
-            counter_items=["Ghost Scepter", "Force Staff", "Eul's Scepter", "Heaven's Halberd"],
-            countered_by={"heroes": ["Axe", "Lion"], "description": "Axe Call, Lion Hex + Finger"}
-        ),
-        builds=HeroBuild(
-            starting_items=["Tango", "Salve", "Quelling Blade", "Circlet"],
-            early_game=["Phase Boots", "Magic Wand", "Wraith Band"],
-            mid_game=["Battle Fury", "Black King Bar", "Manta Style"],
-            late_game=["Satanic", "Butterfly", "Abyssal Blade", "Bloodthorn"],
-            situational=["Silver Edge", "Monkey King Bar", "Skadi"]
-        ),
-        stats=HeroStats(win_rate=50.2, pick_rate=14.8, tier="A")
-    ),
-    
-    "sven": Hero(
-        id="sven",
-        name="Sven",
-        localized_name="Sven",
-        primary_attr="str",
-        attack_type="Melee",
-        roles=["Carry", "Disabler", "Initiator", "Pusher"],
-        description="Керри с God's Strength и клеевом уроном.",
-        strengths=["Огромный урон", "God's Strength", "Storm Hammer", "Быстрый фарм"],
-        weaknesses=["Медленный", "Зависим от ультимейта", "Кайтится"],
-        counters=HeroCounters(
-            weak_against=["Viper", "Venomancer", "Drow Ranger", "Phantom Lancer"],
-            counter_items=["Force Staff", "Ghost Scepter", "Heaven's Halberd", "Eul's Scepter"],
-            countered_by={"heroes": ["Viper", "Phantom Lancer"], "description": "Замедление и иллюзии"}
-        ),
-        builds=HeroBuild(
-            starting_items=["Tango", "Salve", "Quelling Blade", "Circlet"],
-            early_game=["Power Treads", "Magic Wand", "Mask of Madness"],
-            mid_game=["Black King Bar", "Daedalus", "Sange and Yasha"],
-            late_game=["Satanic", "Butterfly", "Abyssal Blade", "Bloodthorn"],
-            situational=["Silver Edge", "Monkey King Bar", "Swift Blink"]
-        ),
-        stats=HeroStats(win_rate=49.8, pick_rate=11.2, tier="B")
-    ),
-    
-    "morphling": Hero(
-        id="morphling",
-        name="Morphling",
-        localized_name="Morphling",
-        primary_attr="agi",
-        attack_type="Ranged",
-        roles=["Carry", "Escape", "Nuker", "Disabler"],
-        description="Гибкий керри с Waveform и Morph.",
-        strengths=["Высокая мобильность", "Гибкость билдов", "Waveform", "Replicate"],
-        weaknesses=["Сложный", "Зависим от маны", "Уязвим к мана-бёрну"],
-        counters=HeroCounters(
-            weak_against=["Anti-Mage", "Nyx Assassin", "Invoker", "Silencer"],
-            counter_items=["Diffusal Blade", "Orchid Malevolence", "Scythe of Vyse"],
-            countered_by={"heroes": ["Anti-Mage", "Nyx Assassin"], "description": "Мана-бёрн убивает"}
-        ),
-        builds=HeroBuild(
-            starting_items=["Tango", "Salve", "Circlet", "Branches"],
-            early_game=["Power Treads", "Magic Wand", "Wraith Band"],
-            mid_game=["Black King Bar", "Linken's Sphere", "Manta Style"],
-            late_game=["Satanic", "Butterfly", "Skadi", "Bloodthorn"],
-            situational=["Silver Edge", "Monkey King Bar", "Ethereal Blade"]
-        ),
-        stats=HeroStats(win_rate=48.5, pick_rate=7.8, tier="B")
-    ),
-    
-    "gyrocopter": Hero(
-        id="gyrocopter",
-        name="Gyrocopter",
-        localized_name="Gyrocopter",
-        primary_attr="agi",
-        attack_type="Ranged",
-        roles=["Carry", "Nuker", "Disabler"],
-        description="Керри с Flak Cannon — AoE уроном.",
-        strengths=["Высокий AoE урон", "Flak Cannon", "Call Down", "Сильный в файтах"],
-        weaknesses=["Медленный", "Низкая дальность", "Зависим от предметов"],
-        counters=HeroCounters(
-            weak_against=["Phantom Assassin", "Storm Spirit", "Anti-Mage", "Nyx Assassin"],
-            counter_items=["Blade Mail", "Heaven's Halberd", "Ghost Scepter", "Force Staff"],
-            countered_by={"heroes": ["Phantom Assassin", "Storm Spirit"], "description": "Блинкеры убивают быстро"}
-        ),
-        builds=HeroBuild(
-            starting_items=["Tango", "Salve", "Circlet", "Branches"],
-            early_game=["Power Treads", "Magic Wand", "Wraith Band"],
-            mid_game=["Black King Bar", "Sange and Yasha", "Daedalus"],
-            late_game=["Satanic", "Butterfly", "Bloodthorn", "Swift Blink"],
-            situational=["Silver Edge", "Monkey King Bar", "Hurricane Pike"]
-        ),
-        stats=HeroStats(win_rate=50.5, pick_rate=8.9, tier="B")
-    ),
-    
-    "luna": Hero(
-        id="luna",
-        name="Luna",
-        localized_name="Luna",
-        primary_attr="agi",
-        attack_type="Ranged",
-        roles=["Carry", "Nuker", "Pusher"],
-        description="Быстрый керри с Moon Glaives и Eclipse.",
-        strengths=["Быстрый фарм", "Высокий урон", "Eclipse", "Лунный блеск"],
-        weaknesses=["Хрупкая", "Короткая дальность", "Зависит от позиционирования"],
-        counters=HeroCounters(
-            weak_against=["Phantom Assassin", "Storm Spirit", "Anti-Mage", "Nyx Assassin"],
-            counter_items=["Blade Mail", "Heaven's Halberd", "Ghost Scepter", "Force Staff"],
-            countered_by={"heroes": ["Phantom Assassin", "Storm Spirit"], "description": "Блинкеры убивают быстро"}
-        ),
-        builds=HeroBuild(
-            starting_items=["Tango", "Salve", "Circlet", "Branches"],
-            early_game=["Power Treads", "Magic Wand", "Wraith Band"],
-            mid_game=["Black King Bar", "Manta Style", "Dragon Lance"],
-            late_game=["Satanic", "Butterfly", "Skadi", "Bloodthorn"],
-            situational=["Silver Edge", "Monkey King Bar", "Hurricane Pike"]
-        ),
-        stats=HeroStats(win_rate=51.2, pick_rate=10.5, tier="A")
-    ),
-    
-    "razor": Hero(
-        id="razor",
-        name="Razor",
-        localized_name="Razor",
-        primary_attr="agi",
-        attack_type="Ranged",
-        roles=["Carry", "Durable", "Nuker"],
-        description="Танкующий керри с Static Link.",
-        strengths=["Static Link крадет урон", "Высокая живучесть", "Eye of the Storm"],
-        weaknesses=["Медленный", "Низкий урон без Link", "Кайтится"],
-        counters=HeroCounters(
-            weak_against=["Sniper", "Drow Ranger", "Viper", "Venomancer"],
-            counter_items=["Force Staff", "Ghost Scepter", "Heaven's Halberd", "Eul's Scepter"],
-            countered_by={"heroes": ["Sniper", "Drow Ranger"], "description": "Дальнобойные кайтят"}
-        ),
-        builds=HeroBuild(
-            starting_items=["Tango", "Salve", "Circlet", "Branches"],
-            early_game=["Phase Boots", "Magic Wand", "Wraith Band"],
-            mid_game=["Black King Bar", "Sange and Yasha", "Aghanim's Scepter"],
-            late_game=["Satanic", "Butterfly", "Skadi", "Refresher Orb"],
-            situational=["Silver Edge", "Bloodthorn", "Hurricane Pike"]
-        ),
-        stats=HeroStats(win_rate=49.2, pick_rate=6.8, tier="C")
-    ),
-    
-    "viper": Hero(
-        id="viper",
-        name="Viper",
-        localized_name="Viper",
-        primary_attr="agi",
-        attack_type="Ranged",
-        roles=["Carry", "Durable", "Disabler", "Nuker"],
-        description="Токсичный керри с Corrosive Skin.",
-        strengths=["Сильный на линии", "Замедление", "Танк", "Простой"],
-        weaknesses=["Медленный", "Нет мобильности", "Падает в лейте"],
-        counters=HeroCounters(
-            weak_against=["Sniper", "Drow Ranger", "Storm Spirit", "Anti-Mage"],
-            counter_items=["Black King Bar", "Force Staff", "Heaven's Halberd", "Eul's Scepter"],
-            countered_by={"heroes": ["Sniper", "Storm Spirit"], "description": "Мобильные герои убивают"}
-        ),
-        builds=HeroBuild(
-            starting_items=["Tango", "Salve", "Circlet", "Branches"],
-            early_game=["Phase Boots", "Magic Wand", "Wraith Band"],
-            mid_game=["Black King Bar", "Dragon Lance", "Aghanim's Scepter"],
-            late_game=["Satanic", "Butterfly", "Skadi", "Bloodthorn"],
-            situational=["Silver Edge", "Hurricane Pike", "Monkey King Bar"]
-        ),
-        stats=HeroStats(win_rate=51.8, pick_rate=8.2, tier="B")
-    ),
-    
-    "weaver": Hero(
-        id="weaver",
-        name="Weaver",
-        localized_name="Weaver",
-        primary_attr="agi",
-        attack_type="Ranged",
-        roles=["Carry", "Escape"],
-        description="Мобильный керри с Shukuchi и Time Lapse.",
-        strengths=["Высокая мобильность", "Time Lapse", "Трудно убить", "Geminate Attack"],
-        weaknesses=["Хрупкий", "Зависим от маны", "Контрится Detection"],
-        counters=HeroCounters(
-            weak_against=["Slardar", "Bounty Hunter", "Spirit Breaker", "Axe"],
-            counter_items=["Dust of Appearance", "Sentry Ward", "Gem of True Sight", "Silver Edge"],
-            countered_by={"heroes": ["Slardar", "Bounty Hunter"], "description": "True Sight убивает инвиз"}
-        ),
-        builds=HeroBuild(
-            starting_items=["Tango", "Salve", "Circlet", "Branches"],
-            early_game=["Power Treads", "Magic Wand", "Wraith Band"],
-            mid_game=["Linken's Sphere", "Black King Bar", "Dragon Lance"],
-            late_game=["Satanic", "Butterfly", "Bloodthorn", "Swift Blink"],
-            situational=["Silver Edge", "Monkey King Bar", "Hurricane Pike"]
-        ),
-        stats=HeroStats(win_rate=50.5, pick_rate=7.5, tier="B")
-    ),
-    
-    "ursa": Hero(
-        id="ursa",
-        name="Ursa",
-        localized_name="Ursa",
-        primary_attr="agi",
-        attack_type="Melee",
-        roles=["Carry", "Durable", "Disabler", "Jungler"],
-        description="Берсерк с Fury Swipes.",
-        strengths=["Огромный урон", "Fury Swipes", "Enrage", "Быстрый Рошан"],
-        weaknesses=["Медленный", "Нет мобильности", "Кайтится"],
-        counters=HeroCounters(
-            weak_against=["Viper", "Venomancer", "Drow Ranger", "Phantom Lancer"],
-            counter_items=["Force Staff", "Ghost Scepter", "Heaven's Halberd", "Eul's Scepter"],
-            countered_by={"heroes": ["Viper", "Phantom Lancer"], "description": "Замедление и иллюзии"}
-        ),
-        builds=HeroBuild(
-            starting_items=["Tango", "Salve", "Stout Shield", "Iron Branch"],
-            early_game=["Phase Boots", "Magic Wand", "Morbid Mask"],
-            mid_game=["Black King Bar", "Sange and Yasha", "Basher"],
-            late_game=["Satanic", "Butterfly", "Abyssal Blade", "Swift Blink"],
-            situational=["Silver Edge", "Bloodthorn", "Skadi"]
-        ),
-        stats=HeroStats(win_rate=51.2, pick_rate=9.8, tier="A")
-    ),
-    
-    "bloodseeker": Hero(
-        id="bloodseeker",
-        name="Bloodseeker",
-        localized_name="Bloodseeker",
-        primary_attr="agi",
-        attack_type="Melee",
-        roles=["Carry", "Disabler", "Jungler", "Nuker"],
-        description="Керри с Rupture и Thirst.",
-        strengths=["Высокая скорость", "Rupture", "Thirst", "Быстрый фарм"],
-        weaknesses=["Хрупкий", "Зависит от ультимейта", "Контрится TP"],
-        counters=HeroCounters(
-            weak_against=["Phantom Assassin", "Anti-Mage", "Storm Spirit", "Nyx Assassin"],
-            counter_items=["Town Portal Scroll", "Force Staff", "Ghost Scepter", "Glimmer Cape"],
-            countered_by={"heroes": ["Phantom Assassin", "Anti-Mage"], "description": "Блинкеры убивают"}
-        ),
-        builds=HeroBuild(
-            starting_items=["Tango", "Salve", "Quelling Blade", "Circlet"],
-            early_game=["Power Treads", "Magic Wand", "Wraith Band"],
-            mid_game=["Black King Bar", "Sange and Yasha", "Maelstrom"],
-            late_game=["Satanic", "Butterfly", "Bloodthorn", "Swift Blink"],
-            situational=["Silver Edge", "Monkey King Bar", "Skadi"]
-        ),
-        stats=HeroStats(win_rate=48.5, pick_rate=6.2, tier="C")
-    ),
-}
+# Снимок базы общий с src: get_hero_db() отдаёт текущий, reload_hero_db() атомарно
+# подменяет его целиком (по SIGHUP или /reload), индексы имён и граф контрпиков внутри
+HEROES_FILE = Path(__file__).parent / "src" / "data" / "heroes_extended.json"
+set_hero_db(HeroDatabase.load(HEROES_FILE))
 
-HEROES_BY_NAME = {}
-for hero_id, hero in HEROES_DATABASE.items():
-    HEROES_BY_NAME[hero_id] = hero
-    HEROES_BY_NAME[hero.name.lower()] = hero
-    HEROES_BY_NAME[hero.name.lower().replace(" ", "")] = hero
-    if hero.localized_name:
-        HEROES_BY_NAME[hero.localized_name.lower()] = hero
+# Готовые предсказания за токенами кнопок «Детали», «Назад» и «Обновить»
+PREDICTION_STORE = PredictionStore(max_entries=1000, ttl=86400)
 
 # ==================== СЕРВИСЫ ====================
 
 class HeroService:
+    @staticmethod
+    def normalize(query: str) -> str:
+        return query.lower().strip().replace(" ", "_").replace("-", "_").replace(" ", "")
+    
     @staticmethod
     def find_hero(query: str) -> Optional[Hero]:
-        query = query.lower().strip().replace(" ", "_").replace("-", "_").replace(" ", "")
-        return HEROES_BY_NAME.get(query)
+        return get_hero_db().by_name.get(HeroService.normalize(query))
     
     @staticmethod
     def search_heroes(query: str, limit: int = 5) -> List[Hero]:
         query = query.lower()
         matches = []
         
-        for hero in HEROES_DATABASE.values():
-            search_terms = [
-                hero.id,
-                hero.name.lower(),
-                hero.name.lower().replace(" ", ""),
-                hero.localized_name.lower() if hero.localized_name else "",
-            ]
-            
-            if any(query in term for term in search_terms if term):
+        for hero, search_terms in get_hero_db().search_terms:
+            if any(query in term for term in search_terms):
                 matches.append(hero)
                 
             if len(matches) >= limit:
@@ -1006,7 +142,7 @@ class HeroService:
     
     @staticmethod
     def get_all_heroes() -> List[Hero]:
-        return list(HEROES_DATABASE.values())
+        return list(get_hero_db().heroes.values())
     
     @staticmethod
     def format_hero_info(hero: Hero) -> str:
@@ -1041,12 +177,12 @@ class HeroService:
         lines = [
             f"🛡️ *Контрпики на {hero.name}:*",
             "",
-            f"💡 *{hero.counters.countered_by.get('description', '')}*",
+            f"💡 *{hero.counters.countered_by.description}*",
             "",
             "⚔️ *Герои-контрпики:*"
         ]
         
-        for i, counter in enumerate(hero.counters.countered_by.get('heroes', [])[:5], 1):
+        for i, counter in enumerate(hero.counters.countered_by.heroes[:5], 1):
             lines.append(f"{i}. {counter}")
             
         lines.extend(["", "🎒 *Контр-предметы:*"])
@@ -1125,19 +261,67 @@ class MatchPredictor:
         ("techies", "fast_game"): -15, # Затягивает игру
     }
     
+    def __init__(self, noise: float = 3.0, cache: Optional[BoundedCache] = None):
+        # разброс детерминирован для каждого драфта: повторный /predict даёт те же числа
+        self.noise = noise
+        # готовые предсказания по составу; сбрасывается при смене снимка базы
+        self.cache = cache
+        self._cache_db: Optional[HeroDatabase] = None
+    
     async def predict(self, radiant: List[str], dire: List[str]) -> MatchPrediction:
-        """Главный метод предсказания"""
+        """Главный метод предсказания.
+        
+        Результат зависит только от состава команд: расчёт идёт в порядке id героев,
+        а имена в ответе возвращаются в порядке ввода.
+        """
+        
+        # Имена переводятся в героев и маски один раз, дальше все этапы работают с DraftTeam
+        db = get_hero_db()
+        rad_team = DraftTeam.resolve(radiant, db).canonical()
+        dire_team = DraftTeam.resolve(dire, db).canonical()
+        key = (rad_team.key, dire_team.key)
+        # нераспознанные имена тоже занимают места в составе (драфт, мета, риски)
+        cache_key = key + (len(rad_team.unknown), len(dire_team.unknown))
+        
+        prediction = self._cache_get(cache_key, db)
+        if prediction is None:
+            prediction = self._predict(rad_team, dire_team, db, key)
+            if self.cache is not None:
+                self.cache.set(cache_key, prediction)
+        
+        return replace(
+            prediction,
+            radiant=replace(prediction.radiant, heroes=list(radiant)),
+            dire=replace(prediction.dire, heroes=list(dire))
+        )
+    
+    def draft_noise(self, key: Tuple[Tuple[str, ...], Tuple[str, ...]]) -> float:
+        """Псевдослучайный разброс, одинаковый для одного и того же драфта"""
+        if not self.noise:
+            return 0.0
+        return seed_to_noise(draft_seed(*key), self.noise)
+    
+    def _cache_get(self, key, db: HeroDatabase) -> Optional[MatchPrediction]:
+        if self.cache is None:
+            return None
+        if db is not self._cache_db:
+            self.cache.clear()
+            self._cache_db = db
+        return self.cache.get(key)
+    
+    def _predict(self, rad_team: "DraftTeam", dire_team: "DraftTeam", db: HeroDatabase, key) -> MatchPrediction:
+        radiant, dire = rad_team.names, dire_team.names
         
         # Анализируем обе команды
-        rad_analysis = self._analyze_team(radiant, "Radiant")
-        dire_analysis = self._analyze_team(dire, "Dire")
+        rad_analysis = self._analyze_team(rad_team, "Radiant")
+        dire_analysis = self._analyze_team(dire_team, "Dire")
         
         # Находим контрматчапы
-        counter_matchups = self._find_counter_matchups(radiant, dire)
+        counter_matchups = self._find_counter_matchups(rad_team, dire_team, db)
         
         # Рассчитываем вероятности
         rad_prob, dire_prob = self._calculate_win_probability(
-            rad_analysis, dire_analysis, counter_matchups
+            rad_analysis, dire_analysis, counter_matchups, self.draft_noise(key)
         )
         
         # Определяем результат
@@ -1163,26 +347,26 @@ class MatchPredictor:
             counter_matchups=counter_matchups
         )
     
-    def _analyze_team(self, heroes: List[str], team_name: str) -> TeamAnalysis:
+    def _analyze_team(self, team: "DraftTeam", team_name: str) -> TeamAnalysis:
         """Анализ одной команды"""
         
         # Базовые метрики
-        synergy = self._calculate_synergy(heroes)
-        draft = self._evaluate_draft(heroes)
-        meta = self._calculate_meta_score(heroes)
+        synergy = self._calculate_synergy(team)
+        draft = self._evaluate_draft(team)
+        meta = self._calculate_meta_score(team)
         
         # Анализ сильных/слабых сторон
-        strengths, weaknesses = self._analyze_strengths_weaknesses(heroes)
+        strengths, weaknesses = self._analyze_strengths_weaknesses(team)
         
         # Ключевые герои
-        key_heroes = self._identify_key_heroes(heroes)
+        key_heroes = self._identify_key_heroes(team)
         
         # Предварительная вероятность победы
         win_prob = (synergy * 0.4 + draft * 0.3 + meta * 0.3)
         
         return TeamAnalysis(
             team_name=team_name,
-            heroes=heroes,
+            heroes=team.names,
             synergy_score=synergy,
             draft_score=draft,
             meta_score=meta,
@@ -1192,30 +376,18 @@ class MatchPredictor:
             key_heroes=key_heroes
         )
     
-    def _calculate_synergy(self, heroes: List[str]) -> float:
+    def _calculate_synergy(self, team: "DraftTeam") -> float:
         """Расчет синергии команды (0-100)"""
-        if len(heroes) < 2:
+        if len(team.names) < 2:
             return 50.0
         
         score = 50.0  # Базовое значение
-        hero_ids = [h.lower().replace(" ", "_") for h in heroes]
-        
-        # Проверяем синергии
-        for (h1, h2), bonus in self.SYNERGIES.items():
-            # Прямой порядок
-            if self._check_hero_match(h1, hero_ids) and self._check_hero_match(h2, hero_ids):
-                score += bonus
-            # Обратный порядок
-            elif self._check_hero_match(h2, hero_ids) and self._check_hero_match(h1, hero_ids):
-                score += bonus
-        
-        # Проверяем антисинергии
-        for (h1, h2), penalty in self.ANTISYNERGIES.items():
-            if self._check_hero_match(h1, hero_ids) and self._check_hero_match(h2, hero_ids):
-                score += penalty
+        
+        # Синергии и антисинергии: правила скомпилированы в маски тегов героев
+        score += team.rules.score(team.tags)
         
         # Бонус за сбалансированный состав
-        roles = self._count_roles(heroes)
+        roles = self._count_roles(team)
         if roles.get("carry", 0) >= 1 and roles.get("support", 0) >= 1:
             score += 10
         if roles.get("initiator", 0) >= 1:
@@ -1227,81 +399,35 @@ class MatchPredictor:
         
         return max(0, min(100, score))
     
-    def _check_hero_match(self, pattern: str, hero_ids: List[str]) -> bool:
-        """Проверяет соответствие героя паттерну"""
-        pattern = pattern.lower()
-        
-        for hero_id in hero_ids:
-            # Точное совпадение
-            if hero_id == pattern:
-                return True
-            # Проверка ролей (melee_carry, mana_hungry и т.д.)
-            hero = HeroService.find_hero(hero_id)
-            if not hero:
-                continue
-            
-            # Проверка атрибутов
-            if pattern == "melee_carry" and hero.attack_type == "Melee" and "Carry" in hero.roles:
-                return True
-            if pattern == "mana_hungry" and hero.primary_attr == "int":
-                return True
-            if pattern == "fast_game" and "Pusher" in hero.roles:
-                return True
-        
-        return False
-    
-    def _count_roles(self, heroes: List[str]) -> Dict[str, int]:
+    def _count_roles(self, team: "DraftTeam") -> Dict[str, int]:
         """Подсчет ролей в команде"""
         roles = {"carry": 0, "support": 0, "initiator": 0, "mid": 0, "offlane": 0}
         
-        for h in heroes:
-            hero = HeroService.find_hero(h)
-            if not hero:
-                continue
-            
-            hero_roles = [r.lower() for r in hero.roles]
-            
-            if any(r in hero_roles for r in ["carry", "nuker"]):
+        for mask in team.masks:
+            if mask & (CARRY | NUKER):
                 roles["carry"] += 1
-            if any(r in hero_roles for r in ["support", "healer", "disabler"]):
+            if mask & (SUPPORT | HEALER | DISABLER):
                 roles["support"] += 1
-            if any(r in hero_roles for r in ["initiator"]):
+            if mask & INITIATOR:
                 roles["initiator"] += 1
         
         return roles
     
-    def _evaluate_draft(self, heroes: List[str]) -> float:
+    def _evaluate_draft(self, team: "DraftTeam") -> float:
         """Оценка качества драфта (0-100)"""
         score = 50.0
+        heroes = team.names
         
         if len(heroes) < 2:
             return score
         
         # Проверяем баланс
-        has_carry = False
-        has_support = False
-        has_initiator = False
-        melee_count = 0
-        ranged_count = 0
-        
-        for h in heroes:
-            hero = HeroService.find_hero(h)
-            if not hero:
-                continue
-            
-            roles = [r.lower() for r in hero.roles]
-            
-            if any(r in roles for r in ["carry", "nuker"]):
-                has_carry = True
-            if any(r in roles for r in ["support", "healer"]):
-                has_support = True
-            if any(r in roles for r in ["initiator", "disabler"]):
-                has_initiator = True
-            
-            if hero.attack_type == "Melee":
-                melee_count += 1
-            else:
-                ranged_count += 1
+        mask = team.mask
+        has_carry = bool(mask & (CARRY | NUKER))
+        has_support = bool(mask & (SUPPORT | HEALER))
+        has_initiator = bool(mask & (INITIATOR | DISABLER))
+        melee_count = sum(1 for m in team.masks if m & MELEE)
+        ranged_count = len(team.masks) - melee_count
         
         # Бонусы
         if has_carry:
@@ -1321,28 +447,29 @@ class MatchPredictor:
         
         return max(0, min(100, score))
     
-    def _calculate_meta_score(self, heroes: List[str]) -> float:
+    def _calculate_meta_score(self, team: "DraftTeam") -> float:
         """Оценка соответствия мете (0-100)"""
-        if not heroes:
+        if not team.names:
             return 0
         
         total = 0
-        for h in heroes:
-            hero = HeroService.find_hero(h)
-            if hero and hero.stats:
+        for hero in team.heroes:
+            if hero.stats:
                 tier_score = {"S": 100, "A": 85, "B": 70, "C": 55, "D": 40}.get(hero.stats.tier, 50)
                 total += tier_score
             else:
                 total += 50  # Среднее по умолчанию
+        # нераспознанные имена — тоже средние
+        total += 50 * (len(team.names) - len(team.heroes))
         
-        return total / len(heroes)
+        return total / len(team.names)
     
-    def _analyze_strengths_weaknesses(self, heroes: List[str]) -> Tuple[List[str], List[str]]:
+    def _analyze_strengths_weaknesses(self, team: "DraftTeam") -> Tuple[List[str], List[str]]:
         """Анализ сильных и слабых сторон"""
         strengths = []
         weaknesses = []
         
-        roles = self._count_roles(heroes)
+        roles = self._count_roles(team)
         
         # Сильные стороны
         if roles.get("carry", 0) >= 1:
@@ -1362,51 +489,37 @@ class MatchPredictor:
         
         return strengths, weaknesses
     
-    def _identify_key_heroes(self, heroes: List[str]) -> List[str]:
+    def _identify_key_heroes(self, team: "DraftTeam") -> List[str]:
         """Определение ключевых героев"""
         key = []
         
-        for h in heroes:
-            hero = HeroService.find_hero(h)
-            if not hero:
-                continue
-            
-            roles = hero.roles
-            
-            if "Carry" in roles:
+        for hero, mask in zip(team.heroes, team.masks):
+            if mask & CARRY:
                 key.append(f"{hero.name} (Керри)")
-            elif "Initiator" in roles:
+            elif mask & INITIATOR:
                 key.append(f"{hero.name} (Инициатор)")
             elif any(r in ["Magnus", "Enigma", "Faceless Void"] for r in [hero.name]):
                 key.append(f"{hero.name} (Teamfight)")
         
         return key[:3]
     
-    def _find_counter_matchups(self, radiant: List[str], dire: List[str]) -> List[Dict]:
+    def _find_counter_matchups(self, radiant: "DraftTeam", dire: "DraftTeam", db: HeroDatabase) -> List[Dict]:
         """Поиск контрматчапов между командами"""
         matchups = []
+        graph = db.counter_graph
         
-        for rad_hero in radiant:
-            rad = HeroService.find_hero(rad_hero)
-            if not rad:
-                continue
-            
-            for dire_hero in dire:
-                dire_h = HeroService.find_hero(dire_hero)
-                if not dire_h:
-                    continue
+        for rad in radiant.heroes:
+            for dire_h in dire.heroes:
+                # Проверяем контрпики: один поиск в таблице на пару
+                rad_weak, dire_weak = graph.matchup(rad.id, dire_h.id)
                 
-                # Проверяем контрпики
-                rad_weak = [w.lower() for w in rad.counters.weak_against]
-                dire_weak = [w.lower() for w in dire_h.counters.weak_against]
-                
-                if dire_hero.lower() in rad_weak:
+                if rad_weak:
                     matchups.append({
                         "type": "bad_for_radiant",
                         "text": f"⚠️ {rad.name} слаб против {dire_h.name}",
                         "impact": -10
                     })
-                elif rad_hero.lower() in dire_weak:
+                elif dire_weak:
                     matchups.append({
                         "type": "good_for_radiant",
                         "text": f"✅ {rad.name} силен против {dire_h.name}",
@@ -1419,7 +532,8 @@ class MatchPredictor:
         self, 
         rad: TeamAnalysis, 
         dire: TeamAnalysis,
-        matchups: List[Dict]
+        matchups: List[Dict],
+        noise: float = 0.0
     ) -> Tuple[float, float]:
         """Расчет вероятности победы"""
         
@@ -1448,8 +562,7 @@ class MatchPredictor:
         rad_prob = (rad_score / total) * 100
         dire_prob = 100 - rad_prob
         
-        # Добавляем случайность для реализма (±3%)
-        noise = random.uniform(-3, 3)
+        # Разброс для реализма: детерминирован по драфту, см. draft_noise
         rad_prob = max(5, min(95, rad_prob + noise))
         dire_prob = 100 - rad_prob
         
@@ -1528,6 +641,61 @@ class MatchPredictor:
         
         return risks
 
+
+@lru_cache(maxsize=2)
+def synergy_rules(db: HeroDatabase) -> SynergyRules:
+    # правила синергий компилируются один раз на снимок базы; после перезагрузки — заново.
+    # masks идут по номерам героев в db.index
+    return SynergyRules(db.index.heroes, MatchPredictor.SYNERGIES, MatchPredictor.ANTISYNERGIES)
+
+
+@dataclass
+class DraftTeam:
+    """Команда, разобранная один раз на запрос: герои, их маски ролей и теги синергий"""
+    names: List[str]
+    heroes: List[Hero]
+    masks: List[int]
+    mask: int
+    tags: int
+    rules: SynergyRules
+    # имена, которых нет в базе: в анализе они только занимают место в составе
+    unknown: List[str] = field(default_factory=list)
+    
+    @classmethod
+    def resolve(cls, names: List[str], db: HeroDatabase) -> "DraftTeam":
+        rules = synergy_rules(db)
+        heroes, masks, unknown = [], [], []
+        tags = mask = 0
+        for name in names:
+            hero = db.by_name.get(HeroService.normalize(name))
+            if hero is None:
+                unknown.append(name)
+                continue
+            i = db.index.of(hero)
+            heroes.append(hero)
+            masks.append(db.index.masks[i])
+            mask |= db.index.masks[i]
+            tags |= rules.masks[i]
+        return cls(names=list(names), heroes=heroes, masks=masks, mask=mask, tags=tags, rules=rules, unknown=unknown)
+    
+    @property
+    def key(self) -> Tuple[str, ...]:
+        return tuple(sorted(hero.id for hero in self.heroes))
+    
+    def canonical(self) -> "DraftTeam":
+        """Та же команда в порядке id героев; нераспознанные имена — в конце"""
+        order = sorted(zip(self.heroes, self.masks), key=lambda pair: pair[0].id)
+        return replace(
+            self,
+            names=[hero.name for hero, _ in order] + self.unknown,
+            heroes=[hero for hero, _ in order],
+            masks=[mask for _, mask in order]
+        )
+
+
+# Один предиктор на процесс: одинаковые драфты отдаются из кэша
+PREDICTOR = MatchPredictor(noise=PREDICTION_NOISE, cache=BoundedCache(max_entries=1024, ttl=3600))
+
 # ==================== ОБРАБОТЧИКИ ====================
 
 class CommandHandlers:
@@ -1598,6 +766,23 @@ ML-предиктор: ✅ Активен
 
 Создано для комьюнити Dota 2"""
         await update.message.reply_text(text, parse_mode='Markdown')
+    
+    @staticmethod
+    async def reload_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Перечитать базу героев без рестарта (только для админов)"""
+        user = update.effective_user
+        if user.id not in ADMIN_IDS:
+            return
+        
+        try:
+            db = await reload_hero_db()
+        except HeroDataError as e:
+            logger.error(f"Hero database reload failed: {e}")
+            await update.message.reply_text(f"❌ Ошибка в данных, оставлена прежняя база:\n{e}")
+            return
+        
+        logger.info(f"Hero database reloaded by {user.id}")
+        await update.message.reply_text(f"✅ База героев перезагружена: {len(db)} героев")
 
 class HeroHandlers:
     @staticmethod
@@ -1766,27 +951,57 @@ class PredictionHandlers:
         msg = await update.message.reply_text("🔮 Анализирую составы...")
         
         try:
-            predictor = MatchPredictor()
-            pred = await predictor.predict(radiant, dire)
-            
-            text = self._format_prediction(pred)
+            pred = await PREDICTOR.predict(radiant, dire)
             
-            # Callback data (короткий)
-            rad_key = ",".join([h[:3] for h in radiant])
-            dire_key = ",".join([h[:3] for h in dire])
-            
-            keyboard = InlineKeyboardMarkup([
-                [InlineKeyboardButton("📊 Детали", callback_data=f"d:{rad_key}:{dire_key}")],
-                [InlineKeyboardButton("🔄 Новый анализ", callback_data="new")]
-            ])
+            # В callback data только токен: имена героев не влезают в 64 байта
+            token = PREDICTION_STORE.put(
+                pred,
+                [HeroService.find_hero(h).id for h in radiant],
+                [HeroService.find_hero(h).id for h in dire]
+            )
             
-            await msg.edit_text(text, parse_mode='Markdown', reply_markup=keyboard)
+            await msg.edit_text(
+                self._format_prediction(pred),
+                parse_mode='Markdown',
+                reply_markup=self._summary_keyboard(token)
+            )
             
         except Exception as e:
             logger.error(f"Prediction error: {e}")
             await msg.edit_text("❌ Ошибка анализа")
     
-    def _format_prediction(self, pred: MatchPrediction) -> str:
+    @staticmethod
+    def _summary_keyboard(token: str) -> InlineKeyboardMarkup:
+        return InlineKeyboardMarkup([
+            [
+                InlineKeyboardButton("📊 Детали", callback_data=f"pd:{token}"),
+                InlineKeyboardButton("🔁 Обновить", callback_data=f"pr:{token}")
+            ],
+            [InlineKeyboardButton("🔄 Новый анализ", callback_data="new")]
+        ])
+    
+    @staticmethod
+    def _format_details(pred: MatchPrediction) -> str:
+        lines = ["📊 *ДЕТАЛЬНЫЙ АНАЛИЗ*", ""]
+        
+        for label, team in (("🟢 *Свет:*", pred.radiant), ("🔴 *Тьма:*", pred.dire)):
+            lines.extend([
+                f"{label} {', '.join(team.heroes)}",
+                f"Синергия: {team.synergy_score:.0f} | Драфт: {team.draft_score:.0f} | Мета: {team.meta_score:.0f}"
+            ])
+            if team.key_heroes:
+                lines.append(f"Ключевые: {', '.join(team.key_heroes)}")
+            lines.extend(team.strengths + team.weaknesses)
+            lines.append("")
+        
+        if pred.counter_matchups:
+            lines.append("*⚔️ Контрматчапы:*")
+            lines.extend(m["text"] for m in pred.counter_matchups)
+        
+        return "\n".join(lines)
+    
+    @staticmethod
+    def _format_prediction(pred: MatchPrediction) -> str:
         lines = [
             "🔮 *ПРЕДСКАЗАНИЕ МАТЧА (ML)*",
             "",
@@ -1900,11 +1115,47 @@ class CallbackHandlers:
                 
                 await query.edit_message_text("📋 *Выбери героя:*", parse_mode='Markdown', reply_markup=InlineKeyboardMarkup(keyboard))
             
+            elif data.startswith(("pd:", "pb:", "pr:")):
+                token = data.split(":", 1)[1]
+                stored = PREDICTION_STORE.get(token)
+                if stored is None:
+                    await query.edit_message_text("⌛ Предсказание устарело. Повтори `/predict`", parse_mode='Markdown')
+                elif data.startswith("pr:"):
+                    await CallbackHandlers._refresh_prediction(query, stored)
+                elif data.startswith("pd:"):
+                    keyboard = InlineKeyboardMarkup([[InlineKeyboardButton("🔙 Назад", callback_data=f"pb:{token}")]])
+                    await query.edit_message_text(PredictionHandlers._format_details(stored.prediction), parse_mode='Markdown', reply_markup=keyboard)
+                else:
+                    await query.edit_message_text(
+                        PredictionHandlers._format_prediction(stored.prediction),
+                        parse_mode='Markdown',
+                        reply_markup=PredictionHandlers._summary_keyboard(token)
+                    )
+            
             elif data == "new":
                 await query.edit_message_text("🔮 Введи: `/predict [свет] vs [тьма]`", parse_mode='Markdown')
         
         except Exception as e:
             logger.error(f"Callback error: {e}")
+    
+    @staticmethod
+    async def _refresh_prediction(query, stored):
+        """Пересчёт по сохранённым id: предиктор детерминирован, числа меняются только с новой базой"""
+        db = get_hero_db()
+        radiant = [db.heroes[h].name for h in stored.radiant if h in db.heroes]
+        dire = [db.heroes[h].name for h in stored.dire if h in db.heroes]
+        
+        pred = await PREDICTOR.predict(radiant, dire)
+        if pred.win_probability_radiant == stored.prediction.win_probability_radiant:
+            # тот же текст: Telegram отклоняет редактирование без изменений
+            return
+        
+        token = PREDICTION_STORE.put(pred, stored.radiant, stored.dire)
+        await query.edit_message_text(
+            PredictionHandlers._format_prediction(pred),
+            parse_mode='Markdown',
+            reply_markup=PredictionHandlers._summary_keyboard(token)
+        )
 
 class ErrorHandlers:
     @staticmethod
@@ -1930,6 +1181,7 @@ def create_application():
     app.add_handler(CommandHandler("help", CommandHandlers.help_command))
     app.add_handler(CommandHandler("list", CommandHandlers.list_heroes))
     app.add_handler(CommandHandler("about", CommandHandlers.about))
+    app.add_handler(CommandHandler("reload", CommandHandlers.reload_command))
     
     # Герои
     app.add_handler(CommandHandler("hero", HeroHandlers.hero_command))
@@ -1957,10 +1209,16 @@ def create_application():
 
 # ==================== ЗАПУСК ====================
 
+async def reload_heroes():
+    try:
+        await reload_hero_db()
+    except HeroDataError as e:
+        logger.error(f"Hero database reload failed, keeping the previous one: {e}")
+
 async def main():
     logger.info("=" * 50)
     logger.info("Dota 2 Counter Bot v2.1")
-    logger.info(f"Heroes: {len(HEROES_DATABASE)} | ML Predictor: Active")
+    logger.info(f"Heroes: {len(get_hero_db())} | ML Predictor: Active")
     logger.info("=" * 50)
     
     if not BOT_TOKEN:
@@ -1972,6 +1230,12 @@ async def main():
         await application.initialize()
         await application.start()
         
+        # kill -HUP <pid> перечитывает базу героев без рестарта
+        if hasattr(signal, "SIGHUP"):
+            asyncio.get_running_loop().add_signal_handler(
+                signal.SIGHUP, lambda: asyncio.create_task(reload_heroes())
+            )
+        
         logger.info("Bot started! Polling...")
         
         await application.updater.start_polling(
@@ -1,3 +1,6 @@
 from .opendota import OpenDotaAPI
+from .circuit_breaker import CircuitBreaker
+from .disk_cache import DiskCache
+from .rate_limiter import RateLimiter, RateLimitExceeded
 
-__all__ = ['OpenDotaAPI']
+__all__ = ['OpenDotaAPI', 'DiskCache', 'RateLimiter', 'RateLimitExceeded', 'CircuitBreaker']
@@ -0,0 +1,77 @@
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitBreaker:
+    """Предохранитель для внешнего API.
+
+    closed — запросы идут как обычно, сбои и слишком медленные ответы считаются подряд.
+    open — после failure_threshold таких ответов запросы сразу отклоняются.
+    half_open — через reset_timeout пропускается один пробный запрос:
+    успех закрывает цепь, сбой снова открывает её. Если проба так и не
+    завершилась (отмена, локальный лимит), через reset_timeout пускается следующая.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        latency_threshold: float = 5.0
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.latency_threshold = latency_threshold
+        self.failures = 0
+        self.opened_at = 0.0
+        self._state = self.CLOSED
+        self._probe_started = 0.0
+        self.stats = {
+            "opened": 0,
+            "short_circuited": 0,
+        }
+
+    @property
+    def state(self) -> str:
+        if self._state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+            self._state = self.HALF_OPEN
+            self._probe_started = 0.0
+        return self._state
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        now = time.monotonic()
+        if state == self.HALF_OPEN and now - self._probe_started >= self.reset_timeout:
+            self._probe_started = now
+            return True
+        self.stats["short_circuited"] += 1
+        return False
+
+    def record_success(self, latency: float = 0.0):
+        if latency > self.latency_threshold:
+            logger.warning(f"Slow upstream response: {latency:.1f}s")
+            self.record_failure()
+            return
+        if self._state != self.CLOSED:
+            logger.info("Circuit closed, upstream recovered")
+        self._state = self.CLOSED
+        self.failures = 0
+
+    def record_failure(self):
+        self.failures += 1
+        if self._state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            self._open()
+
+    def _open(self):
+        if self._state != self.OPEN:
+            self.stats["opened"] += 1
+            logger.warning(f"Circuit opened after {self.failures} failures, retry in {self.reset_timeout:.0f}s")
+        self._state = self.OPEN
+        self.opened_at = time.monotonic()
@@ -0,0 +1,167 @@
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class DiskEntry:
+    payload: Any
+    fetched_at: float
+    ttl: float
+    size: int
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.fetched_at
+
+    @property
+    def expired(self) -> bool:
+        return self.age > self.ttl
+
+
+class DiskCache:
+    """Персистентный кэш ответов OpenDota в SQLite.
+
+    Хранит сырые JSON-ответы, поэтому переживает рестарты и деплои.
+    Все обращения к базе выполняются в пуле потоков, чтобы не блокировать event loop.
+    """
+
+    SCHEMA_VERSION = 1
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS responses (
+            key TEXT PRIMARY KEY,
+            payload BLOB NOT NULL,
+            fetched_at REAL NOT NULL,
+            ttl REAL NOT NULL,
+            size INTEGER NOT NULL,
+            etag TEXT,
+            last_modified TEXT
+        )
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        self._migrate()
+
+    def _connect(self) -> sqlite3.Connection:
+        # sqlite3-соединение нельзя делить между потоками: по одному на поток пула
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def _migrate(self):
+        conn = self._connect()
+        conn.execute(self.SCHEMA)
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version < 1:
+            # v0 -> v1: валидаторы для условных запросов
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(responses)")}
+            for column in ("etag", "last_modified"):
+                if column not in columns:
+                    conn.execute(f"ALTER TABLE responses ADD COLUMN {column} TEXT")
+        conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+
+    def _get(self, key: str) -> Optional[DiskEntry]:
+        row = self._connect().execute(
+            "SELECT payload, fetched_at, ttl, size, etag, last_modified FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        payload, fetched_at, ttl, size, etag, last_modified = row
+        return DiskEntry(
+            payload=json.loads(payload),
+            fetched_at=fetched_at,
+            ttl=ttl,
+            size=size,
+            etag=etag,
+            last_modified=last_modified
+        )
+
+    def _set(
+        self,
+        key: str,
+        raw: bytes,
+        ttl: float,
+        fetched_at: float,
+        etag: Optional[str],
+        last_modified: Optional[str]
+    ):
+        self._connect().execute(
+            "INSERT OR REPLACE INTO responses (key, payload, fetched_at, ttl, size, etag, last_modified) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (key, raw, fetched_at, ttl, len(raw), etag, last_modified)
+        )
+
+    def _touch(self, key: str, ttl: float, fetched_at: float):
+        self._connect().execute(
+            "UPDATE responses SET fetched_at = ?, ttl = ? WHERE key = ?", (fetched_at, ttl, key)
+        )
+
+    def _purge_expired(self, grace: float) -> int:
+        cursor = self._connect().execute(
+            "DELETE FROM responses WHERE fetched_at + ttl + ? < ?", (grace, time.time())
+        )
+        return cursor.rowcount
+
+    async def get(self, key: str) -> Optional[DiskEntry]:
+        try:
+            return await asyncio.to_thread(self._get, key)
+        except (sqlite3.Error, ValueError) as e:
+            logger.error(f"Disk cache read failed for {key}: {e}")
+            return None
+
+    async def set(
+        self,
+        key: str,
+        raw: bytes,
+        ttl: float,
+        fetched_at: Optional[float] = None,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None
+    ):
+        try:
+            await asyncio.to_thread(self._set, key, raw, ttl, fetched_at or time.time(), etag, last_modified)
+        except sqlite3.Error as e:
+            logger.error(f"Disk cache write failed for {key}: {e}")
+
+    async def touch(self, key: str, ttl: float):
+        """Ответ 304: данные не изменились, продлеваем срок жизни без перезаписи payload"""
+        try:
+            await asyncio.to_thread(self._touch, key, ttl, time.time())
+        except sqlite3.Error as e:
+            logger.error(f"Disk cache touch failed for {key}: {e}")
+
+    async def purge_expired(self, grace: float = 0) -> int:
+        """Удаляет записи, просроченные больше чем на grace секунд; возвращает их число"""
+        try:
+            return await asyncio.to_thread(self._purge_expired, grace)
+        except sqlite3.Error as e:
+            logger.error(f"Disk cache purge failed: {e}")
+            return 0
+
+    def close(self):
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
@@ -1,91 +1,439 @@
 import aiohttp
 import asyncio
-from typing import Optional, List, Dict, Any
-from datetime import datetime, timedelta
+import json
+import random
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Optional, List, Dict, Any, Tuple
+from datetime import datetime, timezone
 import logging
 
+from src.api.circuit_breaker import CircuitBreaker
+from src.api.disk_cache import DiskCache
+from src.api.rate_limiter import RateLimiter, RateLimitExceeded
+from src.data.matchup_matrix import get_matchup_matrix
 from src.models.stats import HeroStats, MatchupStats, MetaReport
+from src.utils.cache import BoundedCache, sweep_periodically
 
 logger = logging.getLogger(__name__)
 
+_MISSING = object()
+
+
+@dataclass
+class CachedResponse:
+    data: Any
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    
+    def conditional_headers(self) -> Dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
 
 class OpenDotaAPI:
     BASE_URL = "https://api.opendota.com/api"
+    BACKOFF_BASE = 0.5
+    BACKOFF_CAP = 30.0
     
-    def __init__(self, cache_ttl: int = 3600):
+    def __init__(
+        self,
+        cache_ttl: int = 3600,
+        max_staleness: float = 6 * 60 * 60,
+        max_retries: int = 3,
+        rate_limiter: Optional[RateLimiter] = None,
+        disk_cache: Optional[DiskCache] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        cache_max_entries: int = 512,
+        cache_max_bytes: int = 128 * 1024 * 1024,
+        cache_sweep_interval: float = 300,
+        disk_purge_interval: float = 3600,
+        pool_limit: int = 20,
+        pool_limit_per_host: int = 10,
+        keepalive_timeout: float = 60,
+        dns_cache_ttl: int = 300,
+        not_found_ttl: float = 600,
+        error_ttl: float = 30
+    ):
         self.session: Optional[aiohttp.ClientSession] = None
         self.cache_ttl = cache_ttl
-        self._cache: Dict[str, Any] = {}
-        self._cache_time: Dict[str, datetime] = {}
+        self.max_staleness = max_staleness
+        self.max_retries = max_retries
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.disk_cache = disk_cache
+        self.circuit_breaker = circuit_breaker or CircuitBreaker()
+        self.pool_limit = pool_limit
+        self.pool_limit_per_host = pool_limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_cache_ttl = dns_cache_ttl
+        self.cache_sweep_interval = cache_sweep_interval
+        self.disk_purge_interval = disk_purge_interval
+        self._cache = BoundedCache(
+            max_entries=cache_max_entries,
+            max_bytes=cache_max_bytes,
+            ttl=cache_ttl,
+            max_stale=max_staleness
+        )
+        # Короткоживущие отрицательные записи: 404 и сбои upstream, значение — вид ошибки
+        self.not_found_ttl = not_found_ttl
+        self.error_ttl = error_ttl
+        self._negative_cache = BoundedCache(max_entries=1024, max_bytes=1024 * 1024, ttl=error_ttl)
+        self._sweep_task: Optional[asyncio.Task] = None
+        self._purge_task: Optional[asyncio.Task] = None
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._stats_index: Optional[Tuple[List[Dict], Dict[int, HeroStats]]] = None
+        self._meta_memo: Optional[Tuple[List[Dict], int, MetaReport]] = None
+        self.stats: Dict[str, int] = {
+            "requests": 0,
+            "deduplicated": 0,
+            "disk_hits": 0,
+            "stale_served": 0,
+            "stale_fallbacks": 0,
+            "background_refreshes": 0,
+            "not_modified": 0,
+            "bytes_received": 0,
+            "bytes_saved": 0,
+            "retries": 0,
+            "rate_limited": 0,
+            "negative_hits_not_found": 0,
+            "negative_hits_error": 0,
+        }
         
-    async def __aenter__(self):
+    async def start(self):
+        """Открывает долгоживущую сессию с пулом keep-alive соединений"""
+        if self.session and not self.session.closed:
+            return
+            
+        connector = aiohttp.TCPConnector(
+            limit=self.pool_limit,
+            limit_per_host=self.pool_limit_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            ttl_dns_cache=self.dns_cache_ttl,
+            use_dns_cache=True
+        )
         self.session = aiohttp.ClientSession(
+            connector=connector,
             timeout=aiohttp.ClientTimeout(total=30),
-            headers={"User-Agent": "Dota2CounterBot/1.0"}
+            headers={
+                "User-Agent": "Dota2CounterBot/1.0",
+                "Accept-Encoding": "gzip, deflate"
+            }
         )
-        return self
+        if self._sweep_task is None:
+            self._sweep_task = asyncio.create_task(
+                sweep_periodically([self._cache, self._negative_cache], self.cache_sweep_interval)
+            )
+        if self.disk_cache and self._purge_task is None:
+            self._purge_task = asyncio.create_task(self._purge_disk_periodically())
         
-    async def __aexit__(self, exc_type, exc_val, exc_tb):
+    async def _purge_disk_periodically(self):
+        """Фоновая задача: чистит SQLite от записей, которые уже не годятся даже как устаревшие.
+
+        Просроченная запись нужна для stale-ответа и условного запроса в пределах
+        max_staleness (см. _load), поэтому удаляются только более старые.
+        """
+        while True:
+            removed = await self.disk_cache.purge_expired(grace=self.max_staleness)
+            if removed:
+                logger.info(f"Disk cache purge removed {removed} expired responses")
+            await asyncio.sleep(self.disk_purge_interval)
+        
+    async def close(self):
+        if self._sweep_task:
+            self._sweep_task.cancel()
+            self._sweep_task = None
+        if self._purge_task:
+            self._purge_task.cancel()
+            self._purge_task = None
         if self.session:
             await self.session.close()
+            self.session = None
+        if self.disk_cache:
+            self.disk_cache.close()
+        
+    async def __aenter__(self):
+        await self.start()
+        return self
+        
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
             
-    def _get_cache(self, key: str) -> Optional[Any]:
-        if key not in self._cache:
-            return None
-        cached_time = self._cache_time.get(key)
-        if cached_time and datetime.now() - cached_time > timedelta(seconds=self.cache_ttl):
-            del self._cache[key]
-            del self._cache_time[key]
-            return None
-        return self._cache[key]
+    def _get_cache(self, key: str) -> Any:
+        """Данные из памяти или _MISSING; пустой список — такой же валидный ответ"""
+        cached = self._cache.get(key, _MISSING)
+        return cached if cached is _MISSING else cached.data
+        
+    def _set_cache(
+        self,
+        key: str,
+        value: CachedResponse,
+        stored_at: Optional[float] = None,
+        size: Optional[int] = None
+    ):
+        self._cache.set(key, value, size=size, stored_at=stored_at)
+        
+    def _set_negative(self, key: str, status: int):
+        if status == 404:
+            self._negative_cache.set(key, "not_found", ttl=self.not_found_ttl, size=0)
+        else:
+            self._negative_cache.set(key, "error", ttl=self.error_ttl, size=0)
         
-    def _set_cache(self, key: str, value: Any):
-        self._cache[key] = value
-        self._cache_time[key] = datetime.now()
+    def get_stats(self) -> Dict[str, int]:
+        cache_stats = {f"cache_{k}": v for k, v in self._cache.get_stats().items()}
+        negative_stats = {f"negative_cache_{k}": v for k, v in self._negative_cache.get_stats().items()}
+        circuit_stats = {f"circuit_{k}": v for k, v in self.circuit_breaker.stats.items()}
+        return {
+            **self.stats, **cache_stats, **negative_stats, **circuit_stats,
+            "circuit_state": self.circuit_breaker.state
+        }
         
-    async def _request(self, endpoint: str, params: Optional[Dict] = None) -> Optional[Any]:
+    async def _request(
+        self,
+        endpoint: str,
+        params: Optional[Dict] = None,
+        stale_while_revalidate: bool = False,
+        force: bool = False
+    ) -> Optional[Any]:
         cache_key = f"{endpoint}:{str(params)}"
-        cached = self._get_cache(cache_key)
-        if cached:
-            return cached
+        
+        if not force:
+            cached = self._get_cache(cache_key)
+            if cached is not _MISSING:
+                return cached
+                
+            # Недавний 404 или сбой: не ходим в сеть (и не обновляем в фоне),
+            # отдаём устаревшее, если оно есть
+            negative = self._negative_cache.get(cache_key)
+            if negative is not None:
+                self.stats[f"negative_hits_{negative}"] += 1
+                entry = self._cache.get_entry(cache_key)
+                return entry.value.data if entry else None
+                    
+            # Просроченные данные отдаём сразу, обновление идёт в фоне
+            if stale_while_revalidate:
+                entry = self._cache.get_entry(cache_key)
+                if entry is not None:
+                    self.stats["stale_served"] += 1
+                    if cache_key not in self._inflight:
+                        self.stats["background_refreshes"] += 1
+                    self._get_load_task(endpoint, params, cache_key)
+                    return entry.value.data
+                    
+        # shield: отмена одного вызывающего не отменяет загрузку для остальных
+        return await asyncio.shield(self._get_load_task(endpoint, params, cache_key))
+        
+    def _get_load_task(self, endpoint: str, params: Optional[Dict], cache_key: str) -> asyncio.Task:
+        # Одинаковые запросы в полёте ждут одну общую задачу
+        task = self._inflight.get(cache_key)
+        if task is not None:
+            self.stats["deduplicated"] += 1
+            return task
+            
+        task = asyncio.ensure_future(self._load(endpoint, params, cache_key))
+        self._inflight[cache_key] = task
+        task.add_done_callback(lambda _: self._inflight.pop(cache_key, None))
+        return task
+            
+    async def _load(self, endpoint: str, params: Optional[Dict], cache_key: str) -> Optional[Any]:
+        """Память -> диск -> сеть; при сбое сети отдаём устаревшие данные в пределах max_staleness"""
+        entry = self._cache.get_entry(cache_key)
+        previous = entry.value if entry else None
+        previous_at = entry.stored_at if entry else None
+        previous_size = entry.size if entry else 0
+        stale_ok = entry is not None
+        
+        if entry is None and self.disk_cache:
+            disk_entry = await self.disk_cache.get(cache_key)
+            if disk_entry:
+                previous = CachedResponse(disk_entry.payload, disk_entry.etag, disk_entry.last_modified)
+                previous_at = disk_entry.fetched_at
+                previous_size = disk_entry.size
+                if not disk_entry.expired:
+                    self.stats["disk_hits"] += 1
+                    self._set_cache(cache_key, previous, previous_at, size=previous_size)
+                    return previous.data
+                # Даже очень старая запись годится для условного запроса
+                stale_ok = disk_entry.age <= disk_entry.ttl + self.max_staleness
+                
+        data = await self._fetch(endpoint, params, cache_key, previous, previous_size)
+        
+        if data is None and stale_ok:
+            self.stats["stale_fallbacks"] += 1
+            logger.warning(f"Serving stale {endpoint} from {datetime.fromtimestamp(previous_at):%H:%M}, upstream unavailable")
+            self._set_cache(cache_key, previous, previous_at, size=previous_size)
+            return previous.data
             
-        if not self.session:
-            raise RuntimeError("Session not initialized")
+        return data
+        
+    async def _fetch(
+        self,
+        endpoint: str,
+        params: Optional[Dict],
+        cache_key: str,
+        previous: Optional[CachedResponse] = None,
+        previous_size: int = 0
+    ) -> Optional[Any]:
+        if not self.session or self.session.closed:
+            await self.start()
             
         url = f"{self.BASE_URL}/{endpoint}"
+        headers = previous.conditional_headers() if previous else {}
+        
+        breaker = self.circuit_breaker
+        
+        for attempt in range(self.max_retries + 1):
+            retry_after = None
+            
+            # Цепь разомкнута: не ждём таймаута, вызывающий сразу получит кэш или None
+            if not breaker.allow():
+                logger.debug(f"Circuit open, skipping {endpoint}")
+                return None
+                
+            try:
+                await self.rate_limiter.acquire()
+            except RateLimitExceeded as e:
+                self.stats["rate_limited"] += 1
+                logger.warning(f"Skipping {endpoint}: {e}")
+                return None
+                
+            self.stats["requests"] += 1
+            started = time.monotonic()
+            
+            try:
+                async with self.session.get(url, params=params, headers=headers) as response:
+                    if response.status < 500 and response.status != 429:
+                        breaker.record_success(time.monotonic() - started)
+                    else:
+                        breaker.record_failure()
+                        
+                    if response.status == 304 and previous is not None:
+                        # Данные не изменились: продлеваем TTL без скачивания и парсинга
+                        self.stats["not_modified"] += 1
+                        self._negative_cache.pop(cache_key)
+                        self.stats["bytes_saved"] += previous_size
+                        self._set_cache(cache_key, previous, size=previous_size)
+                        if self.disk_cache:
+                            await self.disk_cache.touch(cache_key, self.cache_ttl)
+                        return previous.data
+                    elif response.status == 200:
+                        raw = await response.read()
+                        self._record_transfer(response, len(raw))
+                        data = json.loads(raw)
+                        cached = CachedResponse(
+                            data=data,
+                            etag=response.headers.get("ETag"),
+                            last_modified=response.headers.get("Last-Modified")
+                        )
+                        self._set_cache(cache_key, cached, size=len(raw))
+                        self._negative_cache.pop(cache_key)
+                        if self.disk_cache:
+                            await self.disk_cache.set(
+                                cache_key, raw, self.cache_ttl,
+                                etag=cached.etag, last_modified=cached.last_modified
+                            )
+                        return data
+                    elif response.status == 429 or response.status >= 500:
+                        retry_after = self._parse_retry_after(response.headers.get("Retry-After"))
+                        if response.status == 429:
+                            self.rate_limiter.pause(retry_after or self.BACKOFF_BASE * 2 ** attempt)
+                        logger.warning(f"API error {response.status} for {endpoint} (attempt {attempt + 1})")
+                    else:
+                        logger.error(f"API error {response.status}: {await response.text()}")
+                        self._set_negative(cache_key, response.status)
+                        return None
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                breaker.record_failure()
+                logger.warning(f"Request to {endpoint} failed (attempt {attempt + 1}): {e}")
+            except Exception as e:
+                breaker.record_failure()
+                logger.error(f"Request failed: {e}")
+                self._set_negative(cache_key, 0)
+                return None
+                
+            if attempt == self.max_retries:
+                break
+                
+            delay = self._backoff_delay(attempt, retry_after)
+            if delay is None:
+                logger.warning(f"Retry-After {retry_after:.0f}s for {endpoint} is too long, giving up")
+                break
+                
+            self.stats["retries"] += 1
+            await asyncio.sleep(delay)
+            
+        self._set_negative(cache_key, 0)
+        return None
         
+    def _record_transfer(self, response: aiohttp.ClientResponse, decoded_size: int):
+        # aiohttp распаковывает тело сам; Content-Length — размер сжатых данных на проводе
+        wire_size = response.headers.get("Content-Length")
+        wire_size = int(wire_size) if wire_size and wire_size.isdigit() else decoded_size
+        self.stats["bytes_received"] += wire_size
+        if response.headers.get("Content-Encoding") in ("gzip", "deflate"):
+            self.stats["bytes_saved"] += max(0, decoded_size - wire_size)
+        
+    def _backoff_delay(self, attempt: int, retry_after: Optional[float]) -> Optional[float]:
+        """Экспоненциальная задержка с full jitter; Retry-After имеет приоритет"""
+        if retry_after is not None:
+            if retry_after > self.BACKOFF_CAP:
+                return None
+            return retry_after + random.uniform(0, self.BACKOFF_BASE)
+        return random.uniform(0, min(self.BACKOFF_CAP, self.BACKOFF_BASE * 2 ** attempt))
+        
+    @staticmethod
+    def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
         try:
-            async with self.session.get(url, params=params) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    self._set_cache(cache_key, data)
-                    return data
-                elif response.status == 429:
-                    logger.warning("Rate limit exceeded, waiting...")
-                    await asyncio.sleep(1)
-                    return await self._request(endpoint, params)
-                else:
-                    logger.error(f"API error {response.status}: {await response.text()}")
-                    return None
-        except Exception as e:
-            logger.error(f"Request failed: {e}")
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
             return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
             
-    async def get_hero_stats(self) -> Optional[List[Dict]]:
-        return await self._request("heroStats")
+    async def get_hero_stats(self, force: bool = False) -> Optional[List[Dict]]:
+        return await self._request("heroStats", stale_while_revalidate=True, force=force)
+        
+    async def get_hero_matchups(self, hero_id: int, force: bool = False) -> Optional[List[Dict]]:
+        return await self._request(f"heroes/{hero_id}/matchups", force=force)
+        
+    async def get_hero_constants(self, force: bool = False) -> Optional[Dict[str, Dict]]:
+        return await self._request("constants/heroes", force=force)
+        
+    async def get_patches(self, force: bool = False) -> Optional[List[Dict]]:
+        return await self._request("constants/patch", force=force)
         
-    async def get_hero_matchups(self, hero_id: int) -> Optional[List[Dict]]:
-        return await self._request(f"heroes/{hero_id}/matchups")
+    def _get_stats_index(self, stats_list: List[Dict]) -> Dict[int, HeroStats]:
+        """id -> готовый HeroStats; строится один раз на каждый новый payload heroStats"""
+        index = self._stats_index
+        if index and index[0] is stats_list:
+            return index[1]
+            
+        parsed = {}
+        for stat in stats_list:
+            hero_id = stat.get("id")
+            if hero_id is not None:
+                parsed[hero_id] = self._parse_hero_stats(stat)
+                
+        self._stats_index = (stats_list, parsed)
+        return parsed
         
-    async def get_hero_stats_detailed(self, hero_id: int) -> Optional[HeroStats]:
-        stats_list = await self.get_hero_stats()
+    async def get_hero_stats_detailed(self, hero_id: int, force: bool = False) -> Optional[HeroStats]:
+        stats_list = await self.get_hero_stats(force=force)
         if not stats_list:
             return None
             
-        for stat in stats_list:
-            if stat.get("id") == hero_id:
-                return self._parse_hero_stats(stat)
-        return None
+        return self._get_stats_index(stats_list).get(hero_id)
         
     def _parse_hero_stats(self, data: Dict) -> HeroStats:
         pro_win = data.get("pro_win", 0)
@@ -138,12 +486,18 @@ class OpenDotaAPI:
         
         return (win_rate * 0.6) + (popularity * 4)
         
-    async def get_meta_report(self, min_games: int = 50) -> Optional[MetaReport]:
-        stats = await self.get_hero_stats()
+    async def get_meta_report(self, min_games: int = 50, force: bool = False) -> Optional[MetaReport]:
+        stats = await self.get_hero_stats(force=force)
         if not stats:
             return None
             
-        heroes = [self._parse_hero_stats(h) for h in stats if h.get("pro_pick", 0) >= min_games]
+        # Отчёт пересобираем только когда пришёл новый payload heroStats
+        memo = self._meta_memo
+        if memo and memo[0] is stats and memo[1] == min_games:
+            return memo[2]
+            
+        index = self._get_stats_index(stats)
+        heroes = [h for h in index.values() if h.pick_rate >= min_games]
         
         if not heroes:
             return None
@@ -155,7 +509,7 @@ class OpenDotaAPI:
         rising = [h for h in heroes if h.win_rate > 55][:5]
         falling = [h for h in heroes if h.win_rate < 45][:5]
         
-        return MetaReport(
+        report = MetaReport(
             timestamp=datetime.now(),
             top_picks=by_pick,
             top_wins=by_win,
@@ -163,22 +517,27 @@ class OpenDotaAPI:
             rising_heroes=rising,
             falling_heroes=falling
         )
+        self._meta_memo = (stats, min_games, report)
+        return report
         
     async def get_best_counters(self, hero_id: int, min_games: int = 20) -> List[MatchupStats]:
-        matchups = await self.get_hero_matchups(hero_id)
-        if not matchups:
-            return []
+        matrix = get_matchup_matrix()
+        if matrix is not None and hero_id in matrix:
+            rows = matrix.row(hero_id)
+        else:
+            matchups = await self.get_hero_matchups(hero_id)
+            if not matchups:
+                return []
+            rows = [(m.get("hero_id", 0), m.get("wins", 0), m.get("games_played", 0)) for m in matchups]
             
         results = []
-        for m in matchups:
-            games = m.get("games_played", 0)
+        for vs_hero_id, wins, games in rows:
             if games < min_games:
                 continue
                 
-            wins = m.get("wins", 0)
             results.append(MatchupStats(
                 hero_id=hero_id,
-                vs_hero_id=m.get("hero_id", 0),
+                vs_hero_id=vs_hero_id,
                 wins=wins,
                 losses=games - wins
             ))
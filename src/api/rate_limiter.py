@@ -0,0 +1,95 @@
+import asyncio
+import time
+from typing import List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimitExceeded(Exception):
+    """Запрос не укладывается в квоту за допустимое время ожидания"""
+
+    def __init__(self, wait: float):
+        super().__init__(f"Rate limit budget exhausted, next slot in {wait:.1f}s")
+        self.wait = wait
+
+
+class TokenBucket:
+    def __init__(self, capacity: int, period: float):
+        self.capacity = capacity
+        self.rate = capacity / period
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    @property
+    def available(self) -> float:
+        self._refill()
+        return self.tokens
+
+    def time_until_available(self, amount: float = 1) -> float:
+        self._refill()
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+    def consume(self, amount: float = 1):
+        self._refill()
+        self.tokens -= amount
+
+
+class RateLimiter:
+    """Клиентский лимитер под квоты OpenDota (в минуту и в сутки).
+
+    Запрос сразу резервирует слот (токены уходят в долг) и ждёт своей очереди
+    уже без блокировки: каждый следующий видит долг предыдущих и считает своё
+    ожидание от момента вызова. Если слот освободится позже max_wait, запрос
+    сразу получает RateLimitExceeded и ничего не резервирует.
+    """
+
+    def __init__(self, per_minute: int = 60, per_day: int = 2000, max_wait: float = 10.0):
+        self.per_minute = TokenBucket(per_minute, 60)
+        self.per_day = TokenBucket(per_day, 24 * 60 * 60)
+        self.max_wait = max_wait
+        self._blocked_until = 0.0
+
+    @property
+    def buckets(self) -> List[TokenBucket]:
+        return [self.per_minute, self.per_day]
+
+    @property
+    def remaining(self) -> int:
+        return int(min(b.available for b in self.buckets))
+
+    def time_until_available(self) -> float:
+        blocked = max(0.0, self._blocked_until - time.monotonic())
+        return max([blocked] + [b.time_until_available() for b in self.buckets])
+
+    async def acquire(self, max_wait: Optional[float] = None):
+        max_wait = self.max_wait if max_wait is None else max_wait
+        deadline = time.monotonic() + max_wait
+
+        # проверка и резерв без await между ними — атомарны для event loop
+        wait = self.time_until_available()
+        if wait > max_wait:
+            raise RateLimitExceeded(wait)
+        for bucket in self.buckets:
+            bucket.consume()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+        # пока ждали, сервер мог ответить 429 (pause)
+        blocked = self._blocked_until - time.monotonic()
+        if blocked > 0:
+            if time.monotonic() + blocked > deadline:
+                raise RateLimitExceeded(blocked)
+            await asyncio.sleep(blocked)
+
+    def pause(self, seconds: float):
+        """Сервер ответил 429: не пускаем новые запросы seconds секунд"""
+        self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+        logger.warning(f"OpenDota rate limit hit, pausing requests for {seconds:.1f}s")
@@ -1,3 +1,4 @@
-from .heroes_db import HEROES_DATABASE, HEROES_BY_NAME
+from .heroes_db import HeroDatabase, get_hero_db, reload_hero_db
+from .hero_index import HeroIndex
 
-__all__ = ['HEROES_DATABASE', 'HEROES_BY_NAME']
+__all__ = ['HeroDatabase', 'HeroIndex', 'get_hero_db', 'reload_hero_db']
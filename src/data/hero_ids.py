@@ -0,0 +1,28 @@
+# Числовые id героев в OpenDota для героев из heroes.json
+HERO_IDS = {
+    "kez": 145,
+    "muerta": 138,
+    "void_spirit": 126,
+    "ember_spirit": 106,
+    "slardar": 28,
+    "tidehunter": 29,
+    "shadow_shaman": 27,
+    "lich": 31,
+    "lion": 26,
+    "phantom_lancer": 12,
+    "anti_mage": 1,
+}
+
+HERO_NAMES_BY_ID = {
+    145: "Kez",
+    138: "Muerta",
+    126: "Void Spirit",
+    106: "Ember Spirit",
+    28: "Slardar",
+    29: "Tidehunter",
+    27: "Shadow Shaman",
+    31: "Lich",
+    26: "Lion",
+    12: "Phantom Lancer",
+    1: "Anti-Mage",
+}
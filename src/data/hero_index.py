@@ -0,0 +1,79 @@
+from functools import reduce
+from operator import or_
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+from src.models.hero import Hero
+
+# Роли, тип атаки и атрибут героя упакованы в одно целое число:
+# состав команды проверяется побитовым ИЛИ по пяти маскам.
+CARRY = 1 << 0
+SUPPORT = 1 << 1
+NUKER = 1 << 2
+DISABLER = 1 << 3
+INITIATOR = 1 << 4
+ESCAPE = 1 << 5
+DURABLE = 1 << 6
+PUSHER = 1 << 7
+JUNGLER = 1 << 8
+HEALER = 1 << 9
+
+MELEE = 1 << 16
+RANGED = 1 << 17
+
+STR = 1 << 20
+AGI = 1 << 21
+INT = 1 << 22
+UNI = 1 << 23
+
+ROLE_BITS = {
+    "carry": CARRY,
+    "support": SUPPORT,
+    "nuker": NUKER,
+    "disabler": DISABLER,
+    "initiator": INITIATOR,
+    "escape": ESCAPE,
+    "durable": DURABLE,
+    "pusher": PUSHER,
+    "jungler": JUNGLER,
+    "healer": HEALER,
+}
+ATTACK_BITS = {"Melee": MELEE, "Ranged": RANGED}
+ATTR_BITS = {"str": STR, "agi": AGI, "int": INT, "uni": UNI, "all": UNI}
+
+
+def hero_mask(hero: Hero) -> int:
+    mask = ATTACK_BITS.get(hero.attack_type, 0) | ATTR_BITS.get(hero.primary_attr, 0)
+    for role in hero.roles_lower:
+        mask |= ROLE_BITS.get(role, 0)
+    return mask
+
+
+class HeroIndex:
+    """Герои снимка базы под номерами 0..n-1 и их битовые маски.
+
+    Номера действительны только внутри одного снимка HeroDatabase:
+    обработчик переводит имена в номера один раз, дальше предсказатель
+    работает с индексами в кортежах.
+    """
+
+    def __init__(self, heroes: Iterable[Hero]):
+        self.heroes: Tuple[Hero, ...] = tuple(heroes)
+        self.by_id: Dict[str, int] = {hero.id: i for i, hero in enumerate(self.heroes)}
+        self.masks: Tuple[int, ...] = tuple(hero_mask(hero) for hero in self.heroes)
+
+    def __len__(self) -> int:
+        return len(self.heroes)
+
+    def of(self, hero: Hero) -> int:
+        return self.by_id[hero.id]
+
+    def team_mask(self, team: Sequence[int]) -> int:
+        masks = self.masks
+        return reduce(or_, (masks[i] for i in team), 0)
+
+    def count(self, team: Sequence[int], bit: int) -> int:
+        masks = self.masks
+        return sum(1 for i in team if masks[i] & bit)
+
+    def names(self, team: Sequence[int]) -> List[str]:
+        return [self.heroes[i].name for i in team]
@@ -0,0 +1,162 @@
+import asyncio
+import json
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+import logging
+
+from src.data.hero_ids import HERO_IDS, HERO_NAMES_BY_ID
+from src.models.hero import canonical_id
+
+logger = logging.getLogger(__name__)
+
+NPC_PREFIX = "npc_dota_hero_"
+
+
+# slug в ростере совпадает с каноническим id героя в базе
+slugify = canonical_id
+
+
+@dataclass
+class RosterHero:
+    id: int
+    slug: str
+    name: str
+    npc_name: str = ""
+
+
+class HeroRoster:
+    """Полный список героев OpenDota с индексами id <-> slug <-> имя.
+
+    Строится из /constants/heroes, хранится на диске и перечитывается
+    при смене патча. Без сети работает на встроенном HERO_IDS.
+    """
+
+    VERSION = 1
+
+    def __init__(self, heroes: Iterable[RosterHero], patch: Optional[str] = None, fetched_at: float = 0.0):
+        self.patch = patch
+        self.fetched_at = fetched_at
+        self.by_id: Dict[int, RosterHero] = {}
+        self.by_slug: Dict[str, RosterHero] = {}
+
+        for hero in heroes:
+            self.by_id[hero.id] = hero
+            self.by_slug[hero.slug] = hero
+            # внутреннее имя тоже ищется: "antimage", "nevermore", "zuus"
+            if hero.npc_name:
+                self.by_slug.setdefault(hero.npc_name, hero)
+
+    def __len__(self) -> int:
+        return len(self.by_id)
+
+    def __contains__(self, hero_id: int) -> bool:
+        return hero_id in self.by_id
+
+    def find(self, query: str) -> Optional[RosterHero]:
+        return self.by_slug.get(slugify(query))
+
+    def id_for(self, query: str) -> Optional[int]:
+        hero = self.find(query)
+        return hero.id if hero else None
+
+    def name_for(self, hero_id: int) -> Optional[str]:
+        hero = self.by_id.get(hero_id)
+        return hero.name if hero else None
+
+    def slug_for(self, hero_id: int) -> Optional[str]:
+        hero = self.by_id.get(hero_id)
+        return hero.slug if hero else None
+
+    def ids(self) -> List[int]:
+        return sorted(self.by_id)
+
+    @classmethod
+    def from_constants(cls, payload: Dict, patch: Optional[str] = None) -> "HeroRoster":
+        """payload — ответ /constants/heroes: {"1": {"id": 1, "name": "npc_dota_hero_antimage", ...}}"""
+        heroes = []
+        for data in payload.values():
+            hero_id = data.get("id")
+            name = data.get("localized_name")
+            if not hero_id or not name:
+                continue
+            heroes.append(RosterHero(
+                id=hero_id,
+                slug=slugify(name),
+                name=name,
+                npc_name=data.get("name", "").replace(NPC_PREFIX, "")
+            ))
+        return cls(heroes, patch=patch, fetched_at=time.time())
+
+    @classmethod
+    def builtin(cls) -> "HeroRoster":
+        return cls(RosterHero(id=hero_id, slug=slug, name=HERO_NAMES_BY_ID.get(hero_id, slug))
+                   for slug, hero_id in HERO_IDS.items())
+
+    def save(self, path: Path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            "version": self.VERSION,
+            "patch": self.patch,
+            "fetched_at": self.fetched_at,
+            "heroes": [[h.id, h.slug, h.name, h.npc_name] for h in self.by_id.values()],
+        }
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+        tmp.replace(path)
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["HeroRoster"]:
+        path = Path(path)
+        if not path.exists():
+            return None
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            if data.get("version") != cls.VERSION:
+                return None
+            heroes = [RosterHero(*row) for row in data["heroes"]]
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.error(f"Failed to load hero roster {path}: {e}")
+            return None
+        return cls(heroes, patch=data.get("patch"), fetched_at=data.get("fetched_at", 0.0))
+
+
+async def refresh_hero_roster(api, path: Optional[Path] = None) -> HeroRoster:
+    """Перекачивает /constants/heroes, только если вышел новый патч или ростер встроенный"""
+    current = get_hero_roster()
+    patches = await api.get_patches()
+    patch = patches[-1].get("name") if patches else None
+
+    if current.patch is not None and (patch is None or patch == current.patch):
+        return current
+
+    constants = await api.get_hero_constants(force=current.patch is not None)
+    if not constants:
+        return current
+
+    roster = HeroRoster.from_constants(constants, patch=patch)
+    if not roster:
+        return current
+
+    set_hero_roster(roster)
+    logger.info(f"Hero roster updated: {len(roster)} heroes, patch {patch}")
+    if path:
+        await asyncio.to_thread(roster.save, path)
+    return roster
+
+
+_current: Optional[HeroRoster] = None
+
+
+def get_hero_roster() -> HeroRoster:
+    global _current
+    if _current is None:
+        _current = HeroRoster.builtin()
+    return _current
+
+
+def set_hero_roster(roster: HeroRoster):
+    global _current
+    _current = roster
@@ -0,0 +1,177 @@
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import logging
+
+from src.models.hero import CounteredBy, Hero, HeroBuild, HeroCounters, HeroDetails, HeroStats
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+
+PRIMARY_ATTRS = {"str", "agi", "int", "uni", "all"}
+ATTACK_TYPES = {"Melee", "Ranged"}
+LIST_FIELDS = ("roles", "strengths", "weaknesses")
+COUNTER_LIST_FIELDS = ("strong_against", "weak_against", "counter_items", "core_items")
+BUILD_FIELDS = ("starting_items", "early_game", "mid_game", "late_game", "situational")
+
+
+class HeroDataError(ValueError):
+    """Файл с героями не прошёл проверку"""
+
+
+def _check_str_list(value: Any, where: str) -> List[str]:
+    if not isinstance(value, list) or not all(isinstance(v, str) for v in value):
+        raise HeroDataError(f"{where}: expected a list of strings")
+    return value
+
+
+def _check_keys(value: Any, allowed: tuple, where: str):
+    if not isinstance(value, dict):
+        raise HeroDataError(f"{where}: expected an object")
+    unknown = set(value) - set(allowed)
+    if unknown:
+        raise HeroDataError(f"{where}: unknown fields {sorted(unknown)}")
+
+
+def _validate(data: Dict, where: str):
+    for key in ("id", "name"):
+        if not isinstance(data.get(key), str) or not data[key]:
+            raise HeroDataError(f"{where}: missing '{key}'")
+    if data.get("primary_attr", "str") not in PRIMARY_ATTRS:
+        raise HeroDataError(f"{where}: unknown primary_attr {data['primary_attr']!r}")
+    if data.get("attack_type", "Melee") not in ATTACK_TYPES:
+        raise HeroDataError(f"{where}: unknown attack_type {data['attack_type']!r}")
+    for key in LIST_FIELDS:
+        _check_str_list(data.get(key, []), f"{where}.{key}")
+
+    counters = data.get("counters", {})
+    _check_keys(counters, COUNTER_LIST_FIELDS + ("countered_by",), f"{where}.counters")
+    for key in COUNTER_LIST_FIELDS:
+        _check_str_list(counters.get(key, []), f"{where}.counters.{key}")
+    countered_by = counters.get("countered_by", {})
+    _check_keys(countered_by, ("heroes", "items", "description"), f"{where}.counters.countered_by")
+    for key in ("heroes", "items"):
+        _check_str_list(countered_by.get(key, []), f"{where}.counters.countered_by.{key}")
+
+    builds = data.get("builds")
+    if builds is not None:
+        _check_keys(builds, BUILD_FIELDS, f"{where}.builds")
+        for key in BUILD_FIELDS:
+            _check_str_list(builds.get(key, []), f"{where}.builds.{key}")
+
+    stats = data.get("stats")
+    if stats is not None:
+        _check_keys(stats, ("win_rate", "pick_rate", "tier"), f"{where}.stats")
+        for key in ("win_rate", "pick_rate"):
+            if not isinstance(stats.get(key, 0), (int, float, type(None))):
+                raise HeroDataError(f"{where}.stats.{key}: expected a number")
+
+
+def _strings(values: Iterable[str]) -> Tuple[str, ...]:
+    # одни и те же названия предметов и героев повторяются у десятков героев
+    return tuple(sys.intern(v) for v in values)
+
+
+class LazyDetails:
+    """Хранит сырые описание и билд, HeroDetails создаётся при первом вызове"""
+
+    __slots__ = ("_raw", "_details")
+
+    def __init__(self, raw: Dict):
+        self._raw: Optional[Dict] = raw
+        self._details: Optional[HeroDetails] = None
+
+    def __call__(self) -> HeroDetails:
+        if self._details is None:
+            raw = self._raw or {}
+            builds = raw.get("builds")
+            self._details = HeroDetails(
+                description=raw.get("description", ""),
+                builds=HeroBuild(**{k: _strings(v) for k, v in builds.items()}) if builds is not None else None
+            )
+            self._raw = None
+        return self._details
+
+    def __getstate__(self):
+        return (self._raw, self._details)
+
+    def __setstate__(self, state):
+        self._raw, self._details = state
+
+
+class HeroDataFile:
+    """Версионированный JSON с героями.
+
+    Файл читается и проверяется один раз; описание и билды хранятся сырыми
+    словарями и превращаются в HeroDetails только при первом обращении.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.heroes: Dict[str, Hero] = {}
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            raise HeroDataError(f"{self.path}: {e}") from e
+
+        if data.get("version") != FORMAT_VERSION:
+            raise HeroDataError(f"{self.path}: unsupported version {data.get('version')!r}")
+
+        for i, raw in enumerate(data.get("heroes", [])):
+            _validate(raw, f"{self.path.name}[{i}]")
+            hero_id = raw["id"]
+            if hero_id in self.heroes:
+                raise HeroDataError(f"{self.path.name}[{i}]: duplicate id {hero_id!r}")
+            self.heroes[hero_id] = self._make_hero(raw)
+
+        logger.info(f"Loaded {len(self.heroes)} heroes from {self.path.name}")
+
+    def _make_hero(self, raw: Dict) -> Hero:
+        counters = raw.get("counters", {})
+        countered_by = counters.get("countered_by", {})
+        stats = raw.get("stats")
+        localized_name = raw.get("localized_name")
+        return Hero(
+            id=sys.intern(raw["id"]),
+            name=sys.intern(raw["name"]),
+            localized_name=sys.intern(localized_name) if localized_name else None,
+            primary_attr=sys.intern(raw.get("primary_attr", "str")),
+            attack_type=sys.intern(raw.get("attack_type", "Melee")),
+            roles=_strings(raw.get("roles", [])),
+            strengths=_strings(raw.get("strengths", [])),
+            weaknesses=_strings(raw.get("weaknesses", [])),
+            counters=HeroCounters(
+                countered_by=CounteredBy(
+                    heroes=_strings(countered_by.get("heroes", [])),
+                    items=_strings(countered_by.get("items", [])),
+                    description=countered_by.get("description", "")
+                ),
+                **{key: _strings(counters.get(key, [])) for key in COUNTER_LIST_FIELDS}
+            ),
+            stats=HeroStats(**stats) if stats is not None else None,
+            load_details=LazyDetails({
+                "description": raw.get("description", ""),
+                "builds": raw.get("builds"),
+            })
+        )
+
+
+def load_heroes(path: Path) -> Dict[str, Hero]:
+    return HeroDataFile(path).heroes
+
+
+def build_name_index(heroes: Dict[str, Hero]) -> Dict[str, Hero]:
+    """id, имя и локализованное имя в нижнем регистре -> герой"""
+    index = {}
+    for hero_id, hero in heroes.items():
+        index[hero_id] = hero
+        index[hero.name_lower] = hero
+        if hero.localized_name:
+            index[hero.localized_name.lower()] = hero
+    return index
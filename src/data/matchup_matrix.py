@@ -0,0 +1,150 @@
+import asyncio
+import json
+import sys
+import time
+from array import array
+from pathlib import Path
+from typing import Iterable, List, Optional, Set, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class MatchupMatrix:
+    """Плотная матрица матчапов N×N по числовым id героев OpenDota.
+
+    wins[a * size + b] — победы героя a против героя b, games — число игр.
+    Любая пара читается за O(1), без сети и без перебора списков.
+    """
+
+    VERSION = 1
+
+    def __init__(self, size: int, built_at: float = 0.0):
+        self.size = size
+        self.built_at = built_at
+        self.wins = array("I", bytes(4 * size * size))
+        self.games = array("I", bytes(4 * size * size))
+        self.hero_ids: Set[int] = set()
+        # растёт при каждом set_row: кэши, построенные по матрице, сверяют его
+        self.revision = 0
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.built_at
+
+    def __contains__(self, hero_id: int) -> bool:
+        return hero_id in self.hero_ids
+
+    def set_row(self, hero_id: int, matchups: Iterable[dict]):
+        if not 0 <= hero_id < self.size:
+            return
+        base = hero_id * self.size
+        for m in matchups:
+            vs_id = m.get("hero_id", 0)
+            if 0 <= vs_id < self.size:
+                self.wins[base + vs_id] = m.get("wins", 0)
+                self.games[base + vs_id] = m.get("games_played", 0)
+        self.hero_ids.add(hero_id)
+        self.revision += 1
+
+    def get(self, hero_id: int, vs_hero_id: int) -> Tuple[int, int]:
+        if not (0 <= hero_id < self.size and 0 <= vs_hero_id < self.size):
+            return 0, 0
+        i = hero_id * self.size + vs_hero_id
+        return self.wins[i], self.games[i]
+
+    def win_rate(self, hero_id: int, vs_hero_id: int, min_games: int = 1) -> Optional[float]:
+        wins, games = self.get(hero_id, vs_hero_id)
+        if games < max(min_games, 1):
+            return None
+        return wins / games * 100
+
+    def row(self, hero_id: int) -> List[Tuple[int, int, int]]:
+        """(vs_hero_id, wins, games) для всех сыгранных матчапов героя"""
+        if hero_id not in self.hero_ids:
+            return []
+        base = hero_id * self.size
+        return [
+            (vs_id, self.wins[base + vs_id], self.games[base + vs_id])
+            for vs_id in range(self.size)
+            if self.games[base + vs_id]
+        ]
+
+    def save(self, path: Path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        header = {
+            "version": self.VERSION,
+            "size": self.size,
+            "built_at": self.built_at,
+            "byteorder": sys.byteorder,
+            "heroes": sorted(self.hero_ids),
+        }
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        with open(tmp, "wb") as f:
+            f.write(json.dumps(header).encode() + b"\n")
+            self.wins.tofile(f)
+            self.games.tofile(f)
+        tmp.replace(path)
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["MatchupMatrix"]:
+        path = Path(path)
+        if not path.exists():
+            return None
+        try:
+            with open(path, "rb") as f:
+                header = json.loads(f.readline())
+                if header.get("version") != cls.VERSION:
+                    logger.warning(f"Matchup matrix {path} has version {header.get('version')}, ignoring")
+                    return None
+                matrix = cls(header["size"], header["built_at"])
+                cells = matrix.size * matrix.size
+                matrix.wins = array("I")
+                matrix.games = array("I")
+                matrix.wins.fromfile(f, cells)
+                matrix.games.fromfile(f, cells)
+        except (OSError, ValueError, KeyError, EOFError) as e:
+            logger.error(f"Failed to load matchup matrix {path}: {e}")
+            return None
+
+        if header.get("byteorder") != sys.byteorder:
+            matrix.wins.byteswap()
+            matrix.games.byteswap()
+        matrix.hero_ids = set(header.get("heroes", []))
+        return matrix
+
+    @classmethod
+    async def build(cls, api, hero_ids: List[int], concurrency: int = 4, quota_reserve: int = 10) -> "MatchupMatrix":
+        """Скачивает матчапы всех героев с ограниченным параллелизмом.
+
+        Перед каждым запросом ждёт, пока в минутной квоте останется больше
+        quota_reserve вызовов, чтобы не отбирать лимит у пользовательских команд.
+        """
+        matrix = cls(max(hero_ids) + 1 if hero_ids else 0, time.time())
+        semaphore = asyncio.Semaphore(concurrency)
+        limiter = api.rate_limiter
+
+        async def fetch(hero_id: int):
+            async with semaphore:
+                while limiter.per_minute.available <= quota_reserve:
+                    await asyncio.sleep(max(1.0, limiter.per_minute.time_until_available(quota_reserve + 1)))
+                matchups = await api.get_hero_matchups(hero_id, force=True)
+                if matchups is not None:
+                    matrix.set_row(hero_id, matchups)
+
+        await asyncio.gather(*(fetch(hero_id) for hero_id in hero_ids))
+        logger.info(f"Matchup matrix built: {len(matrix.hero_ids)}/{len(hero_ids)} heroes")
+        return matrix
+
+
+_current: Optional[MatchupMatrix] = None
+
+
+def get_matchup_matrix() -> Optional[MatchupMatrix]:
+    return _current
+
+
+def set_matchup_matrix(matrix: Optional[MatchupMatrix]):
+    global _current
+    _current = matrix
@@ -0,0 +1,59 @@
+from typing import Callable, Dict, Iterable, Sequence, Tuple
+
+from src.models.hero import Hero
+
+# Псевдогерои в правилах синергии: признак, которому отвечает любой подходящий герой
+PSEUDO_TAGS: Dict[str, Callable[[Hero], bool]] = {
+    "melee_carry": lambda hero: hero.attack_type == "Melee" and "Carry" in hero.roles,
+    "mana_hungry": lambda hero: hero.primary_attr == "int",
+    "fast_game": lambda hero: "Pusher" in hero.roles,
+}
+
+
+class SynergyRules:
+    """Правила вида {(тег, тег): бонус}, заранее скомпилированные в битовые маски.
+
+    Тег — id героя или псевдогерой из PSEUDO_TAGS. Каждому герою один раз
+    сопоставляется маска тегов, которым он отвечает; маска команды — ИЛИ
+    масок её героев, и правило срабатывает, если в ней есть оба его тега.
+    Один герой может закрыть обе стороны правила, как и раньше при поиске
+    по составу.
+    """
+
+    def __init__(
+        self,
+        heroes: Iterable[Hero],
+        *rule_sets: Dict[Tuple[str, str], float],
+        pseudo_tags: Dict[str, Callable[[Hero], bool]] = PSEUDO_TAGS
+    ):
+        heroes = tuple(heroes)
+        tags = sorted({tag for rules in rule_sets for pair in rules for tag in pair})
+        self.bits: Dict[str, int] = {tag: 1 << i for i, tag in enumerate(tags)}
+        self.rules: Tuple[Tuple[int, float], ...] = tuple(
+            (self.bits[a] | self.bits[b], value)
+            for rules in rule_sets
+            for (a, b), value in rules.items()
+        )
+
+        pseudo = [(self.bits[tag], match) for tag, match in pseudo_tags.items() if tag in self.bits]
+        masks = []
+        for hero in heroes:
+            mask = self.bits.get(hero.id, 0)
+            for bit, match in pseudo:
+                if match(hero):
+                    mask |= bit
+            masks.append(mask)
+
+        # masks идут в порядке heroes (для HeroIndex — по номеру героя)
+        self.masks: Tuple[int, ...] = tuple(masks)
+        self.by_id: Dict[str, int] = {hero.id: mask for hero, mask in zip(heroes, masks)}
+
+    def team_tags(self, team: Sequence[int]) -> int:
+        masks = self.masks
+        tags = 0
+        for i in team:
+            tags |= masks[i]
+        return tags
+
+    def score(self, tags: int) -> float:
+        return sum(value for mask, value in self.rules if tags & mask == mask)
@@ -2,9 +2,9 @@ from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import ContextTypes
 from src.config import logger
 from src.services.hero_service import HeroService
-from src.services.stats_service import StatsService
 from src.handlers.heroes import HeroHandlers
-from src.handlers.predict import PredictionHandlers
+from src.handlers.stats import StatsHandlers
+from src.handlers.predict import BACK_PREFIX, DETAILS_PREFIX, REFRESH_PREFIX, PredictionHandlers
 
 
 class CallbackHandlers:
@@ -31,13 +31,19 @@ class CallbackHandlers:
                 
             elif data.startswith("stats:"):
                 hero_name = data.split(":", 1)[1]
-                await CallbackHandlers._show_stats(update, hero_name)
+                await CallbackHandlers._show_stats(update, context, hero_name)
                 
             elif data.startswith("meta"):
-                await CallbackHandlers._show_meta(update)
+                await CallbackHandlers._show_meta(update, context)
                 
-            elif data.startswith("predict_details:"):
-                await PredictionHandlers(None).show_details(update, context)
+            elif data.startswith(DETAILS_PREFIX):
+                await PredictionHandlers.get(context).show_details(update, context)
+                
+            elif data.startswith(BACK_PREFIX):
+                await PredictionHandlers.get(context).show_summary(update, context)
+                
+            elif data.startswith(REFRESH_PREFIX):
+                await PredictionHandlers.get(context).refresh(update, context)
                 
             elif data == "predict_new":
                 await query.edit_message_text(
@@ -45,13 +51,6 @@ class CallbackHandlers:
                     parse_mode='Markdown'
                 )
                 
-            elif data.startswith("predict_back:"):
-                parts = data.split(":")
-                if len(parts) >= 3:
-                    radiant = parts[1].split(",")
-                    dire = parts[2].split(",")
-                    await PredictionHandlers(None)._make_prediction(update, radiant, dire, query.message)
-                
             elif data == "list":
                 await CallbackHandlers._show_list(update)
                 
@@ -86,49 +85,49 @@ class CallbackHandlers:
         await update.callback_query.edit_message_text(text, parse_mode='Markdown', reply_markup=keyboard)
     
     @staticmethod
-    async def _show_stats(update: Update, hero_name: str):
+    async def _show_stats(update: Update, context: ContextTypes.DEFAULT_TYPE, hero_name: str):
         message = update.callback_query.message
         await message.edit_text("⏳ Обновляю статистику...")
         
         try:
-            async with StatsService() as service:
-                stats = await service.get_hero_stats(hero_name, force_update=True)
-                
-                if not stats:
-                    await message.edit_text("❌ Не удалось загрузить")
-                    return
-                    
-                text = service.format_stats_message(stats)
-                keyboard = InlineKeyboardMarkup([
-                    [InlineKeyboardButton("🔄 Обновить", callback_data=f"stats:{hero_name}")],
-                    [InlineKeyboardButton("🔙 Назад", callback_data=f"hero:{hero_name}")]
-                ])
+            service = StatsHandlers.get_service(context)
+            stats = await service.get_hero_stats(hero_name, force_update=True)
+            
+            if not stats:
+                await message.edit_text("❌ Не удалось загрузить")
+                return
                 
-                await message.edit_text(text, parse_mode='Markdown', reply_markup=keyboard)
+            text = service.format_stats_message(stats)
+            buttons = [[InlineKeyboardButton("🔄 Обновить", callback_data=f"stats:{hero_name}")]]
+            if HeroService.find_hero(hero_name):
+                buttons.append([InlineKeyboardButton("🔙 Назад", callback_data=f"hero:{hero_name}")])
+            keyboard = InlineKeyboardMarkup(buttons)
+            
+            await message.edit_text(text, parse_mode='Markdown', reply_markup=keyboard)
         except Exception as e:
             logger.error(f"Error: {e}")
             await message.edit_text("❌ Ошибка")
     
     @staticmethod
-    async def _show_meta(update: Update):
+    async def _show_meta(update: Update, context: ContextTypes.DEFAULT_TYPE):
         message = update.callback_query.message
         await message.edit_text("⏳ Обновляю мету...")
         
         try:
-            async with StatsService() as service:
-                report = await service.get_meta_report(force_update=True)
-                
-                if not report:
-                    await message.edit_text("❌ Не удалось загрузить")
-                    return
-                    
-                text = service.format_meta_message(report)
-                keyboard = InlineKeyboardMarkup([
-                    [InlineKeyboardButton("🔄 Обновить", callback_data="meta:update")],
-                    [InlineKeyboardButton("📋 Герои", callback_data="list")]
-                ])
+            service = StatsHandlers.get_service(context)
+            report = await service.get_meta_report(force_update=True)
+            
+            if not report:
+                await message.edit_text("❌ Не удалось загрузить")
+                return
                 
-                await message.edit_text(text, parse_mode='Markdown', reply_markup=keyboard)
+            text = service.format_meta_message(report)
+            keyboard = InlineKeyboardMarkup([
+                [InlineKeyboardButton("🔄 Обновить", callback_data="meta:update")],
+                [InlineKeyboardButton("📋 Герои", callback_data="list")]
+            ])
+            
+            await message.edit_text(text, parse_mode='Markdown', reply_markup=keyboard)
         except Exception as e:
             logger.error(f"Error: {e}")
             await message.edit_text("❌ Ошибка")
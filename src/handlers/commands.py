@@ -1,6 +1,8 @@
 from telegram import Update
 from telegram.ext import ContextTypes
-from src.config import MESSAGES, logger
+from src.config import ADMIN_IDS, MESSAGES, logger
+from src.data.heroes_db import reload_hero_db
+from src.data.loader import HeroDataError
 from src.services.hero_service import HeroService
 
 
@@ -66,3 +68,20 @@ class CommandHandlers:
 Использует: Python, python-telegram-bot, OpenDota API
 """
         await update.message.reply_text(text, parse_mode='Markdown')
+    
+    @staticmethod
+    async def reload_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Перечитать heroes.json без рестарта бота (только для админов)"""
+        user = update.effective_user
+        if user.id not in ADMIN_IDS:
+            return
+            
+        try:
+            db = await reload_hero_db()
+        except HeroDataError as e:
+            logger.error(f"Hero database reload failed: {e}")
+            await update.message.reply_text(f"❌ Ошибка в данных, оставлена прежняя база:\n{e}")
+            return
+            
+        logger.info(f"Hero database reloaded by {user.id}")
+        await update.message.reply_text(f"✅ База героев перезагружена: {len(db)} героев")
@@ -1,14 +1,34 @@
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import ContextTypes
-from typing import List, Tuple, Dict
+from typing import List, Optional, Tuple, Dict
 from src.config import logger
+from src.data.heroes_db import HeroDatabase, get_hero_db
+from src.ml.incremental import IncrementalScorer
 from src.ml.predictor import MatchPredictor
 from src.services.hero_service import HeroService
+from src.services.pick_service import PickService
+from src.services.prediction_store import PredictionStore
+from src.services.whatif_service import WhatIfService
+
+
+PREDICTION_HANDLERS_KEY = "prediction_handlers"
+
+# callback_data кнопок предсказания: префикс и токен из PredictionStore
+DETAILS_PREFIX = "pd:"
+BACK_PREFIX = "pb:"
+REFRESH_PREFIX = "pr:"
 
 
 class PredictionHandlers:
-    def __init__(self):
+    def __init__(self, predictor: Optional[MatchPredictor] = None, store: Optional[PredictionStore] = None):
         self.draft_states: Dict[int, dict] = {}
+        self.predictor = predictor or MatchPredictor()
+        self.store = store or PredictionStore()
+        
+    @staticmethod
+    def get(context: ContextTypes.DEFAULT_TYPE) -> "PredictionHandlers":
+        """Общий экземпляр из create_application: один предсказатель и кэш на процесс"""
+        return context.bot_data[PREDICTION_HANDLERS_KEY]
         
     async def predict_quick(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Быстрое предсказание - /predict [ radiant ] vs [ dire ]"""
@@ -19,21 +39,31 @@ class PredictionHandlers:
             )
             return
             
-        args = " ".join(context.args).lower()
-        
+        db = get_hero_db()
+        teams = await self._parse_teams(update, " ".join(context.args).lower(), db)
+        if teams:
+            await self._make_prediction(update, *teams, db=db)
+            
+    async def _parse_teams(
+        self,
+        update: Update,
+        args: str,
+        db: HeroDatabase
+    ) -> Optional[Tuple[List[int], List[int]]]:
+        """'[свет] vs [тьма]' -> номера героев; при ошибке отвечает пользователю и возвращает None"""
         if " vs " not in args and " против " not in args:
             await update.message.reply_text(
                 "❌ Раздели команды словом `vs` или `против`",
                 parse_mode='Markdown'
             )
-            return
+            return None
             
         separator = " vs " if " vs " in args else " против "
         parts = args.split(separator)
         
         if len(parts) != 2:
             await update.message.reply_text("❌ Нужно указать ровно 2 команды")
-            return
+            return None
             
         radiant_text = parts[0].strip()
         dire_text = parts[1].strip()
@@ -41,66 +71,162 @@ class PredictionHandlers:
         radiant = [h.strip() for h in radiant_text.split() if h.strip()]
         dire = [h.strip() for h in dire_text.split() if h.strip()]
         
-        valid_rad, errors_rad = self._validate_heroes(radiant)
-        valid_dire, errors_dire = self._validate_heroes(dire)
+        # Имена переводятся в номера героев один раз, дальше предсказатель работает с ними
+        valid_rad, errors_rad = self._validate_heroes(radiant, db)
+        valid_dire, errors_dire = self._validate_heroes(dire, db)
         
         if errors_rad or errors_dire:
             text = "❌ *Ошибки в названиях:*\n"
             for err in errors_rad + errors_dire:
                 text += f"• {err}\n"
             await update.message.reply_text(text, parse_mode='Markdown')
+            return None
+            
+        return valid_rad, valid_dire
+        
+    async def whatif(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Что если - /whatif [ radiant ] vs [ dire ] : [ изменения ]
+
+        Изменения: `старый>новый` — замена, `-герой` — убрать,
+        `+герой` — добавить в команду, где героев меньше (Свету при равенстве).
+        Драфт пересчитывается IncrementalScorer по одному герою.
+        """
+        args = " ".join(context.args or []).lower()
+        if ":" not in args:
+            await update.message.reply_text(
+                "❌ Укажи драфт и изменения: `/whatif kez void slardar vs muerta ember tide : void>lion -kez +shaman`",
+                parse_mode='Markdown'
+            )
+            return
+            
+        draft_text, changes_text = args.split(":", 1)
+        db = get_hero_db()
+        teams = await self._parse_teams(update, draft_text, db)
+        if not teams:
             return
             
-        await self._make_prediction(update, valid_rad, valid_dire)
-        
-    def _validate_heroes(self, heroes: List[str]) -> Tuple[List[str], List[str]]:
-        valid = []
-        errors = []
-        
-        for hero in heroes:
-            found = HeroService.find_hero(hero)
-            if found:
-                valid.append(found.name)
-            else:
-                matches = HeroService.search_heroes(hero, limit=1)
-                if matches:
-                    valid.append(matches[0].name)
-                else:
-                    errors.append(f"'{hero}' не найден")
-                    
-        return valid, errors
+        try:
+            scorer = IncrementalScorer(*teams, predictor=self.predictor, db=db)
+        except ValueError:
+            await update.message.reply_text("❌ Герой не может быть в драфте дважды")
+            return
+            
+        before = scorer.score()
+        changes = []
+        for change in WhatIfService.split_changes(changes_text):
+            applied = WhatIfService.apply_change(scorer, change, db)
+            if applied is None:
+                await update.message.reply_text(
+                    f"❌ Не получилось применить `{change}`",
+                    parse_mode='Markdown'
+                )
+                return
+            changes.append(WhatIfService.describe_change(applied, db))
+            
+        if not changes:
+            await update.message.reply_text("❌ Нет изменений после `:`", parse_mode='Markdown')
+            return
+            
+        await update.message.reply_text(
+            WhatIfService.format_whatif(scorer, changes, before, scorer.score(), db),
+            parse_mode='Markdown'
+        )
+        
+    async def suggest(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Лучший следующий пик - /suggest [ союзники ] vs [ враги ]"""
+        if not context.args:
+            await update.message.reply_text(
+                "❌ Укажи составы: `/suggest kez void slardar lich vs muerta ember tide lion shaman`",
+                parse_mode='Markdown'
+            )
+            return
+            
+        db = get_hero_db()
+        teams = await self._parse_teams(update, " ".join(context.args).lower(), db)
+        if not teams:
+            return
+            
+        allies, enemies = teams
+        if len(allies) >= 5:
+            await update.message.reply_text("❌ В команде союзников уже 5 героев")
+            return
+        if len(set(allies) | set(enemies)) < len(allies) + len(enemies):
+            await update.message.reply_text("❌ Герой не может быть в драфте дважды")
+            return
+            
+        picks = PickService.suggest_picks(allies, enemies, predictor=self.predictor, db=db)
+        if not picks:
+            await update.message.reply_text("❌ Не осталось свободных героев")
+            return
+            
+        lines = [
+            "🎯 *ЛУЧШИЙ ПИК*",
+            "",
+            f"🟢 *Союзники:* {', '.join(db.index.names(allies))}",
+            f"🔴 *Враги:* {', '.join(db.index.names(enemies))}",
+            "",
+            PickService.format_suggestions(picks),
+            "",
+            "_Вероятность победы союзников после пика; в скобках — изменение_"
+        ]
+        await update.message.reply_text("\n".join(lines), parse_mode='Markdown')
+        
+    def _validate_heroes(self, heroes: List[str], db: HeroDatabase) -> Tuple[List[int], List[str]]:
+        valid, unknown = HeroService.resolve_team(heroes, db)
+        return valid, [f"'{hero}' не найден" for hero in unknown]
         
     async def _make_prediction(
         self, 
         update: Update, 
-        radiant: List[str], 
-        dire: List[str],
-        message=None
+        radiant: List[int], 
+        dire: List[int],
+        message=None,
+        db: Optional[HeroDatabase] = None
     ):
+        """radiant и dire — номера героев в снимке db, в котором их распознали"""
+        db = db or get_hero_db()
         target = message or update.message
         processing_msg = await target.reply_text("🔮 Анализирую составы...")
         
         try:
-            predictor = MatchPredictor()
-            prediction = await predictor.predict(radiant, dire)
-            
-            text = self._format_prediction(prediction)
-            
-            # Создаем callback data (ограничение 64 байта!)
-            rad_str = ",".join(radiant)
-            dire_str = ",".join(dire)
-            
-            keyboard = InlineKeyboardMarkup([
-                [InlineKeyboardButton("📊 Детали", callback_data=f"predict_details:{rad_str}:{dire_str}")],
-                [InlineKeyboardButton("🔄 Новый анализ", callback_data="predict_new")]
-            ])
+            prediction = await self.predictor.predict(radiant, dire, db)
+            token = self.store.put(
+                prediction,
+                [db.index.heroes[i].id for i in radiant],
+                [db.index.heroes[i].id for i in dire]
+            )
             
-            await processing_msg.edit_text(text, parse_mode='Markdown', reply_markup=keyboard)
+            await processing_msg.edit_text(
+                self._format_prediction(prediction),
+                parse_mode='Markdown',
+                reply_markup=self._summary_keyboard(token)
+            )
             
         except Exception as e:
             logger.error(f"Prediction error: {e}")
             await processing_msg.edit_text("❌ Ошибка анализа. Попробуй позже.")
             
+    @staticmethod
+    def _summary_keyboard(token: str) -> InlineKeyboardMarkup:
+        # в callback_data только короткий токен: лимит Telegram — 64 байта
+        return InlineKeyboardMarkup([
+            [
+                InlineKeyboardButton("📊 Детали", callback_data=DETAILS_PREFIX + token),
+                InlineKeyboardButton("🔁 Обновить", callback_data=REFRESH_PREFIX + token)
+            ],
+            [InlineKeyboardButton("🔄 Новый анализ", callback_data="predict_new")]
+        ])
+        
+    def _stored(self, data: str):
+        return self.store.get(data.split(":", 1)[1])
+        
+    @staticmethod
+    async def _expired(update: Update):
+        await update.callback_query.edit_message_text(
+            "⌛ Предсказание устарело. Повтори `/predict`",
+            parse_mode='Markdown'
+        )
+            
     def _format_prediction(self, pred) -> str:
         lines = [
             "🔮 *ПРЕДСКАЗАНИЕ МАТЧА*",
@@ -132,27 +258,65 @@ class PredictionHandlers:
         return "\n".join(lines)
         
     async def show_details(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        """Показать детали предсказания"""
+        """Показать детали предсказания - pd:<токен>"""
         query = update.callback_query
-        await query.answer()
-        
-        data = query.data.split(":")
-        if len(data) < 3:
+        stored = self._stored(query.data)
+        if stored is None:
+            await self._expired(update)
             return
             
-        radiant = data[1].split(",")
-        dire = data[2].split(",")
+        token = query.data.split(":", 1)[1]
+        keyboard = InlineKeyboardMarkup([
+            [InlineKeyboardButton("🔙 Назад", callback_data=BACK_PREFIX + token)]
+        ])
         
-        predictor = MatchPredictor()
-        pred = await predictor.predict(radiant, dire)
+        await query.edit_message_text(
+            self._format_detailed_analysis(stored.prediction),
+            parse_mode='Markdown',
+            reply_markup=keyboard
+        )
         
-        text = self._format_detailed_analysis(pred)
+    async def show_summary(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Вернуться к предсказанию из деталей - pb:<токен>"""
+        query = update.callback_query
+        stored = self._stored(query.data)
+        if stored is None:
+            await self._expired(update)
+            return
+            
+        await query.edit_message_text(
+            self._format_prediction(stored.prediction),
+            parse_mode='Markdown',
+            reply_markup=self._summary_keyboard(query.data.split(":", 1)[1])
+        )
         
-        keyboard = InlineKeyboardMarkup([
-            [InlineKeyboardButton("🔙 Назад", callback_data=f"predict_back:{','.join(radiant)}:{','.join(dire)}")]
-        ])
+    async def refresh(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Обновить предсказание - pr:<токен>.
+
+        Предсказатель отвечает из своего кэша, пока не вышел его TTL,
+        так что пересчёт происходит только после обновления данных.
+        """
+        query = update.callback_query
+        stored = self._stored(query.data)
+        if stored is None:
+            await self._expired(update)
+            return
+            
+        db = get_hero_db()
+        radiant = [db.index.by_id[h] for h in stored.radiant if h in db.index.by_id]
+        dire = [db.index.by_id[h] for h in stored.dire if h in db.index.by_id]
         
-        await query.edit_message_text(text, parse_mode='Markdown', reply_markup=keyboard)
+        prediction = await self.predictor.predict(radiant, dire, db)
+        if prediction.win_probability_radiant == stored.prediction.win_probability_radiant:
+            # тот же текст: Telegram отклоняет редактирование без изменений
+            return
+            
+        token = self.store.put(prediction, stored.radiant, stored.dire)
+        await query.edit_message_text(
+            self._format_prediction(prediction),
+            parse_mode='Markdown',
+            reply_markup=self._summary_keyboard(token)
+        )
         
     def _format_detailed_analysis(self, pred) -> str:
         lines = [
@@ -5,7 +5,15 @@ from src.services.stats_service import StatsService
 from src.services.hero_service import HeroService
 
 
+STATS_SERVICE_KEY = "stats_service"
+
+
 class StatsHandlers:
+    @staticmethod
+    def get_service(context: ContextTypes.DEFAULT_TYPE) -> StatsService:
+        """Общий StatsService, созданный в create_application"""
+        return context.bot_data[STATS_SERVICE_KEY]
+    
     @staticmethod
     async def stats_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         if not context.args:
@@ -17,7 +25,8 @@ class StatsHandlers:
             return
             
         hero_name = " ".join(context.args)
-        hero = HeroService.find_hero(hero_name)
+        # Статистика есть для всего ростера OpenDota, не только для героев из базы
+        hero = HeroService.find_hero(hero_name) or HeroService.resolve_hero(hero_name)
         
         if not hero:
             await update.message.reply_text(
@@ -29,24 +38,24 @@ class StatsHandlers:
         message = await update.message.reply_text("⏳ Загружаю статистику...")
         
         try:
-            async with StatsService() as stats_service:
-                stats = await stats_service.get_hero_stats(hero.name)
-                
-                if not stats:
-                    await message.edit_text(
-                        "❌ Не удалось загрузить статистику. Попробуй позже."
-                    )
-                    return
-                    
-                text = stats_service.format_stats_message(stats)
-                
-                keyboard = InlineKeyboardMarkup([
-                    [InlineKeyboardButton("🔄 Обновить", callback_data=f"stats:{hero.name}")],
-                    [InlineKeyboardButton("🔙 Назад к герою", callback_data=f"hero:{hero.name}")]
-                ])
-                
-                await message.edit_text(text, parse_mode='Markdown', reply_markup=keyboard)
+            stats_service = StatsHandlers.get_service(context)
+            stats = await stats_service.get_hero_stats(hero.name)
+            
+            if not stats:
+                await message.edit_text(
+                    "❌ Не удалось загрузить статистику. Попробуй позже."
+                )
+                return
                 
+            text = stats_service.format_stats_message(stats)
+            
+            buttons = [[InlineKeyboardButton("🔄 Обновить", callback_data=f"stats:{hero.name}")]]
+            if HeroService.find_hero(hero.name):
+                buttons.append([InlineKeyboardButton("🔙 Назад к герою", callback_data=f"hero:{hero.name}")])
+            keyboard = InlineKeyboardMarkup(buttons)
+            
+            await message.edit_text(text, parse_mode='Markdown', reply_markup=keyboard)
+            
         except Exception as e:
             logger.error(f"Error loading stats: {e}")
             await message.edit_text("❌ Ошибка загрузки статистики")
@@ -56,24 +65,24 @@ class StatsHandlers:
         message = await update.message.reply_text("⏳ Анализирую текущую мету...")
         
         try:
-            async with StatsService() as stats_service:
-                report = await stats_service.get_meta_report()
-                
-                if not report:
-                    await message.edit_text(
-                        "❌ Не удалось загрузить данные о мете. Попробуй позже."
-                    )
-                    return
-                    
-                text = stats_service.format_meta_message(report)
-                
-                keyboard = InlineKeyboardMarkup([
-                    [InlineKeyboardButton("🔄 Обновить", callback_data="meta:update")],
-                    [InlineKeyboardButton("📋 Список героев", callback_data="list")]
-                ])
-                
-                await message.edit_text(text, parse_mode='Markdown', reply_markup=keyboard)
+            stats_service = StatsHandlers.get_service(context)
+            report = await stats_service.get_meta_report()
+            
+            if not report:
+                await message.edit_text(
+                    "❌ Не удалось загрузить данные о мете. Попробуй позже."
+                )
+                return
                 
+            text = stats_service.format_meta_message(report)
+            
+            keyboard = InlineKeyboardMarkup([
+                [InlineKeyboardButton("🔄 Обновить", callback_data="meta:update")],
+                [InlineKeyboardButton("📋 Список героев", callback_data="list")]
+            ])
+            
+            await message.edit_text(text, parse_mode='Markdown', reply_markup=keyboard)
+            
         except Exception as e:
             logger.error(f"Error loading meta: {e}")
             await message.edit_text("❌ Ошибка загрузки меты")
@@ -88,7 +97,8 @@ class StatsHandlers:
             return
             
         hero_name = " ".join(context.args)
-        hero = HeroService.find_hero(hero_name)
+        # Статистика есть для всего ростера OpenDota, не только для героев из базы
+        hero = HeroService.find_hero(hero_name) or HeroService.resolve_hero(hero_name)
         
         if not hero:
             await update.message.reply_text(f"❌ Герой '{hero_name}' не найден")
@@ -97,36 +107,38 @@ class StatsHandlers:
         message = await update.message.reply_text("⏳ Анализирую матчапы...")
         
         try:
-            async with StatsService() as stats_service:
-                counters = await stats_service.get_counters_stats(hero.name)
-                
-                if not counters:
-                    await message.edit_text(
-                        "❌ Нет данных о матчапах. Попробуй позже."
-                    )
-                    return
-                    
-                lines = [
-                    f"🛡️ *Статистические контрпики на {hero.name}:*",
-                    "_На основе данных профессиональных матчей_",
-                    ""
-                ]
+            stats_service = StatsHandlers.get_service(context)
+            counters = await stats_service.get_counters_stats(hero.name)
+            
+            if not counters:
+                await message.edit_text(
+                    "❌ Нет данных о матчапах. Попробуй позже."
+                )
+                return
                 
-                for i, counter in enumerate(counters[:7], 1):
-                    lines.append(
-                        f"{i}. *{counter['hero']}*\n"
-                        f"   Винрейт против: {counter['win_rate']:.1f}%\n"
-                        f"   {counter['advantage']}"
-                    )
-                    
-                text = "\n".join(lines)
+            lines = [
+                f"🛡️ *Статистические контрпики на {hero.name}:*",
+                "_На основе данных профессиональных матчей_",
+                ""
+            ]
+            
+            for i, counter in enumerate(counters[:7], 1):
+                lines.append(
+                    f"{i}. *{counter['hero']}*\n"
+                    f"   Винрейт против: {counter['win_rate']:.1f}%\n"
+                    f"   {counter['advantage']}"
+                )
                 
+            text = "\n".join(lines)
+            
+            keyboard = None
+            if HeroService.find_hero(hero.name):
                 keyboard = InlineKeyboardMarkup([
                     [InlineKeyboardButton("🔙 Назад", callback_data=f"hero:{hero.name}")]
                 ])
-                
-                await message.edit_text(text, parse_mode='Markdown', reply_markup=keyboard)
-                
+            
+            await message.edit_text(text, parse_mode='Markdown', reply_markup=keyboard)
+            
         except Exception as e:
             logger.error(f"Error loading counters: {e}")
             await message.edit_text("❌ Ошибка загрузки данных")
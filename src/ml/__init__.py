@@ -1,4 +1,9 @@
 from .predictor import MatchPredictor
-from .features import FeatureExtractor, FeatureVector
+from .batch import BatchPrediction
+from .features import FeatureExtractor, FeatureVector, TeamContext
+from .incremental import DraftScore, IncrementalScorer
 
-__all__ = ['MatchPredictor', 'FeatureExtractor', 'FeatureVector']
+__all__ = [
+    'MatchPredictor', 'BatchPrediction', 'FeatureExtractor', 'FeatureVector', 'TeamContext',
+    'DraftScore', 'IncrementalScorer'
+]
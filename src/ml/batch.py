@@ -0,0 +1,184 @@
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # numpy нужен только для пакетного предсказания
+    np = None
+
+from src.data.hero_index import CARRY, DISABLER, HEALER, INITIATOR, MELEE, NUKER, PUSHER, SUPPORT
+from src.data.hero_roster import HeroRoster, get_hero_roster
+from src.data.heroes_db import HeroDatabase, get_hero_db
+from src.data.matchup_matrix import MatchupMatrix, get_matchup_matrix
+from src.ml.features import FeatureExtractor
+from src.ml.noise import DIRE_MULTIPLIER, MIX1, MIX2, hero_seed
+
+Draft = Tuple[Sequence[int], Sequence[int]]
+
+
+@dataclass
+class BatchPrediction:
+    """Результат predict_batch: массивы длины N, по одному значению на драфт.
+
+    Компоненты synergy, draft и meta имеют форму (N, 2): [Свет, Тьма].
+    """
+    win_probability_radiant: "np.ndarray"
+    win_probability_dire: "np.ndarray"
+    synergy: "np.ndarray"
+    draft: "np.ndarray"
+    meta: "np.ndarray"
+    counter: "np.ndarray"
+
+    def __len__(self) -> int:
+        return len(self.win_probability_radiant)
+
+
+class BatchTables:
+    """Таблицы для векторного расчёта: по герою и по паре героев.
+
+    Номер героя — его индекс в HeroIndex снимка; последняя строка
+    (номер len(index)) — пустой слот для команд короче самой длинной.
+    """
+
+    def __init__(self, db: HeroDatabase, matrix: Optional[MatchupMatrix], roster: HeroRoster):
+        index = db.index
+        rules = FeatureExtractor.synergy_rules(db)
+        size = len(index)
+        self.pad = size
+
+        self.masks = np.zeros(size + 1, dtype=np.int64)
+        self.masks[:size] = index.masks
+        self.melee = (self.masks & MELEE) != 0
+        self.meta = np.zeros(size + 1)
+        self.meta[:size] = [FeatureExtractor.meta_score(hero) for hero in index.heroes]
+
+        # теги синергий и сами правила
+        if len(rules.bits) > 63:
+            raise ValueError(f"Too many synergy tags for int64 masks: {len(rules.bits)}")
+        self.tags = np.zeros(size + 1, dtype=np.int64)
+        self.tags[:size] = rules.masks
+        self.rule_masks = np.array([mask for mask, _ in rules.rules], dtype=np.int64)
+        self.rule_values = np.array([value for _, value in rules.rules], dtype=float)
+
+        # сиды героев для детерминированного разброса, как в MatchPredictor.draft_noise
+        self.seeds = np.zeros(size + 1, dtype=np.uint64)
+        self.seeds[:size] = [hero_seed(hero.id) for hero in index.heroes]
+
+        # преимущество в паре и число учтённых матчапов, как в calculate_counter_score
+        self.advantage = np.zeros((size + 1, size + 1))
+        self.counts = np.zeros((size + 1, size + 1), dtype=np.int64)
+        keys = [hero.id for hero in index.heroes]
+        roster_ids = [roster.id_for(key) for key in keys]
+        for a, (key1, id1) in enumerate(zip(keys, roster_ids)):
+            for b, (key2, id2) in enumerate(zip(keys, roster_ids)):
+                self.advantage[a, b], self.counts[a, b] = FeatureExtractor.pair_advantage(
+                    key1, key2, id1, id2, matrix, db.counter_graph
+                )
+
+    def encode(self, teams: Sequence[Sequence[int]]) -> Tuple["np.ndarray", "np.ndarray"]:
+        """Команды -> массив (N, W) номеров, дополненный пустым слотом, и размеры команд"""
+        sizes = np.array([len(team) for team in teams], dtype=np.int64)
+        width = max(int(sizes.max()) if len(sizes) else 0, 1)
+        encoded = np.full((len(teams), width), self.pad, dtype=np.int64)
+        for row, team in enumerate(teams):
+            encoded[row, :len(team)] = team
+        return encoded, sizes
+
+    def team_scores(self, teams: "np.ndarray", sizes: "np.ndarray"):
+        """synergy, draft и meta для каждой команды, по формулам MatchPredictor"""
+        mask = np.bitwise_or.reduce(self.masks[teams], axis=1)
+        has_carry = (mask & (CARRY | NUKER)) != 0
+        has_initiator = (mask & (INITIATOR | DISABLER)) != 0
+        has_heal = (mask & (SUPPORT | HEALER)) != 0
+        has_push = (mask & PUSHER) != 0
+        melee = self.melee[teams].sum(axis=1)
+        ranged = sizes - melee
+
+        tags = np.bitwise_or.reduce(self.tags[teams], axis=1)
+        fired = (tags[:, None] & self.rule_masks) == self.rule_masks
+        synergy = 50.0 + fired @ self.rule_values
+        synergy += 10.0 * (has_carry & has_initiator & has_heal)
+        synergy -= 20.0 * ~has_carry
+        synergy -= 15.0 * ~has_initiator
+        synergy = np.where(sizes < 2, 50.0, np.clip(synergy, 0, 100))
+
+        draft = (
+            50.0
+            + 15.0 * (has_carry & has_initiator)
+            + 10.0 * ((melee > 0) & (ranged > 0))
+            + 10.0 * has_heal
+            + 5.0 * has_push
+            - 10.0 * np.maximum(5 - sizes, 0)
+        )
+        draft = np.clip(draft, 0, 100)
+
+        meta = np.where(sizes > 0, self.meta[teams].sum(axis=1) / np.maximum(sizes, 1), 0.0)
+        return synergy, draft, meta
+
+    def noise(self, radiant: "np.ndarray", dire: "np.ndarray", amplitude: float) -> "np.ndarray":
+        # uint64 переполняется по модулю 2**64 — ровно как MASK64 в src.ml.noise
+        z = self.seeds[radiant].sum(axis=1, dtype=np.uint64)
+        z = z + self.seeds[dire].sum(axis=1, dtype=np.uint64) * np.uint64(DIRE_MULTIPLIER)
+        z = (z ^ (z >> np.uint64(30))) * np.uint64(MIX1)
+        z = (z ^ (z >> np.uint64(27))) * np.uint64(MIX2)
+        z = z ^ (z >> np.uint64(31))
+        return ((z >> np.uint64(11)).astype(float) * 2.0 ** -53 * 2 - 1) * amplitude
+
+    def counter_scores(self, team1: "np.ndarray", team2: "np.ndarray") -> "np.ndarray":
+        pairs = (team1[:, :, None], team2[:, None, :])
+        advantage = self.advantage[pairs].sum(axis=(1, 2))
+        counts = self.counts[pairs].sum(axis=(1, 2))
+        score = np.clip(50 + advantage / np.maximum(counts, 1), 0, 100)
+        return np.where(counts > 0, score, 50.0)
+
+
+def get_batch_tables(db: HeroDatabase, matrix: Optional[MatchupMatrix], roster: HeroRoster) -> BatchTables:
+    # матрица обновляется на месте (PrefetchScheduler.set_row), поэтому в ключе и её ревизия
+    return _batch_tables(db, matrix, matrix.revision if matrix is not None else 0, roster)
+
+
+@lru_cache(maxsize=2)
+def _batch_tables(db: HeroDatabase, matrix: Optional[MatchupMatrix], revision: int, roster: HeroRoster) -> BatchTables:
+    # пересобираются при смене снимка базы, матрицы матчапов, её ревизии или ростера
+    return BatchTables(db, matrix, roster)
+
+
+def predict_batch(
+    drafts: Sequence[Draft],
+    weights: dict,
+    db: Optional[HeroDatabase] = None,
+    noise: float = 0.0
+) -> BatchPrediction:
+    """noise — амплитуда разброса, как MatchPredictor.noise"""
+    if np is None:
+        raise ImportError("numpy is required for batch prediction")
+
+    tables = get_batch_tables(db or get_hero_db(), get_matchup_matrix(), get_hero_roster())
+    radiant, rad_sizes = tables.encode([r for r, _ in drafts])
+    dire, dire_sizes = tables.encode([d for _, d in drafts])
+
+    rad_synergy, rad_draft, rad_meta = tables.team_scores(radiant, rad_sizes)
+    dire_synergy, dire_draft, dire_meta = tables.team_scores(dire, dire_sizes)
+    counter = tables.counter_scores(radiant, dire)
+
+    rad_score = rad_synergy * weights["synergy"] + rad_draft * weights["draft"] + rad_meta * weights["meta"]
+    dire_score = dire_synergy * weights["synergy"] + dire_draft * weights["draft"] + dire_meta * weights["meta"]
+    counter_bonus = (counter - 50) * weights["counter"]
+    rad_score = rad_score + counter_bonus
+    dire_score = dire_score - counter_bonus
+
+    total = rad_score + dire_score
+    rad_prob = rad_score / np.where(total == 0, 1, total) * 100
+    if noise:
+        rad_prob = rad_prob + tables.noise(radiant, dire, noise)
+    rad_prob = np.where(total == 0, 50.0, np.clip(rad_prob, 5, 95))
+
+    return BatchPrediction(
+        win_probability_radiant=rad_prob,
+        win_probability_dire=100 - rad_prob,
+        synergy=np.stack([rad_synergy, dire_synergy], axis=1),
+        draft=np.stack([rad_draft, dire_draft], axis=1),
+        meta=np.stack([rad_meta, dire_meta], axis=1),
+        counter=counter
+    )
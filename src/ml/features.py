@@ -1,9 +1,15 @@
 import math
-from typing import List, Dict, Tuple, Optional
+from functools import lru_cache
+from typing import List, Dict, Tuple, Optional, Sequence
 from dataclasses import dataclass
 
+from src.data.counter_graph import CounterGraph
+from src.data.heroes_db import HeroDatabase, get_hero_db
+from src.data.hero_index import CARRY, DISABLER, HEALER, INITIATOR, MELEE, NUKER, PUSHER, SUPPORT
+from src.data.hero_roster import get_hero_roster
+from src.data.matchup_matrix import MatchupMatrix, get_matchup_matrix
+from src.data.synergy_rules import SynergyRules
 from src.models.hero import Hero
-from src.services.hero_service import HeroService
 
 
 @dataclass
@@ -28,6 +34,22 @@ class FeatureVector:
     teamfight_score: float
 
 
+@dataclass
+class TeamContext:
+    """Состав одной команды, разобранный один раз на запрос.
+
+    Все этапы предсказания берут героев, признаки и синергию отсюда,
+    а не пересчитывают их каждый по-своему.
+    """
+    db: HeroDatabase
+    heroes: Tuple[int, ...]
+    hero_ids: Tuple[str, ...]
+    names: List[str]
+    tags: int
+    features: Dict[str, float]
+    synergy: float
+
+
 class FeatureExtractor:
     ROLE_WEIGHTS = {
         "Carry": 1.5,
@@ -48,18 +70,22 @@ class FeatureExtractor:
         ("lich", "teamfight"): 8,
     }
     
+    # Матчап из матрицы учитывается, если сыграно не меньше игр; 55% винрейта ≈ +10
+    MATRIX_MIN_GAMES = 20
+    MATRIX_SCALE = 2.0
+    
     ANTISYNERGIES = {
         ("anti_mage", "medusa"): -10,
         ("invoker", "meepo"): -8,
         ("techies", "fast_game"): -15,
     }
     
-    @staticmethod
-    def _get_hero(hero_name: str) -> Optional[Hero]:
-        return HeroService.find_hero(hero_name)
+    TIER_SCORES = {"S": 5, "A": 4, "B": 3, "C": 2, "D": 1}
+    META_SCORES = {"S": 100, "A": 85, "B": 70, "C": 55, "D": 40}
     
     @staticmethod
-    def extract(heroes: List[str]) -> Dict[str, float]:
+    def extract(heroes: Sequence[int], db: Optional[HeroDatabase] = None) -> Dict[str, float]:
+        """heroes — номера героев в HeroIndex снимка db"""
         features = {
             "count": len(heroes),
             "avg_tier": 0,
@@ -75,56 +101,70 @@ class FeatureExtractor:
         if not heroes:
             return features
             
-        total_tier_score = 0
+        index = (db or get_hero_db()).index
+        team = index.team_mask(heroes)
         
-        for hero_name in heroes:
-            hero = FeatureExtractor._get_hero(hero_name)
-            if not hero:
-                continue
-                
-            roles = [r.lower() for r in hero.roles]
-            
-            if any(r in roles for r in ["carry", "nuker"]):
-                features["has_carry"] = 1
-            if any(r in roles for r in ["initiator", "disabler"]):
-                features["has_initiator"] = 1
-            if any(r in roles for r in ["support", "healer"]):
-                features["has_heal"] = 1
-            if "pusher" in roles:
-                features["has_push"] = 1
-                
-            if hero.attack_type == "Melee":
-                features["melee_count"] += 1
-            else:
-                features["ranged_count"] += 1
-                
-            tier_map = {"S": 5, "A": 4, "B": 3, "C": 2, "D": 1}
-            tier_score = tier_map.get(hero.stats.tier if hero.stats else "C", 3)
-            total_tier_score += tier_score
+        features["has_carry"] = int(bool(team & (CARRY | NUKER)))
+        features["has_initiator"] = int(bool(team & (INITIATOR | DISABLER)))
+        features["has_heal"] = int(bool(team & (SUPPORT | HEALER)))
+        features["has_push"] = int(bool(team & PUSHER))
+        features["melee_count"] = index.count(heroes, MELEE)
+        features["ranged_count"] = len(heroes) - features["melee_count"]
+        
+        tier_scores = FeatureExtractor.TIER_SCORES
+        total_tier_score = 0
+        for i in heroes:
+            stats = index.heroes[i].stats
+            total_tier_score += tier_scores.get(stats.tier if stats else "C", 3)
             
-        features["avg_tier"] = total_tier_score / len(heroes) if heroes else 0
+        features["avg_tier"] = total_tier_score / len(heroes)
         
         return features
     
     @staticmethod
-    def calculate_synergy(heroes: List[str]) -> float:
-        if len(heroes) < 2:
+    def meta_score(hero: Hero) -> float:
+        """Насколько герой силён в текущей мете, 0-100; без статистики — 50"""
+        if hero.stats:
+            return FeatureExtractor.META_SCORES.get(hero.stats.tier, 50)
+        return 50
+    
+    @staticmethod
+    def team_context(heroes: Sequence[int], db: Optional[HeroDatabase] = None) -> TeamContext:
+        db = db or get_hero_db()
+        heroes = tuple(heroes)
+        rules = FeatureExtractor.synergy_rules(db)
+        tags = rules.team_tags(heroes)
+        features = FeatureExtractor.extract(heroes, db)
+        return TeamContext(
+            db=db,
+            heroes=heroes,
+            hero_ids=tuple(db.index.heroes[i].id for i in heroes),
+            names=db.index.names(heroes),
+            tags=tags,
+            features=features,
+            synergy=FeatureExtractor.calculate_synergy(tags, features, rules)
+        )
+    
+    @staticmethod
+    def synergy_rules(db: Optional[HeroDatabase] = None) -> SynergyRules:
+        """SYNERGIES и ANTISYNERGIES, скомпилированные под номера героев снимка db"""
+        return _compile_synergy_rules(db or get_hero_db())
+    
+    @staticmethod
+    def calculate_synergy(tags: int, features: Dict[str, float], rules: SynergyRules) -> float:
+        """tags — маска тегов команды (rules.team_tags), features — результат extract"""
+        if features["count"] < 2:
+            return 50.0
+        return FeatureExtractor.synergy_from_rules(rules.score(tags), features)
+        
+    @staticmethod
+    def synergy_from_rules(rules_score: float, features: Dict[str, float]) -> float:
+        """Синергия по сумме сработавших правил и признакам команды"""
+        if features["count"] < 2:
             return 50.0
             
-        synergy_score = 50.0
-        hero_ids = [h.lower().replace(" ", "_") for h in heroes]
+        synergy_score = 50.0 + rules_score
         
-        for (h1, h2), bonus in FeatureExtractor.SYNERGIES.items():
-            if h1 in hero_ids and h2 in hero_ids:
-                synergy_score += bonus
-            elif h2 in hero_ids and h1 in hero_ids:
-                synergy_score += bonus
-                
-        for (h1, h2), penalty in FeatureExtractor.ANTISYNERGIES.items():
-            if h1 in hero_ids and h2 in hero_ids:
-                synergy_score += penalty
-                
-        features = FeatureExtractor.extract(heroes)
         if features["has_carry"] and features["has_initiator"] and features["has_heal"]:
             synergy_score += 10
             
@@ -136,28 +176,34 @@ class FeatureExtractor:
         return max(0, min(100, synergy_score))
     
     @staticmethod
-    def calculate_counter_score(team1: List[str], team2: List[str]) -> float:
-        if not team1 or not team2:
+    def calculate_counter_score(team1: TeamContext, team2: TeamContext) -> float:
+        if not team1.heroes or not team2.heroes:
             return 50.0
             
         total_advantage = 0
         matchups_count = 0
+        matrix = get_matchup_matrix()
+        roster = get_hero_roster()
+        graph = team1.db.counter_graph
+        
+        # id OpenDota ищутся один раз на героя, а не на каждую пару
+        keys1 = team1.hero_ids
+        keys2 = team2.hero_ids
+        roster_ids2 = [roster.id_for(key) for key in keys2]
         
-        for hero1 in team1:
-            h1 = FeatureExtractor._get_hero(hero1)
-            if not h1:
-                continue
+        for key1 in keys1:
+            id1 = roster.id_for(key1)
                 
-            for hero2 in team2:
-                if hero2.lower() in [h.lower() for h in h1.counters.weak_against]:
-                    total_advantage -= 10
-                    matchups_count += 1
-                    
-                h2 = FeatureExtractor._get_hero(hero2)
-                if h2 and hero1.lower() in [h.lower() for h in h2.counters.weak_against]:
-                    total_advantage += 10
-                    matchups_count += 1
+            for key2, id2 in zip(keys2, roster_ids2):
+                advantage, count = FeatureExtractor.pair_advantage(key1, key2, id1, id2, matrix, graph)
+                total_advantage += advantage
+                matchups_count += count
                     
+        return FeatureExtractor.counter_from_sums(total_advantage, matchups_count)
+        
+    @staticmethod
+    def counter_from_sums(total_advantage: float, matchups_count: int) -> float:
+        """Оценка матчапов по сумме pair_advantage и числу учтённых матчапов"""
         if matchups_count == 0:
             return 50.0
             
@@ -165,15 +211,34 @@ class FeatureExtractor:
         return max(0, min(100, 50 + avg_advantage))
     
     @staticmethod
-    def create_feature_vector(radiant: List[str], dire: List[str]) -> FeatureVector:
-        rad_features = FeatureExtractor.extract(radiant)
-        dire_features = FeatureExtractor.extract(dire)
+    def pair_advantage(
+        key1: str,
+        key2: str,
+        id1: Optional[int],
+        id2: Optional[int],
+        matrix: Optional[MatchupMatrix],
+        graph: CounterGraph
+    ) -> Tuple[float, int]:
+        """Преимущество героя key1 над key2 и число учтённых матчапов (0, 1 или 2)"""
+        # Статистика матчапа из матрицы: O(1) на пару, для любого героя из ростера
+        if matrix is not None and id1 is not None:
+            win_rate = matrix.win_rate(id1, id2, FeatureExtractor.MATRIX_MIN_GAMES) if id2 else None
+            if win_rate is not None:
+                advantage = (win_rate - 50) * FeatureExtractor.MATRIX_SCALE
+                return max(-10, min(10, advantage)), 1
+                
+        weak1, weak2 = graph.matchup(key1, key2)
+        return 10 * weak2 - 10 * weak1, weak1 + weak2
+    
+    @staticmethod
+    def create_feature_vector(radiant: TeamContext, dire: TeamContext) -> FeatureVector:
+        rad_features = radiant.features
+        dire_features = dire.features
         
-        rad_synergy = FeatureExtractor.calculate_synergy(radiant)
-        dire_synergy = FeatureExtractor.calculate_synergy(dire)
+        rad_synergy = radiant.synergy
+        dire_synergy = dire.synergy
         
         rad_counter = FeatureExtractor.calculate_counter_score(radiant, dire)
-        dire_counter = FeatureExtractor.calculate_counter_score(dire, radiant)
         
         has_carry = 1 if (rad_features["has_carry"] and dire_features["has_carry"]) else 0
         
@@ -197,3 +262,9 @@ class FeatureExtractor:
             push_score=(rad_features["has_push"] - dire_features["has_push"]) * 10,
             teamfight_score=(rad_synergy - 50) / 2
         )
+
+
+@lru_cache(maxsize=2)
+def _compile_synergy_rules(db: HeroDatabase) -> SynergyRules:
+    # компилируется один раз на снимок базы; после перезагрузки старый вытесняется
+    return SynergyRules(db.index.heroes, FeatureExtractor.SYNERGIES, FeatureExtractor.ANTISYNERGIES)
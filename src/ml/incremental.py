@@ -0,0 +1,234 @@
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from src.data.heroes_db import HeroDatabase, get_hero_db
+from src.data.hero_index import CARRY, DISABLER, HEALER, INITIATOR, MELEE, NUKER, PUSHER, SUPPORT
+from src.data.hero_roster import get_hero_roster
+from src.data.matchup_matrix import get_matchup_matrix
+from src.ml.features import FeatureExtractor
+from src.ml.noise import MASK64, hero_seed, seed_from_sums, seed_to_noise
+from src.ml.predictor import MatchPredictor
+
+RADIANT = "radiant"
+DIRE = "dire"
+
+
+@dataclass
+class DraftScore:
+    """Оценка драфта: те же числа, что дал бы MatchPredictor.predict"""
+    win_probability_radiant: float
+    win_probability_dire: float
+    synergy: Tuple[float, float]
+    draft: Tuple[float, float]
+    meta: Tuple[float, float]
+    counter: float
+
+
+class TeamTally:
+    """Накопленные суммы одной команды, обновляемые по одному герою"""
+
+    def __init__(self):
+        self.heroes: List[int] = []
+        # сколько героев закрывают каждую группу ролей из FeatureExtractor.extract
+        self.carry = 0
+        self.initiator = 0
+        self.heal = 0
+        self.push = 0
+        self.melee = 0
+        self.meta_sum = 0.0
+        self.seed_sum = 0
+        # сколько героев несут каждый тег синергии; tags — маска тегов с ненулевым счётом
+        self.tag_counts: Dict[int, int] = {}
+        self.tags = 0
+        self.rules_score = 0.0
+        # (синергия, драфт, мета) с последнего изменения состава
+        self.scores: Optional[Tuple[float, float, float]] = None
+
+    def features(self) -> Dict[str, float]:
+        count = len(self.heroes)
+        return {
+            "count": count,
+            "has_carry": int(self.carry > 0),
+            "has_initiator": int(self.initiator > 0),
+            "has_heal": int(self.heal > 0),
+            "has_push": int(self.push > 0),
+            "melee_count": self.melee,
+            "ranged_count": count - self.melee,
+        }
+
+
+class IncrementalScorer:
+    """Оценка драфта, которая пересчитывается за O(размер команды) при смене одного героя.
+
+    MatchPredictor считает обе команды с нуля; здесь ведутся суммы по ролям,
+    тегам синергии, мете, сидам разброса и матчапам между командами,
+    и добавление, удаление или замена героя поправляет только их.
+    Герои — номера в HeroIndex снимка db, как в MatchPredictor.predict.
+    """
+
+    def __init__(
+        self,
+        radiant: Sequence[int] = (),
+        dire: Sequence[int] = (),
+        predictor: Optional[MatchPredictor] = None,
+        db: Optional[HeroDatabase] = None
+    ):
+        self.db = db or get_hero_db()
+        self.predictor = predictor or MatchPredictor()
+        self.teams = {RADIANT: TeamTally(), DIRE: TeamTally()}
+        self.counter_advantage = 0.0
+        self.counter_count = 0
+
+        index = self.db.index
+        self._masks = index.masks
+        self._rules = FeatureExtractor.synergy_rules(self.db)
+        # правила, в которых участвует каждый тег: при появлении или пропаже тега проверяются только они
+        self._rules_by_tag: Dict[int, List[int]] = {}
+        for rule, (mask, _) in enumerate(self._rules.rules):
+            for bit in self._bits(mask):
+                self._rules_by_tag.setdefault(bit, []).append(rule)
+
+        # pair_advantage по парам (герой Света, герой Тьмы), по мере надобности
+        self._keys = [hero.id for hero in index.heroes]
+        self._matrix = get_matchup_matrix()
+        self._roster = get_hero_roster()
+        self._roster_ids: Dict[int, Optional[int]] = {}
+        self._pairs: Dict[Tuple[int, int], Tuple[float, int]] = {}
+
+        for hero in radiant:
+            self.add(RADIANT, hero)
+        for hero in dire:
+            self.add(DIRE, hero)
+
+    @staticmethod
+    def _bits(mask: int):
+        while mask:
+            bit = mask & -mask
+            yield bit
+            mask ^= bit
+
+    def heroes(self, side: str) -> List[int]:
+        return list(self.teams[side].heroes)
+
+    def side_of(self, hero: int) -> Optional[str]:
+        for side, team in self.teams.items():
+            if hero in team.heroes:
+                return side
+        return None
+
+    def add(self, side: str, hero: int):
+        self._check_free(hero)
+        team = self.teams[side]
+        team.heroes.append(hero)
+        self._update(team, hero, 1)
+        self._update_counter(side, hero, 1)
+
+    def remove(self, side: str, hero: int):
+        self._check_in(side, hero)
+        self.teams[side].heroes.remove(hero)
+        self._update(self.teams[side], hero, -1)
+        self._update_counter(side, hero, -1)
+
+    def swap(self, side: str, old: int, new: int):
+        """Заменить героя old на new, сохранив его место в команде"""
+        self._check_in(side, old)
+        self._check_free(new)
+        team = self.teams[side]
+        position = team.heroes.index(old)
+        self.remove(side, old)
+        self.add(side, new)
+        team.heroes.insert(position, team.heroes.pop())
+
+    def _check_free(self, hero: int):
+        if self.side_of(hero) is not None:
+            raise ValueError(f"Hero {self._keys[hero]} is already in the draft")
+
+    def _check_in(self, side: str, hero: int):
+        if hero not in self.teams[side].heroes:
+            raise ValueError(f"Hero {self._keys[hero]} is not in {side}")
+
+    def _update(self, team: TeamTally, hero: int, sign: int):
+        team.scores = None
+        mask = self._masks[hero]
+        team.carry += sign * bool(mask & (CARRY | NUKER))
+        team.initiator += sign * bool(mask & (INITIATOR | DISABLER))
+        team.heal += sign * bool(mask & (SUPPORT | HEALER))
+        team.push += sign * bool(mask & PUSHER)
+        team.melee += sign * bool(mask & MELEE)
+        team.meta_sum += sign * FeatureExtractor.meta_score(self.db.index.heroes[hero])
+        team.seed_sum = (team.seed_sum + sign * hero_seed(self._keys[hero])) & MASK64
+
+        # теги, которые появились или пропали, и правила с их участием
+        changed = 0
+        for bit in self._bits(self._rules.masks[hero]):
+            count = team.tag_counts.get(bit, 0) + sign
+            team.tag_counts[bit] = count
+            if count == (1 if sign > 0 else 0):
+                changed |= bit
+        if not changed:
+            return
+
+        before = team.tags
+        after = before | changed if sign > 0 else before & ~changed
+        rules = {rule for bit in self._bits(changed) for rule in self._rules_by_tag.get(bit, ())}
+        for rule in rules:
+            mask, value = self._rules.rules[rule]
+            team.rules_score += value * ((after & mask == mask) - (before & mask == mask))
+        team.tags = after
+
+    def _update_counter(self, side: str, hero: int, sign: int):
+        opponents = self.teams[DIRE if side == RADIANT else RADIANT].heroes
+        for other in opponents:
+            # преимущество всегда считается со стороны Света
+            pair = (hero, other) if side == RADIANT else (other, hero)
+            advantage, count = self._pair(*pair)
+            self.counter_advantage += sign * advantage
+            self.counter_count += sign * count
+
+    def _pair(self, rad: int, dire: int) -> Tuple[float, int]:
+        pair = self._pairs.get((rad, dire))
+        if pair is None:
+            key1, key2 = self._keys[rad], self._keys[dire]
+            pair = FeatureExtractor.pair_advantage(
+                key1, key2, self._roster_id(rad), self._roster_id(dire), self._matrix, self.db.counter_graph
+            )
+            self._pairs[(rad, dire)] = pair
+        return pair
+
+    def _roster_id(self, hero: int) -> Optional[int]:
+        if hero not in self._roster_ids:
+            self._roster_ids[hero] = self._roster.id_for(self._keys[hero])
+        return self._roster_ids[hero]
+
+    def _team_scores(self, team: TeamTally) -> Tuple[float, float, float]:
+        if team.scores is None:
+            features = team.features()
+            synergy = FeatureExtractor.synergy_from_rules(team.rules_score, features)
+            draft = MatchPredictor.draft_score(features)
+            meta = team.meta_sum / len(team.heroes) if team.heroes else 0
+            team.scores = (synergy, draft, meta)
+        return team.scores
+
+    def score(self) -> DraftScore:
+        radiant, dire = self.teams[RADIANT], self.teams[DIRE]
+        rad_scores = self._team_scores(radiant)
+        dire_scores = self._team_scores(dire)
+
+        if radiant.heroes and dire.heroes:
+            counter = FeatureExtractor.counter_from_sums(self.counter_advantage, self.counter_count)
+        else:
+            counter = 50.0
+
+        noise = 0.0
+        if self.predictor.noise:
+            noise = seed_to_noise(seed_from_sums(radiant.seed_sum, dire.seed_sum), self.predictor.noise)
+
+        rad_prob, dire_prob = self.predictor.win_probabilities(rad_scores, dire_scores, counter, noise)
+        return DraftScore(
+            win_probability_radiant=rad_prob,
+            win_probability_dire=dire_prob,
+            synergy=(rad_scores[0], dire_scores[0]),
+            draft=(rad_scores[1], dire_scores[1]),
+            meta=(rad_scores[2], dire_scores[2]),
+            counter=counter
+        )
@@ -0,0 +1,40 @@
+import hashlib
+from functools import lru_cache
+from typing import Iterable
+
+# Детерминированный разброс вероятности. Сид драфта — сумма 64-битных хэшей
+# канонических id героев (порядок героев не важен), у Тьмы с множителем,
+# прогнанная через финализатор splitmix64. Та же арифметика по модулю 2**64
+# векторизуется в numpy (uint64), поэтому predict и predict_batch совпадают.
+
+MASK64 = (1 << 64) - 1
+DIRE_MULTIPLIER = 0x9E3779B97F4A7C15
+MIX1 = 0xBF58476D1CE4E5B9
+MIX2 = 0x94D049BB133111EB
+
+
+@lru_cache(maxsize=None)
+def hero_seed(hero_id: str) -> int:
+    return int.from_bytes(hashlib.blake2b(hero_id.encode(), digest_size=8).digest(), "big")
+
+
+def mix64(z: int) -> int:
+    z = ((z ^ (z >> 30)) * MIX1) & MASK64
+    z = ((z ^ (z >> 27)) * MIX2) & MASK64
+    return z ^ (z >> 31)
+
+
+def draft_seed(radiant_ids: Iterable[str], dire_ids: Iterable[str]) -> int:
+    radiant = sum(hero_seed(hero_id) for hero_id in radiant_ids)
+    dire = sum(hero_seed(hero_id) for hero_id in dire_ids)
+    return seed_from_sums(radiant, dire)
+
+
+def seed_from_sums(radiant: int, dire: int) -> int:
+    """Сид по суммам hero_seed команд: суммы можно вести по одному герою"""
+    return mix64((radiant + dire * DIRE_MULTIPLIER) & MASK64)
+
+
+def seed_to_noise(seed: int, amplitude: float) -> float:
+    """Равномерно в [-amplitude, amplitude): старшие 53 бита сида как доля единицы"""
+    return ((seed >> 11) * 2.0 ** -53 * 2 - 1) * amplitude
@@ -1,9 +1,17 @@
 import math
-import random
-from typing import List, Dict, Tuple, Optional
+from dataclasses import replace
+from typing import List, Dict, Tuple, Optional, Sequence
 
 from src.models.prediction import MatchPrediction, TeamAnalysis, PredictionResult
-from src.ml.features import FeatureExtractor, FeatureVector
+from src.data.heroes_db import HeroDatabase, get_hero_db
+from src.data.hero_index import CARRY, INITIATOR
+from src.ml.batch import BatchPrediction, Draft, predict_batch
+from src.ml.features import FeatureExtractor, FeatureVector, TeamContext
+from src.ml.noise import draft_seed, seed_to_noise
+from src.utils.cache import BoundedCache
+
+# Ключ драфта: отсортированные канонические id героев Света и Тьмы
+DraftKey = Tuple[Tuple[str, ...], Tuple[str, ...]]
 
 
 class MatchPredictor:
@@ -15,17 +23,100 @@ class MatchPredictor:
         "meta": 0.15
     }
     
-    async def predict(self, radiant: List[str], dire: List[str]) -> MatchPrediction:
-        radiant_analysis = await self._analyze_team(radiant, "Radiant")
-        dire_analysis = await self._analyze_team(dire, "Dire")
+    def __init__(self, noise: float = 3.0, cache: Optional[BoundedCache] = None):
+        # разброс вероятности ±noise процентов; детерминирован для каждого драфта, 0 — выключен
+        self.noise = noise
+        # готовые предсказания по ключу драфта; сбрасывается при смене снимка базы
+        self.cache = cache
+        self._cache_db: Optional[HeroDatabase] = None
+        
+    async def predict(
+        self,
+        radiant: Sequence[int],
+        dire: Sequence[int],
+        db: Optional[HeroDatabase] = None
+    ) -> MatchPrediction:
+        """radiant и dire — номера героев в db.index, см. HeroService.resolve_team.
+
+        Результат зависит только от состава команд, не от порядка героев:
+        одинаковые драфты отдаются из кэша, а «Детали» и «Назад» показывают
+        то же предсказание, что и исходное сообщение.
+        """
+        db = db or get_hero_db()
+        key = self.draft_key(radiant, dire, db)
+        
+        prediction = self._cache_get(key, db)
+        if prediction is None:
+            prediction = await self._predict(self._canonical(radiant, db), self._canonical(dire, db), db, key)
+            if self.cache is not None:
+                self.cache.set(key, prediction)
+                
+        return self._in_order(prediction, radiant, dire, db)
+    
+    @staticmethod
+    def draft_key(radiant: Sequence[int], dire: Sequence[int], db: HeroDatabase) -> DraftKey:
+        heroes = db.index.heroes
+        return (
+            tuple(sorted(heroes[i].id for i in radiant)),
+            tuple(sorted(heroes[i].id for i in dire))
+        )
+    
+    def draft_noise(self, key: DraftKey) -> float:
+        """Разброс вероятности для драфта: псевдослучайный, но один и тот же при каждом запуске"""
+        if not self.noise:
+            return 0.0
+        return seed_to_noise(draft_seed(*key), self.noise)
+    
+    @staticmethod
+    def _canonical(team: Sequence[int], db: HeroDatabase) -> List[int]:
+        heroes = db.index.heroes
+        return sorted(team, key=lambda i: heroes[i].id)
+    
+    def _cache_get(self, key: DraftKey, db: HeroDatabase) -> Optional[MatchPrediction]:
+        if self.cache is None:
+            return None
+        if db is not self._cache_db:
+            self.cache.clear()
+            self._cache_db = db
+        return self.cache.get(key)
+    
+    def _in_order(
+        self,
+        prediction: MatchPrediction,
+        radiant: Sequence[int],
+        dire: Sequence[int],
+        db: HeroDatabase
+    ) -> MatchPrediction:
+        """Копия предсказания с героями и линиями в том порядке, в котором их ввели"""
+        rad_names = db.index.names(radiant)
+        dire_names = db.index.names(dire)
+        return replace(
+            prediction,
+            radiant=replace(prediction.radiant, heroes=rad_names),
+            dire=replace(prediction.dire, heroes=dire_names),
+            lane_matchups=self._analyze_lane_matchups(rad_names, dire_names)
+        )
+    
+    async def _predict(
+        self,
+        radiant: Sequence[int],
+        dire: Sequence[int],
+        db: HeroDatabase,
+        key: DraftKey
+    ) -> MatchPrediction:
+        # Герои, признаки и синергия каждой стороны считаются один раз на запрос
+        rad_team = FeatureExtractor.team_context(radiant, db)
+        dire_team = FeatureExtractor.team_context(dire, db)
+        
+        radiant_analysis = await self._analyze_team(rad_team, "Radiant")
+        dire_analysis = await self._analyze_team(dire_team, "Dire")
         
-        lane_matchups = self._analyze_lane_matchups(radiant, dire)
-        counter_matchups = self._analyze_counter_matchups(radiant, dire)
+        counter_matchups = self._analyze_counter_matchups(rad_team, dire_team)
         
-        features = FeatureExtractor.create_feature_vector(radiant, dire)
+        features = FeatureExtractor.create_feature_vector(rad_team, dire_team)
         
         rad_prob, dire_prob = self._calculate_probabilities(
-            features, radiant_analysis, dire_analysis
+            features, radiant_analysis, dire_analysis, self.draft_noise(key)
         )
         
         result, confidence = self._determine_result(rad_prob, dire_prob)
@@ -43,23 +134,26 @@ class MatchPredictor:
             win_probability_dire=dire_prob,
             key_factors=key_factors,
             risk_factors=self._extract_risks(radiant_analysis, dire_analysis),
-            lane_matchups=lane_matchups,
             counter_matchups=counter_matchups
         )
     
-    async def _analyze_team(self, heroes: List[str], team_name: str) -> TeamAnalysis:
-        synergy = FeatureExtractor.calculate_synergy(heroes)
-        draft = self._evaluate_draft(heroes)
-        meta = self._evaluate_meta_score(heroes)
+    def predict_batch(self, drafts: Sequence[Draft], db: Optional[HeroDatabase] = None) -> BatchPrediction:
+        """Векторная оценка множества драфтов сразу (нужен numpy), числа те же, что у predict"""
+        return predict_batch(drafts, self.WEIGHTS, db, self.noise)
+    
+    async def _analyze_team(self, team: TeamContext, team_name: str) -> TeamAnalysis:
+        synergy = team.synergy
+        draft = self._evaluate_draft(team)
+        meta = self._evaluate_meta_score(team)
         
-        strengths, weaknesses = self._analyze_strengths_weaknesses(heroes)
-        key_heroes = self._identify_key_heroes(heroes)
+        strengths, weaknesses = self._analyze_strengths_weaknesses(team)
+        key_heroes = self._identify_key_heroes(team)
         
         win_prob = (synergy + draft + meta) / 3
         
         return TeamAnalysis(
             team_name=team_name,
-            heroes=heroes,
+            heroes=team.names,
             synergy_score=synergy,
             draft_score=draft,
             meta_score=meta,
@@ -69,9 +163,13 @@ class MatchPredictor:
             key_heroes=key_heroes
         )
     
-    def _evaluate_draft(self, heroes: List[str]) -> float:
+    def _evaluate_draft(self, team: TeamContext) -> float:
+        return self.draft_score(team.features)
+    
+    @staticmethod
+    def draft_score(features: Dict[str, float]) -> float:
+        """Оценка драфта по признакам команды (FeatureExtractor.extract)"""
         score = 50.0
-        features = FeatureExtractor.extract(heroes)
         
         if features["has_carry"] and features["has_initiator"]:
             score += 15
@@ -86,27 +184,23 @@ class MatchPredictor:
             
         return max(0, min(100, score))
     
-    def _evaluate_meta_score(self, heroes: List[str]) -> float:
+    def _evaluate_meta_score(self, team: TeamContext) -> float:
+        heroes = team.heroes
         if not heroes:
             return 0
             
         total_score = 0
         
-        for hero_name in heroes:
-            hero = FeatureExtractor._get_hero(hero_name)
-            if hero and hero.stats:
-                tier_score = {"S": 100, "A": 85, "B": 70, "C": 55, "D": 40}.get(hero.stats.tier, 50)
-                total_score += tier_score
-            else:
-                total_score += 50
+        for i in heroes:
+            total_score += FeatureExtractor.meta_score(team.db.index.heroes[i])
                 
         return total_score / len(heroes) if heroes else 0
     
-    def _analyze_strengths_weaknesses(self, heroes: List[str]) -> Tuple[List[str], List[str]]:
+    def _analyze_strengths_weaknesses(self, team: TeamContext) -> Tuple[List[str], List[str]]:
         strengths = []
         weaknesses = []
         
-        features = FeatureExtractor.extract(heroes)
+        features = team.features
         
         if features["has_carry"] and features["has_initiator"]:
             strengths.append("Сбалансированный состав с керри и инициатором")
@@ -128,19 +222,17 @@ class MatchPredictor:
             
         return strengths, weaknesses
     
-    def _identify_key_heroes(self, heroes: List[str]) -> List[str]:
+    def _identify_key_heroes(self, team: TeamContext) -> List[str]:
         key_heroes = []
+        index = team.db.index
         
-        for hero_name in heroes:
-            hero = FeatureExtractor._get_hero(hero_name)
-            if not hero:
-                continue
-                
-            roles = [r.lower() for r in hero.roles]
+        for i in team.heroes:
+            hero = index.heroes[i]
+            mask = index.masks[i]
             
-            if "carry" in roles:
+            if mask & CARRY:
                 key_heroes.append(f"{hero.name} (Керри)")
-            elif "initiator" in roles:
+            elif mask & INITIATOR:
                 key_heroes.append(f"{hero.name} (Инициатор)")
                 
             if hero.name in ["Magnus", "Dark Seer", "Enigma"]:
@@ -161,23 +253,23 @@ class MatchPredictor:
             
         return matchups
     
-    def _analyze_counter_matchups(self, radiant: List[str], dire: List[str]) -> List[Dict]:
+    def _analyze_counter_matchups(self, radiant: TeamContext, dire: TeamContext) -> List[Dict]:
         matchups = []
+        index = radiant.db.index
+        graph = radiant.db.counter_graph
+        rad_heroes = [index.heroes[i] for i in radiant.heroes]
+        dire_heroes = [index.heroes[i] for i in dire.heroes]
         
-        for rad_hero in radiant:
-            for dire_hero in dire:
-                rad = FeatureExtractor._get_hero(rad_hero)
-                dire_h = FeatureExtractor._get_hero(dire_hero)
+        for rad in rad_heroes:
+            for dire_h in dire_heroes:
+                rad_weak, dire_weak = graph.matchup(rad.id, dire_h.id)
                 
-                if not rad or not dire_h:
-                    continue
-                    
-                if dire_hero.lower() in [h.lower() for h in rad.counters.weak_against]:
+                if rad_weak:
                     matchups.append({
                         "type": "bad",
                         "text": f"⚠️ {rad.name} слаб против {dire_h.name}"
                     })
-                elif rad_hero.lower() in [h.lower() for h in dire_h.counters.weak_against]:
+                elif dire_weak:
                     matchups.append({
                         "type": "good",
                         "text": f"✅ {rad.name} силен против {dire_h.name}"
@@ -189,22 +281,40 @@ class MatchPredictor:
         self, 
         features: FeatureVector,
         radiant: TeamAnalysis,
-        dire: TeamAnalysis
+        dire: TeamAnalysis,
+        noise: float = 0.0
+    ) -> Tuple[float, float]:
+        return self.win_probabilities(
+            (radiant.synergy_score, radiant.draft_score, radiant.meta_score),
+            (dire.synergy_score, dire.draft_score, dire.meta_score),
+            features.counter_score,
+            noise
+        )
+    
+    def win_probabilities(
+        self,
+        radiant: Tuple[float, float, float],
+        dire: Tuple[float, float, float],
+        counter_score: float,
+        noise: float = 0.0
     ) -> Tuple[float, float]:
+        """radiant и dire — (синергия, драфт, мета) команды"""
+        rad_synergy, rad_draft, rad_meta = radiant
+        dire_synergy, dire_draft, dire_meta = dire
         
         rad_score = (
-            radiant.synergy_score * self.WEIGHTS["synergy"] +
-            radiant.draft_score * self.WEIGHTS["draft"] +
-            radiant.meta_score * self.WEIGHTS["meta"]
+            rad_synergy * self.WEIGHTS["synergy"] +
+            rad_draft * self.WEIGHTS["draft"] +
+            rad_meta * self.WEIGHTS["meta"]
         )
         
         dire_score = (
-            dire.synergy_score * self.WEIGHTS["synergy"] +
-            dire.draft_score * self.WEIGHTS["draft"] +
-            dire.meta_score * self.WEIGHTS["meta"]
+            dire_synergy * self.WEIGHTS["synergy"] +
+            dire_draft * self.WEIGHTS["draft"] +
+            dire_meta * self.WEIGHTS["meta"]
         )
         
-        counter_bonus = (features.counter_score - 50) * self.WEIGHTS["counter"]
+        counter_bonus = (counter_score - 50) * self.WEIGHTS["counter"]
         rad_score += counter_bonus
         dire_score -= counter_bonus
         
@@ -215,7 +325,6 @@ class MatchPredictor:
         rad_prob = (rad_score / total) * 100
         dire_prob = 100 - rad_prob
         
-        noise = random.uniform(-3, 3)
         rad_prob = max(5, min(95, rad_prob + noise))
         dire_prob = 100 - rad_prob
         
@@ -1,9 +1,9 @@
-from .hero import Hero, HeroCounters, HeroBuild, HeroStats
+from .hero import Hero, HeroCounters, HeroBuild, HeroDetails, HeroStats
 from .stats import HeroStats as APIHeroStats, MatchupStats, MetaReport
 from .prediction import MatchPrediction, TeamAnalysis, PredictionResult, DraftState
 
 __all__ = [
-    'Hero', 'HeroCounters', 'HeroBuild', 'HeroStats',
+    'Hero', 'HeroCounters', 'HeroBuild', 'HeroDetails', 'HeroStats',
     'APIHeroStats', 'MatchupStats', 'MetaReport',
     'MatchPrediction', 'TeamAnalysis', 'PredictionResult', 'DraftState'
 ]
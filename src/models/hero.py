@@ -1,47 +1,95 @@
+import sys
 from dataclasses import dataclass, field
-from typing import List, Optional
+from typing import Callable, FrozenSet, Optional, Tuple
 
 
-@dataclass
+# Модели героя неизменяемы: один экземпляр безопасно делить между
+# запросами, потоками и процессами; строки интернированы загрузчиком.
+
+
+def canonical_id(name: str) -> str:
+    """'Anti-Mage' -> 'anti_mage': канонический id героя, как ключи в heroes.json"""
+    return sys.intern(name.lower().strip().replace(" ", "_").replace("-", "_"))
+
+
+def _id_set(names: Tuple[str, ...]) -> FrozenSet[str]:
+    return frozenset(canonical_id(n) for n in names)
+
+
+@dataclass(frozen=True, slots=True)
 class HeroStats:
     win_rate: Optional[float] = None
     pick_rate: Optional[float] = None
     tier: Optional[str] = None
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class HeroBuild:
-    starting_items: List[str] = field(default_factory=list)
-    early_game: List[str] = field(default_factory=list)
-    mid_game: List[str] = field(default_factory=list)
-    late_game: List[str] = field(default_factory=list)
-    situational: List[str] = field(default_factory=list)
+    starting_items: Tuple[str, ...] = ()
+    early_game: Tuple[str, ...] = ()
+    mid_game: Tuple[str, ...] = ()
+    late_game: Tuple[str, ...] = ()
+    situational: Tuple[str, ...] = ()
+
 
+@dataclass(frozen=True, slots=True)
+class CounteredBy:
+    heroes: Tuple[str, ...] = ()
+    items: Tuple[str, ...] = ()
+    description: str = ""
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class HeroCounters:
-    strong_against: List[str] = field(default_factory=list)
-    weak_against: List[str] = field(default_factory=list)
-    counter_items: List[str] = field(default_factory=list)
-    core_items: List[str] = field(default_factory=list)
-    countered_by: dict = field(default_factory=dict)
+    strong_against: Tuple[str, ...] = ()
+    weak_against: Tuple[str, ...] = ()
+    counter_items: Tuple[str, ...] = ()
+    core_items: Tuple[str, ...] = ()
+    countered_by: CounteredBy = CounteredBy()
+    # канонические id героев: проверка матчапа — один поиск в множестве
+    strong_against_ids: FrozenSet[str] = field(init=False, repr=False, compare=False)
+    weak_against_ids: FrozenSet[str] = field(init=False, repr=False, compare=False)
+    countered_by_ids: FrozenSet[str] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "strong_against_ids", _id_set(self.strong_against))
+        object.__setattr__(self, "weak_against_ids", _id_set(self.weak_against))
+        object.__setattr__(self, "countered_by_ids", _id_set(self.countered_by.heroes))
+
+
+@dataclass(frozen=True, slots=True)
+class HeroDetails:
+    """Редко нужные данные героя: создаются только при первом обращении"""
+    description: str = ""
+    builds: Optional[HeroBuild] = None
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Hero:
     id: str
     name: str
     localized_name: Optional[str] = None
     primary_attr: str = "str"
     attack_type: str = "Melee"
-    roles: List[str] = field(default_factory=list)
-    description: str = ""
-    strengths: List[str] = field(default_factory=list)
-    weaknesses: List[str] = field(default_factory=list)
-    counters: HeroCounters = field(default_factory=HeroCounters)
-    builds: Optional[HeroBuild] = None
+    roles: Tuple[str, ...] = ()
+    strengths: Tuple[str, ...] = ()
+    weaknesses: Tuple[str, ...] = ()
+    counters: HeroCounters = HeroCounters()
     stats: Optional[HeroStats] = None
-    
+    load_details: Callable[[], HeroDetails] = field(default=HeroDetails, repr=False, compare=False)
+    name_lower: str = field(init=False, repr=False, compare=False)
+    roles_lower: Tuple[str, ...] = field(init=False, repr=False, compare=False)
+
     def __post_init__(self):
         if self.localized_name is None:
-            self.localized_name = self.name
+            object.__setattr__(self, "localized_name", self.name)
+        object.__setattr__(self, "name_lower", sys.intern(self.name.lower()))
+        object.__setattr__(self, "roles_lower", tuple(sys.intern(r.lower()) for r in self.roles))
+
+    @property
+    def description(self) -> str:
+        return self.load_details().description
+
+    @property
+    def builds(self) -> Optional[HeroBuild]:
+        return self.load_details().builds
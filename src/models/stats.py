@@ -17,6 +17,8 @@ class HeroStats:
     tier: str = "?"
     meta_score: float = 0.0
     last_updated: datetime = field(default_factory=datetime.now)
+    # "opendota" — живые данные, "static" — цифры из базы героев
+    source: str = "opendota"
     
     def get_tier_emoji(self) -> str:
         tiers = {"S": "🔴", "A": "🟠", "B": "🟡", "C": "🟢", "D": "⚪"}
@@ -74,3 +76,4 @@ class MetaReport:
     rising_heroes: List[HeroStats] = field(default_factory=list)
     falling_heroes: List[HeroStats] = field(default_factory=list)
     patch: Optional[str] = None
+    source: str = "opendota"
@@ -1,4 +1,8 @@
 from .hero_service import HeroService
 from .stats_service import StatsService
+from .prefetch import PrefetchScheduler
+from .prediction_store import PredictionStore
+from .pick_service import PickService
+from .whatif_service import WhatIfService
 
-__all__ = ['HeroService', 'StatsService']
+__all__ = ['HeroService', 'StatsService', 'PrefetchScheduler', 'PredictionStore', 'PickService', 'WhatIfService']
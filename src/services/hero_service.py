@@ -1,29 +1,33 @@
-from typing import List, Optional, Tuple
-from src.models.hero import Hero
-from src.data.heroes_db import HEROES_DATABASE, HEROES_BY_NAME
+from typing import Iterable, List, Optional, Tuple
+from src.models.hero import Hero, canonical_id
+from src.data.heroes_db import HeroDatabase, get_hero_db
+from src.data.hero_roster import RosterHero, get_hero_roster
 
 
 class HeroService:
     @staticmethod
-    def find_hero(query: str) -> Optional[Hero]:
+    def find_hero(query: str, db: Optional[HeroDatabase] = None) -> Optional[Hero]:
         query = query.lower().strip().replace(" ", "_").replace("-", "_")
-        return HEROES_BY_NAME.get(query)
+        return (db or get_hero_db()).by_name.get(query)
     
     @staticmethod
-    def search_heroes(query: str, limit: int = 5) -> List[Hero]:
+    def canonical_id(query: str) -> str:
+        """id героя из базы, для неизвестных — нормализованное имя"""
+        hero = HeroService.find_hero(query)
+        return hero.id if hero else canonical_id(query)
+    
+    @staticmethod
+    def resolve_hero(query: str) -> Optional[RosterHero]:
+        """Любой герой из ростера OpenDota, даже если его нет в базе героев"""
+        return get_hero_roster().find(query)
+    
+    @staticmethod
+    def search_heroes(query: str, limit: int = 5, db: Optional[HeroDatabase] = None) -> List[Hero]:
         query = query.lower()
         matches = []
         
-        for hero in HEROES_DATABASE.values():
-            search_terms = [
-                hero.id,
-                hero.name.lower(),
-                hero.localized_name.lower() if hero.localized_name else "",
-                hero.name.lower().replace(" ", ""),
-                hero.name.lower().replace("-", ""),
-            ]
-            
-            if any(query in term for term in search_terms if term):
+        for hero, search_terms in (db or get_hero_db()).search_terms:
+            if any(query in term for term in search_terms):
                 matches.append(hero)
                 
             if len(matches) >= limit:
@@ -31,9 +35,31 @@ class HeroService:
                 
         return matches
     
+    @staticmethod
+    def resolve_team(names: Iterable[str], db: Optional[HeroDatabase] = None) -> Tuple[List[int], List[str]]:
+        """Имена героев -> номера в db.index (точное имя или первое совпадение по подстроке).
+
+        Вторым значением возвращаются имена, которые не удалось распознать.
+        """
+        db = db or get_hero_db()
+        team = []
+        unknown = []
+        
+        for name in names:
+            hero = HeroService.find_hero(name, db)
+            if not hero:
+                matches = HeroService.search_heroes(name, limit=1, db=db)
+                hero = matches[0] if matches else None
+            if hero:
+                team.append(db.index.of(hero))
+            else:
+                unknown.append(name)
+                
+        return team, unknown
+    
     @staticmethod
     def get_all_heroes() -> List[Hero]:
-        return list(HEROES_DATABASE.values())
+        return list(get_hero_db().heroes.values())
     
     @staticmethod
     def format_hero_info(hero: Hero) -> str:
@@ -67,16 +93,16 @@ class HeroService:
         lines = [
             f"🛡️ *Контрпики на {hero.name}:*",
             "",
-            f"💡 *{hero.counters.countered_by.get('description', '')}*",
+            f"💡 *{hero.counters.countered_by.description}*",
             "",
             "⚔️ *Герои-контрпики:*"
         ]
         
-        for i, counter in enumerate(hero.counters.countered_by.get('heroes', []), 1):
+        for i, counter in enumerate(hero.counters.countered_by.heroes, 1):
             lines.append(f"{i}. {counter}")
             
         lines.extend(["", "🎒 *Контр-предметы:*"])
-        for item in hero.counters.countered_by.get('items', []):
+        for item in hero.counters.countered_by.items:
             lines.append(f"  • {item}")
             
         return "\n".join(lines)
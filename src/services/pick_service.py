@@ -0,0 +1,101 @@
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+
+from src.data.heroes_db import HeroDatabase, get_hero_db
+from src.ml.incremental import RADIANT, DraftScore, IncrementalScorer
+from src.ml.predictor import MatchPredictor
+from src.models.hero import Hero
+
+
+@dataclass
+class PickSuggestion:
+    hero: Hero
+    index: int
+    win_probability: float
+    win_delta: float
+    # на сколько очков (0-100) пик меняет каждую оценку союзной команды
+    synergy: float
+    draft: float
+    meta: float
+    counter: float
+
+
+class PickService:
+    @staticmethod
+    def rank_picks(
+        allies: Sequence[int],
+        enemies: Sequence[int],
+        side: str = RADIANT,
+        predictor: Optional[MatchPredictor] = None,
+        db: Optional[HeroDatabase] = None
+    ) -> List[PickSuggestion]:
+        """Все свободные герои как следующий пик союзников, от лучшего к худшему.
+
+        Драфт собирается в IncrementalScorer один раз; каждый кандидат
+        добавляется и убирается за O(размер команды), так что суммы по
+        союзникам и врагам не пересчитываются. Числа те же, что у predict.
+        """
+        db = db or get_hero_db()
+        radiant, dire = (allies, enemies) if side == RADIANT else (enemies, allies)
+        scorer = IncrementalScorer(radiant, dire, predictor, db)
+        base = scorer.score()
+        base_win = PickService._win_probability(base, side)
+        taken = set(allies) | set(enemies)
+        ally = 0 if side == RADIANT else 1
+        # counter — оценка матчапов Света, для Тьмы знак обратный
+        counter_sign = 1 if side == RADIANT else -1
+
+        picks = []
+        for hero in range(len(db.index)):
+            if hero in taken:
+                continue
+            scorer.add(side, hero)
+            score = scorer.score()
+            scorer.remove(side, hero)
+
+            win = PickService._win_probability(score, side)
+            picks.append(PickSuggestion(
+                hero=db.index.heroes[hero],
+                index=hero,
+                win_probability=win,
+                win_delta=win - base_win,
+                synergy=score.synergy[ally] - base.synergy[ally],
+                draft=score.draft[ally] - base.draft[ally],
+                meta=score.meta[ally] - base.meta[ally],
+                counter=(score.counter - base.counter) * counter_sign
+            ))
+
+        picks.sort(key=lambda pick: pick.win_probability, reverse=True)
+        return picks
+
+    @staticmethod
+    def suggest_picks(
+        allies: Sequence[int],
+        enemies: Sequence[int],
+        limit: int = 5,
+        side: str = RADIANT,
+        predictor: Optional[MatchPredictor] = None,
+        db: Optional[HeroDatabase] = None
+    ) -> List[PickSuggestion]:
+        return PickService.rank_picks(allies, enemies, side, predictor, db)[:limit]
+
+    @staticmethod
+    def _win_probability(score: DraftScore, side: str) -> float:
+        return score.win_probability_radiant if side == RADIANT else score.win_probability_dire
+
+    @staticmethod
+    def format_suggestions(picks: List[PickSuggestion]) -> str:
+        labels = (("synergy", "синергия"), ("draft", "драфт"), ("meta", "мета"), ("counter", "матчапы"))
+        lines = []
+
+        for place, pick in enumerate(picks, 1):
+            lines.append(f"{place}. *{pick.hero.name}* — {pick.win_probability:.1f}% ({pick.win_delta:+.1f})")
+            parts = [
+                f"{label} {getattr(pick, field):+.0f}"
+                for field, label in labels
+                if abs(getattr(pick, field)) >= 0.5
+            ]
+            if parts:
+                lines.append("   " + " · ".join(parts))
+
+        return "\n".join(lines)
@@ -0,0 +1,53 @@
+import base64
+import hashlib
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence, Tuple
+
+from src.models.prediction import MatchPrediction
+from src.utils.cache import BoundedCache
+
+
+@dataclass
+class StoredPrediction:
+    prediction: MatchPrediction
+    # канонические id героев в порядке ввода: по ним кнопка «Обновить» пересчитывает драфт
+    radiant: Tuple[str, ...]
+    dire: Tuple[str, ...]
+
+
+class PredictionStore:
+    """Готовые предсказания за коротким токеном для callback_data.
+
+    В кнопку кладётся только токен (8 символов) вместо имён героев:
+    callback_data ограничена 64 байтами, а «Детали», «Назад» и «Обновить»
+    берут предсказание отсюда, без повторного расчёта. Токен — хэш драфта,
+    поэтому один и тот же драфт получает один и тот же токен.
+    """
+
+    TOKEN_BYTES = 6
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 86400):
+        self._cache = BoundedCache(max_entries=max_entries, ttl=ttl)
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    @classmethod
+    def make_token(cls, radiant: Sequence[str], dire: Sequence[str]) -> str:
+        digest = hashlib.blake2b(
+            ("|".join(radiant) + ":" + "|".join(dire)).encode(),
+            digest_size=cls.TOKEN_BYTES
+        ).digest()
+        return base64.urlsafe_b64encode(digest).decode()
+
+    def put(self, prediction: MatchPrediction, radiant: Sequence[str], dire: Sequence[str]) -> str:
+        radiant, dire = tuple(radiant), tuple(dire)
+        token = self.make_token(radiant, dire)
+        self._cache.set(token, StoredPrediction(prediction, radiant, dire))
+        return token
+
+    def get(self, token: str) -> Optional[StoredPrediction]:
+        return self._cache.get(token)
+
+    def get_stats(self) -> Dict[str, int]:
+        return self._cache.get_stats()
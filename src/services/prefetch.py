@@ -0,0 +1,85 @@
+import asyncio
+import logging
+from typing import Optional
+
+from src.data.matchup_matrix import get_matchup_matrix
+from src.services.stats_service import StatsService
+
+logger = logging.getLogger(__name__)
+
+
+class PrefetchScheduler:
+    """Фоновое обновление кэша OpenDota раз в UPDATE_INTERVAL.
+
+    За один цикл обновляет heroStats и матчапы top_n самых запрашиваемых героев,
+    равномерно распределяя запросы по интервалу, чтобы не создавать всплесков.
+    Если в лимитере осталось меньше quota_reserve запросов, цикл пропускает
+    обновления и оставляет квоту пользовательским командам.
+    Раз в сутки цикл также пересобирает полную матрицу матчапов,
+    а при выходе нового патча — ростер героев.
+    """
+
+    def __init__(
+        self,
+        stats_service: StatsService,
+        interval: float = 3600,
+        top_n: int = 10,
+        quota_reserve: int = 10
+    ):
+        self.stats_service = stats_service
+        self.interval = interval
+        self.top_n = top_n
+        self.quota_reserve = quota_reserve
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._task is None and self.interval > 0:
+            self._task = asyncio.create_task(self._run())
+            logger.info(f"Prefetch scheduler started (interval {self.interval}s, top {self.top_n})")
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            try:
+                await self.run_cycle()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Prefetch cycle failed: {e}")
+                await asyncio.sleep(self.interval)
+
+    def _has_quota(self) -> bool:
+        return self.stats_service.api.rate_limiter.remaining > self.quota_reserve
+
+    async def run_cycle(self):
+        api = self.stats_service.api
+        hero_ids = self.stats_service.get_popular_hero_ids(self.top_n)
+
+        # heroStats + матчапы популярных героев, шаг между запросами — равная доля интервала
+        step = self.interval / (len(hero_ids) + 1)
+
+        if self._has_quota():
+            await self.stats_service.refresh_roster()
+            await api.get_hero_stats(force=True)
+        else:
+            logger.warning("Prefetch: skipping heroStats, API quota is low")
+        await self.stats_service.ensure_matchup_matrix()
+        await asyncio.sleep(step)
+
+        for hero_id in hero_ids:
+            if self._has_quota():
+                matchups = await api.get_hero_matchups(hero_id, force=True)
+                matrix = get_matchup_matrix()
+                if matchups is not None and matrix is not None:
+                    matrix.set_row(hero_id, matchups)
+            else:
+                logger.warning(f"Prefetch: skipping matchups for hero {hero_id}, API quota is low")
+            await asyncio.sleep(step)
@@ -1,61 +1,126 @@
+import asyncio
 import logging
+from collections import Counter
+from pathlib import Path
 from typing import Optional, List, Dict
 from datetime import datetime, timedelta
 
 from src.api.opendota import OpenDotaAPI
+from src.data.hero_roster import HeroRoster, get_hero_roster, refresh_hero_roster, set_hero_roster
+from src.data.heroes_db import get_hero_db
+from src.data.matchup_matrix import MatchupMatrix, get_matchup_matrix, set_matchup_matrix
 from src.models.stats import HeroStats, MetaReport, MatchupStats
+from src.services.hero_service import HeroService
+from src.utils.cache import BoundedCache, sweep_periodically
 
 logger = logging.getLogger(__name__)
 
 
 class StatsService:
-    def __init__(self, cache_ttl: int = 3600):
-        self.api = OpenDotaAPI(cache_ttl=cache_ttl)
-        self._hero_stats_cache: Dict[str, HeroStats] = {}
+    """Один экземпляр на процесс: живёт вместе с Application и делит кэши между хендлерами"""
+    
+    MATRIX_MAX_AGE = 24 * 60 * 60
+    
+    def __init__(
+        self,
+        cache_ttl: int = 3600,
+        api: Optional[OpenDotaAPI] = None,
+        matrix_path: Optional[Path] = None,
+        roster_path: Optional[Path] = None
+    ):
+        self.api = api or OpenDotaAPI(cache_ttl=cache_ttl)
+        self.matrix_path = matrix_path
+        self.roster_path = roster_path
+        self._hero_stats_cache = BoundedCache(
+            max_entries=256,
+            max_bytes=1024 * 1024,
+            ttl=self.api.cache_ttl,
+            max_stale=self.api.max_staleness
+        )
         self._meta_cache: Optional[MetaReport] = None
         self._cache_time: Optional[datetime] = None
+        self._sweep_task: Optional[asyncio.Task] = None
+        self._hero_requests: Counter = Counter()
+        
+    async def start(self):
+        await self.api.start()
+        if self.matrix_path and get_matchup_matrix() is None:
+            matrix = await asyncio.to_thread(MatchupMatrix.load, self.matrix_path)
+            if matrix:
+                set_matchup_matrix(matrix)
+                logger.info(f"Matchup matrix loaded: {len(matrix.hero_ids)} heroes")
+        if self.roster_path:
+            roster = await asyncio.to_thread(HeroRoster.load, self.roster_path)
+            if roster:
+                set_hero_roster(roster)
+                logger.info(f"Hero roster loaded: {len(roster)} heroes, patch {roster.patch}")
+        if self._sweep_task is None:
+            self._sweep_task = asyncio.create_task(
+                sweep_periodically([self._hero_stats_cache], self.api.cache_sweep_interval)
+            )
+        
+    async def close(self):
+        if self._sweep_task:
+            self._sweep_task.cancel()
+            self._sweep_task = None
+        await self.api.close()
         
     async def __aenter__(self):
-        await self.api.__aenter__()
+        await self.start()
         return self
         
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        await self.api.__aexit__(exc_type, exc_val, exc_tb)
+        await self.close()
         
-    def _is_cache_valid(self) -> bool:
+    def _is_within_staleness(self) -> bool:
         if not self._cache_time:
             return False
-        return datetime.now() - self._cache_time < timedelta(seconds=self.api.cache_ttl)
+        max_age = self.api.cache_ttl + self.api.max_staleness
+        return datetime.now() - self._cache_time < timedelta(seconds=max_age)
         
     async def get_hero_stats(self, hero_name: str, force_update: bool = False) -> Optional[HeroStats]:
-        if not force_update and hero_name in self._hero_stats_cache and self._is_cache_valid():
-            return self._hero_stats_cache[hero_name]
+        if not force_update:
+            cached = self._hero_stats_cache.get(hero_name)
+            if cached is not None:
+                return cached
             
         hero_id = self._get_hero_id(hero_name)
         if not hero_id:
             return None
+        self._hero_requests[hero_id] += 1
             
-        stats = await self.api.get_hero_stats_detailed(hero_id)
+        stats = await self.api.get_hero_stats_detailed(hero_id, force=force_update)
         if stats:
-            self._hero_stats_cache[hero_name] = stats
+            self._hero_stats_cache.set(hero_name, stats)
+            return stats
             
-        return stats
+        # OpenDota недоступен — последнее известное значение лучше ошибки,
+        # а встроенные цифры лучше, чем ничего
+        entry = self._hero_stats_cache.get_entry(hero_name)
+        if entry:
+            return entry.value
+        return self._static_hero_stats(hero_name)
         
     async def get_meta_report(self, force_update: bool = False) -> Optional[MetaReport]:
-        if not force_update and self._meta_cache and self._is_cache_valid():
-            return self._meta_cache
-            
-        report = await self.api.get_meta_report()
+        # heroStats в API-клиенте работает в режиме stale-while-revalidate,
+        # поэтому ответ не ждёт OpenDota, если в кэше есть хоть что-то
+        report = await self.api.get_meta_report(force=force_update)
         if report:
             self._meta_cache = report
             self._cache_time = datetime.now()
+            return report
+            
+        if self._meta_cache and self._is_within_staleness():
+            logger.warning("Serving last known meta report, OpenDota unavailable")
+            return self._meta_cache
             
-        return report
+        return self._static_meta_report()
         
     async def get_counters_stats(self, hero_name: str) -> List[Dict]:
         hero_id = self._get_hero_id(hero_name)
         if not hero_id:
             return []
+        self._hero_requests[hero_id] += 1
             
         matchups = await self.api.get_best_counters(hero_id)
         
@@ -72,40 +137,66 @@ class StatsService:
                 
         return results
         
+    async def refresh_roster(self) -> HeroRoster:
+        return await refresh_hero_roster(self.api, self.roster_path)
+        
+    def get_popular_hero_ids(self, limit: int = 10) -> List[int]:
+        """Самые запрашиваемые герои — кандидаты на фоновое обновление"""
+        return [hero_id for hero_id, _ in self._hero_requests.most_common(limit)]
+        
+    async def ensure_matchup_matrix(self, concurrency: int = 4) -> Optional[MatchupMatrix]:
+        """Пересобирает матрицу матчапов, если её нет или она старше MATRIX_MAX_AGE"""
+        matrix = get_matchup_matrix()
+        if matrix is not None and matrix.age < self.MATRIX_MAX_AGE:
+            return matrix
+            
+        stats = await self.api.get_hero_stats()
+        if not stats:
+            return matrix
+            
+        hero_ids = sorted(h["id"] for h in stats if h.get("id"))
+        matrix = await MatchupMatrix.build(self.api, hero_ids, concurrency=concurrency)
+        if not matrix.hero_ids:
+            return get_matchup_matrix()
+            
+        set_matchup_matrix(matrix)
+        if self.matrix_path:
+            await asyncio.to_thread(matrix.save, self.matrix_path)
+        return matrix
+        
+    def _static_hero_stats(self, hero_name: str) -> Optional[HeroStats]:
+        hero = HeroService.find_hero(hero_name)
+        if not hero or not hero.stats:
+            return None
+        return self._to_hero_stats(hero)
+        
+    def _static_meta_report(self) -> Optional[MetaReport]:
+        heroes = [self._to_hero_stats(h) for h in get_hero_db().heroes.values() if h.stats]
+        if not heroes:
+            return None
+        logger.warning("Serving static meta report from the hero database, OpenDota unavailable")
+        return MetaReport(
+            timestamp=datetime.now(),
+            top_picks=sorted(heroes, key=lambda x: x.pick_rate, reverse=True)[:10],
+            top_wins=sorted(heroes, key=lambda x: x.win_rate, reverse=True)[:10],
+            source="static"
+        )
+        
+    def _to_hero_stats(self, hero) -> HeroStats:
+        return HeroStats(
+            hero_id=self._get_hero_id(hero.name) or 0,
+            hero_name=hero.name,
+            win_rate=hero.stats.win_rate or 0.0,
+            pick_rate=hero.stats.pick_rate or 0.0,
+            tier=hero.stats.tier or "?",
+            source="static"
+        )
+        
     def _get_hero_id(self, hero_name: str) -> Optional[int]:
-        hero_key = hero_name.lower().replace(" ", "_").replace("-", "_")
-        
-        hero_id_map = {
-            "kez": 145,
-            "muerta": 138,
-            "void_spirit": 126,
-            "ember_spirit": 106,
-            "slardar": 28,
-            "tidehunter": 29,
-            "shadow_shaman": 27,
-            "lich": 31,
-            "lion": 26,
-            "phantom_lancer": 12,
-            "anti_mage": 1,
-        }
-        
-        return hero_id_map.get(hero_key)
+        return get_hero_roster().id_for(hero_name)
         
     def _get_hero_name_by_id(self, hero_id: int) -> Optional[str]:
-        reverse_map = {
-            145: "Kez",
-            138: "Muerta",
-            126: "Void Spirit",
-            106: "Ember Spirit",
-            28: "Slardar",
-            29: "Tidehunter",
-            27: "Shadow Shaman",
-            31: "Lich",
-            26: "Lion",
-            12: "Phantom Lancer",
-            1: "Anti-Mage",
-        }
-        return reverse_map.get(hero_id)
+        return get_hero_roster().name_for(hero_id)
         
     def format_stats_message(self, stats: HeroStats) -> str:
         lines = [
@@ -113,9 +204,18 @@ class StatsService:
             "",
             f"{stats.get_tier_emoji()} *Тир:* {stats.tier}",
             f"📈 *Винрейт:* {stats.format_win_rate(stats.win_rate)}",
-            f"🎯 *Пикрейт:* {stats.pick_rate} игр",
         ]
         
+        if stats.source == "static":
+            lines.extend([
+                f"🎯 *Пикрейт:* {stats.pick_rate}%",
+                "",
+                "_OpenDota недоступен, показаны данные из встроенной базы_"
+            ])
+            return "\n".join(lines)
+            
+        lines.append(f"🎯 *Пикрейт:* {stats.pick_rate} игр")
+        
         if stats.ban_rate:
             lines.append(f"🚫 *Банрейт:* {stats.ban_rate} игр")
             
@@ -137,9 +237,14 @@ class StatsService:
         return "\n".join(lines)
         
     def format_meta_message(self, report: MetaReport) -> str:
+        if report.source == "static":
+            updated = "_OpenDota недоступен, показаны данные из встроенной базы_"
+        else:
+            updated = f"_Обновлено: {report.timestamp.strftime('%d.%m %H:%M')}_"
+            
         lines = [
             "🌍 *Текущая мета*",
-            f"_Обновлено: {report.timestamp.strftime('%d.%m %H:%M')}_",
+            updated,
             "",
             "🔥 *Топ по винрейту:*"
         ]
@@ -149,7 +254,8 @@ class StatsService:
             
         lines.extend(["", "📈 *Самые популярные:*"])
         for i, hero in enumerate(report.top_picks[:5], 1):
-            lines.append(f"{i}. {hero.hero_name} ({hero.pick_rate} пиков)")
+            picks = f"{hero.pick_rate}%" if report.source == "static" else f"{hero.pick_rate} пиков"
+            lines.append(f"{i}. {hero.hero_name} ({picks})")
             
         if report.rising_heroes:
             lines.extend(["", "⬆️ *Растут винрейтом:*"])
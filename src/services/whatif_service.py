@@ -0,0 +1,121 @@
+from dataclasses import dataclass
+from typing import List, Optional
+
+from src.data.heroes_db import HeroDatabase, get_hero_db
+from src.ml.incremental import DIRE, RADIANT, DraftScore, IncrementalScorer
+from src.services.hero_service import HeroService
+
+SIDE_NAMES = {RADIANT: "Свет", DIRE: "Тьма"}
+
+SWAP = "swap"
+REMOVE = "remove"
+ADD = "add"
+
+
+@dataclass
+class DraftChange:
+    action: str
+    side: str
+    # номера героев в db.index; new — только у замены
+    hero: int
+    new: Optional[int] = None
+
+
+class WhatIfService:
+    @staticmethod
+    def split_changes(text: str) -> List[str]:
+        """`void > lion -kez +shaman` -> ['void>lion', '-kez', '+shaman']"""
+        return text.replace(" > ", ">").split()
+
+    @staticmethod
+    def apply_change(
+        scorer: IncrementalScorer,
+        change: str,
+        db: Optional[HeroDatabase] = None
+    ) -> Optional[DraftChange]:
+        """Применяет одно изменение к драфту; None — если не вышло, драфт тогда не тронут.
+
+        `старый>новый` — замена на месте старого, `-герой` — убрать,
+        `+герой` — добавить в команду, где героев меньше (Свету при равенстве).
+        """
+        db = db or get_hero_db()
+        names = change.lstrip("+-").split(">")
+        heroes, unknown = HeroService.resolve_team(names, db)
+        if unknown or len(heroes) != len(names) or len(heroes) > 2:
+            return None
+
+        try:
+            if len(heroes) == 2:
+                old, new = heroes
+                side = scorer.side_of(old)
+                if side is None or change[0] in "+-":
+                    return None
+                scorer.swap(side, old, new)
+                return DraftChange(SWAP, side, old, new)
+
+            hero = heroes[0]
+            if change.startswith("-"):
+                side = scorer.side_of(hero)
+                if side is None:
+                    return None
+                scorer.remove(side, hero)
+                return DraftChange(REMOVE, side, hero)
+
+            if change.startswith("+"):
+                radiant, dire = scorer.heroes(RADIANT), scorer.heroes(DIRE)
+                side = DIRE if len(dire) < len(radiant) else RADIANT
+                scorer.add(side, hero)
+                return DraftChange(ADD, side, hero)
+        except ValueError:
+            return None
+
+        return None
+
+    @staticmethod
+    def describe_change(change: DraftChange, db: HeroDatabase) -> str:
+        heroes = db.index.heroes
+        side = SIDE_NAMES[change.side]
+        if change.action == SWAP:
+            return f"🔁 {heroes[change.hero].name} → {heroes[change.new].name} ({side})"
+        if change.action == REMOVE:
+            return f"➖ {heroes[change.hero].name} ({side})"
+        return f"➕ {heroes[change.hero].name} ({side})"
+
+    @staticmethod
+    def format_whatif(
+        scorer: IncrementalScorer,
+        changes: List[str],
+        before: DraftScore,
+        after: DraftScore,
+        db: HeroDatabase
+    ) -> str:
+        def delta(old: float, new: float, digits: int = 0, unit: str = "") -> str:
+            return f"{old:.{digits}f}{unit} → {new:.{digits}f}{unit} ({new - old:+.{digits}f})"
+
+        lines = ["🧪 *ЧТО ЕСЛИ*", ""]
+        lines.extend(changes)
+        lines.extend([
+            "",
+            f"🟢 *Свет:* {', '.join(db.index.names(scorer.heroes(RADIANT)))}",
+            f"🔴 *Тьма:* {', '.join(db.index.names(scorer.heroes(DIRE)))}",
+            "",
+            f"🏆 *Победа Света:* {delta(before.win_probability_radiant, after.win_probability_radiant, 1, '%')}",
+            ""
+        ])
+
+        components = (
+            ("Синергия Света", before.synergy[0], after.synergy[0]),
+            ("Синергия Тьмы", before.synergy[1], after.synergy[1]),
+            ("Драфт Света", before.draft[0], after.draft[0]),
+            ("Драфт Тьмы", before.draft[1], after.draft[1]),
+            ("Мета Света", before.meta[0], after.meta[0]),
+            ("Мета Тьмы", before.meta[1], after.meta[1]),
+            ("Матчапы Света", before.counter, after.counter),
+        )
+        changed = [(name, old, new) for name, old, new in components if abs(new - old) >= 0.5]
+        for name, old, new in changed:
+            lines.append(f"{name}: {delta(old, new)}")
+        if not changed:
+            lines.append("_Оценки составов не изменились_")
+
+        return "\n".join(lines)
@@ -0,0 +1,3 @@
+from .cache import BoundedCache, CacheEntry, estimate_size, sweep_periodically
+
+__all__ = ['BoundedCache', 'CacheEntry', 'estimate_size', 'sweep_periodically']
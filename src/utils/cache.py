@@ -0,0 +1,206 @@
+import asyncio
+import sys
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+def estimate_size(obj: Any) -> int:
+    """Приблизительный размер объекта в байтах (рекурсивно по JSON-подобным структурам)"""
+    seen = set()
+    stack = [obj]
+    total = 0
+
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        total += sys.getsizeof(item)
+
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+        else:
+            if hasattr(item, "__dict__"):
+                stack.append(vars(item))
+            # dataclass(slots=True) и прочие объекты без __dict__ — поля из __slots__
+            stack.extend(_slot_values(item))
+
+    return total
+
+
+def _slot_values(obj: Any) -> Iterable[Any]:
+    for cls in type(obj).__mro__:
+        slots = cls.__dict__.get("__slots__", ())
+        if isinstance(slots, str):
+            slots = (slots,)
+        for name in slots:
+            if name in ("__dict__", "__weakref__"):
+                continue
+            value = getattr(obj, name, _MISSING)
+            if value is not _MISSING:
+                yield value
+
+
+@dataclass
+class CacheEntry:
+    value: Any
+    stored_at: float
+    expires_at: float
+    stale_until: float
+    size: int
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.stored_at
+
+    @property
+    def fresh(self) -> bool:
+        return time.time() < self.expires_at
+
+
+class BoundedCache:
+    """LRU-кэш с TTL, лимитом записей и приблизительным бюджетом памяти.
+
+    После истечения TTL запись ещё max_stale секунд доступна через get_entry()
+    (stale-while-revalidate), затем удаляется при чтении или периодическим sweep().
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl: float = 3600,
+        max_stale: float = 0
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self.current_bytes = 0
+        self._data: "OrderedDict[Any, CacheEntry]" = OrderedDict()
+        self.stats: Dict[str, int] = {
+            "hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "expirations": 0,
+            "stale_hits": 0,
+        }
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Any) -> bool:
+        entry = self._data.get(key)
+        return entry is not None and entry.fresh
+
+    def _lookup(self, key: Any) -> Optional[CacheEntry]:
+        entry = self._data.get(key)
+        if entry is not None and entry.stale_until <= time.time():
+            self._remove(key)
+            self.stats["expirations"] += 1
+            return None
+        return entry
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        entry = self._lookup(key)
+        if entry is None or not entry.fresh:
+            self.stats["misses"] += 1
+            return default
+
+        self._data.move_to_end(key)
+        self.stats["hits"] += 1
+        return entry.value
+
+    def get_entry(self, key: Any) -> Optional[CacheEntry]:
+        """Запись вместе с метаданными, в том числе просроченная, но ещё в окне max_stale"""
+        entry = self._lookup(key)
+        if entry is not None:
+            self._data.move_to_end(key)
+            if not entry.fresh:
+                self.stats["stale_hits"] += 1
+        return entry
+
+    def set(
+        self,
+        key: Any,
+        value: Any,
+        ttl: Optional[float] = None,
+        size: Optional[int] = None,
+        stored_at: Optional[float] = None
+    ):
+        if key in self._data:
+            self._remove(key)
+
+        stored_at = stored_at or time.time()
+        expires_at = stored_at + (self.ttl if ttl is None else ttl)
+        entry = CacheEntry(
+            value=value,
+            stored_at=stored_at,
+            expires_at=expires_at,
+            stale_until=expires_at + self.max_stale,
+            size=estimate_size(value) if size is None else size
+        )
+
+        if entry.size > self.max_bytes:
+            logger.warning(f"Cache entry {key!r} ({entry.size} B) exceeds the cache budget, not stored")
+            return
+
+        self._data[key] = entry
+        self.current_bytes += entry.size
+        self._evict()
+
+    def pop(self, key: Any, default: Any = None) -> Any:
+        if key not in self._data:
+            return default
+        return self._remove(key).value
+
+    def clear(self):
+        self._data.clear()
+        self.current_bytes = 0
+
+    def sweep(self) -> int:
+        """Удаляет записи, вышедшие за окно устаревания, возвращает их количество"""
+        now = time.time()
+        expired = [key for key, entry in self._data.items() if entry.stale_until <= now]
+        for key in expired:
+            self._remove(key)
+        self.stats["expirations"] += len(expired)
+        return len(expired)
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            **self.stats,
+            "entries": len(self._data),
+            "bytes": self.current_bytes,
+        }
+
+    def _remove(self, key: Any) -> CacheEntry:
+        entry = self._data.pop(key)
+        self.current_bytes -= entry.size
+        return entry
+
+    def _evict(self):
+        while self._data and (len(self._data) > self.max_entries or self.current_bytes > self.max_bytes):
+            key = next(iter(self._data))
+            self._remove(key)
+            self.stats["evictions"] += 1
+
+
+async def sweep_periodically(caches: Iterable[BoundedCache], interval: float):
+    """Фоновая задача: раз в interval секунд чистит просроченные записи"""
+    caches = list(caches)
+    while True:
+        await asyncio.sleep(interval)
+        removed = sum(cache.sweep() for cache in caches)
+        if removed:
+            logger.debug(f"Cache sweep removed {removed} expired entries")
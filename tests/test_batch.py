@@ -0,0 +1,116 @@
+import asyncio
+import random
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.data.hero_roster import get_hero_roster
+from src.data.heroes_db import HeroDatabase
+from src.data.matchup_matrix import MatchupMatrix, get_matchup_matrix, set_matchup_matrix
+from src.ml.predictor import MatchPredictor
+
+HEROES_FILE = Path(__file__).resolve().parent.parent / "src" / "data" / "heroes_extended.json"
+
+
+@pytest.fixture(scope="module")
+def db():
+    return HeroDatabase.load(HEROES_FILE)
+
+
+def random_matrix(seed: int) -> MatchupMatrix:
+    """Матрица матчапов на половину ростера: у остальных героев — граф контрпиков"""
+    rng = random.Random(seed)
+    ids = get_hero_roster().ids()
+    matrix = MatchupMatrix(max(ids) + 1)
+    for hero_id in ids[::2]:
+        matrix.set_row(hero_id, [
+            {"hero_id": vs, "wins": rng.randint(0, 60), "games_played": rng.choice((0, 10, 60))}
+            for vs in ids if vs != hero_id
+        ])
+    return matrix
+
+
+@pytest.fixture(params=["graph", "matrix"])
+def matchups(request):
+    previous = get_matchup_matrix()
+    set_matchup_matrix(random_matrix(7) if request.param == "matrix" else None)
+    yield request.param
+    set_matchup_matrix(previous)
+
+
+def make_drafts(db: HeroDatabase, count: int, seed: int):
+    """Случайные драфты разных размеров: в одном пакете короткие строки добиваются паддингом"""
+    rng = random.Random(seed)
+    heroes = range(len(db.index))
+    drafts = []
+    for _ in range(count):
+        picked = rng.sample(heroes, 10)
+        drafts.append((picked[:rng.randint(1, 5)], picked[5:5 + rng.randint(1, 5)]))
+    # полный драфт и 1 на 1 в том же пакете
+    drafts += [(list(range(5)), list(range(5, 10))), ([10], [11])]
+    return drafts
+
+
+async def predict_all(predictor: MatchPredictor, db: HeroDatabase, drafts):
+    return [await predictor.predict(radiant, dire, db) for radiant, dire in drafts]
+
+
+@pytest.mark.parametrize("noise", [0.0, 3.0])
+def test_batch_matches_predict(db, matchups, noise):
+    drafts = make_drafts(db, 300, seed=int(noise) + (matchups == "matrix"))
+    predictor = MatchPredictor(noise=noise)
+
+    expected = asyncio.run(predict_all(predictor, db, drafts))
+    batch = predictor.predict_batch(drafts, db)
+
+    assert len(batch) == len(drafts)
+    columns = {
+        "win_probability_radiant": [p.win_probability_radiant for p in expected],
+        "win_probability_dire": [p.win_probability_dire for p in expected],
+        "synergy": [(p.radiant.synergy_score, p.dire.synergy_score) for p in expected],
+        "draft": [(p.radiant.draft_score, p.dire.draft_score) for p in expected],
+        "meta": [(p.radiant.meta_score, p.dire.meta_score) for p in expected],
+    }
+    for name, want in columns.items():
+        np.testing.assert_allclose(getattr(batch, name), np.array(want), rtol=0, atol=1e-9, err_msg=name)
+
+
+def test_batch_row_does_not_depend_on_neighbours(db, matchups):
+    """Строка пакета считается так же, как тот же драфт в пакете из одной строки"""
+    drafts = make_drafts(db, 50, seed=3)
+    predictor = MatchPredictor()
+    batch = predictor.predict_batch(drafts, db)
+
+    for row, draft in enumerate(drafts):
+        single = predictor.predict_batch([draft], db)
+        assert single.win_probability_radiant[0] == pytest.approx(batch.win_probability_radiant[row], abs=1e-9)
+
+
+def test_batch_follows_row_refresh(db):
+    """PrefetchScheduler обновляет строки общей матрицы на месте — пакет должен это увидеть"""
+    previous = get_matchup_matrix()
+    matrix = random_matrix(11)
+    set_matchup_matrix(matrix)
+    try:
+        drafts = make_drafts(db, 100, seed=5)
+        predictor = MatchPredictor()
+        before = predictor.predict_batch(drafts, db)
+
+        rng = random.Random(12)
+        ids = get_hero_roster().ids()
+        for hero_id in ids[::2]:
+            matrix.set_row(hero_id, [
+                {"hero_id": vs, "wins": rng.randint(0, 60), "games_played": 60}
+                for vs in ids if vs != hero_id
+            ])
+
+        expected = asyncio.run(predict_all(predictor, db, drafts))
+        after = predictor.predict_batch(drafts, db)
+    finally:
+        set_matchup_matrix(previous)
+
+    want = np.array([p.win_probability_radiant for p in expected])
+    assert not np.allclose(before.win_probability_radiant, want)
+    np.testing.assert_allclose(after.win_probability_radiant, want, rtol=0, atol=1e-9)
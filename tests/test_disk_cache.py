@@ -0,0 +1,66 @@
+import asyncio
+import time
+
+from src.api.disk_cache import DiskCache
+from src.api.opendota import OpenDotaAPI
+
+
+async def fill(cache: DiskCache):
+    now = time.time()
+    await cache.set("fresh", b"[1]", ttl=3600, fetched_at=now)
+    # просрочена, но ещё годится как stale-ответ
+    await cache.set("stale", b"[2]", ttl=3600, fetched_at=now - 3600 - 60)
+    await cache.set("dead", b"[3]", ttl=3600, fetched_at=now - 3600 - 7200)
+
+
+def test_purge_expired_keeps_rows_within_grace(tmp_path):
+    cache = DiskCache(tmp_path / "cache.sqlite3")
+
+    async def run():
+        await fill(cache)
+        removed = await cache.purge_expired(grace=3600)
+        return removed, [await cache.get(key) for key in ("fresh", "stale", "dead")]
+
+    removed, (fresh, stale, dead) = asyncio.run(run())
+    cache.close()
+
+    assert removed == 1
+    assert fresh.payload == [1]
+    assert stale.payload == [2]
+    assert dead is None
+
+
+def test_purge_expired_without_grace(tmp_path):
+    cache = DiskCache(tmp_path / "cache.sqlite3")
+
+    async def run():
+        await fill(cache)
+        removed = await cache.purge_expired()
+        return removed, await cache.get("fresh")
+
+    removed, fresh = asyncio.run(run())
+    cache.close()
+
+    assert removed == 2
+    assert fresh is not None
+
+
+def test_api_purges_disk_cache_periodically(tmp_path):
+    cache = DiskCache(tmp_path / "cache.sqlite3")
+    api = OpenDotaAPI(disk_cache=cache, max_staleness=3600, disk_purge_interval=0.01)
+
+    async def run():
+        await fill(cache)
+        task = asyncio.create_task(api._purge_disk_periodically())
+        await asyncio.sleep(0.05)
+        # строка, просроченная уже после первого прохода, уходит на следующем
+        await cache.set("late", b"[4]", ttl=1, fetched_at=time.time() - 3600 - 10)
+        await asyncio.sleep(0.05)
+        task.cancel()
+        return [await cache.get(key) for key in ("fresh", "stale", "dead", "late")]
+
+    fresh, stale, dead, late = asyncio.run(run())
+    cache.close()
+
+    assert fresh is not None and stale is not None
+    assert dead is None and late is None
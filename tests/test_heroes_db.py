@@ -0,0 +1,55 @@
+import ast
+import asyncio
+import shutil
+from pathlib import Path
+
+import pytest
+
+from src.data import heroes_db
+from src.data.heroes_db import HEROES_FILE, HeroDatabase, get_hero_db, reload_hero_db, set_hero_db
+from src.data.loader import HeroDataError
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture
+def hero_file(tmp_path):
+    """Копия heroes.json как текущий снимок; исходный снимок возвращается после теста"""
+    previous = get_hero_db()
+    path = tmp_path / "heroes.json"
+    shutil.copy(HEROES_FILE, path)
+    set_hero_db(HeroDatabase.load(path))
+    yield path
+    set_hero_db(previous)
+
+
+def test_reload_replaces_src_snapshot(hero_file):
+    before = get_hero_db()
+
+    reloaded = asyncio.run(reload_hero_db())
+
+    assert heroes_db.get_hero_db() is reloaded
+    assert reloaded is not before
+    assert reloaded.source == hero_file
+    assert set(reloaded.heroes) == set(before.heroes)
+
+
+def test_reload_keeps_snapshot_on_bad_file(hero_file):
+    before = get_hero_db()
+    hero_file.write_text("{not json", encoding="utf-8")
+
+    with pytest.raises(HeroDataError):
+        asyncio.run(reload_hero_db())
+
+    assert get_hero_db() is before
+
+
+@pytest.mark.parametrize("entry_point", ["bot.py", "main.py"])
+def test_entry_points_import_data_from_src(entry_point):
+    """Без префикса src. модуль грузится второй раз: reload подменил бы чужой снимок"""
+    tree = ast.parse((ROOT / entry_point).read_text(encoding="utf-8"))
+    modules = [node.module for node in tree.body if isinstance(node, ast.ImportFrom) and node.module]
+
+    bare = [m for m in modules if m.split(".")[0] in ("api", "data", "ml", "services", "utils")]
+    assert bare == []
+    assert "src.data.heroes_db" in modules
@@ -0,0 +1,117 @@
+import asyncio
+import random
+from pathlib import Path
+
+import pytest
+
+from src.data.heroes_db import HeroDatabase
+from src.ml.incremental import DIRE, RADIANT, IncrementalScorer
+from src.ml.predictor import MatchPredictor
+
+HEROES_FILE = Path(__file__).resolve().parent.parent / "src" / "data" / "heroes_extended.json"
+
+
+@pytest.fixture(scope="module")
+def db():
+    return HeroDatabase.load(HEROES_FILE)
+
+
+def random_steps(db: HeroDatabase, count: int, seed: int):
+    """Случайные add/remove/swap вокруг драфта 5 на 5, как в benchmarks/incremental.py"""
+    rng = random.Random(seed)
+    teams = {RADIANT: [], DIRE: []}
+    steps = []
+    while len(steps) < count:
+        side = rng.choice((RADIANT, DIRE))
+        team = teams[side]
+        free = [h for h in range(len(db.index)) if h not in teams[RADIANT] and h not in teams[DIRE]]
+        action = rng.choice(("add", "remove", "swap"))
+        if action == "add" and len(team) < 5:
+            hero = rng.choice(free)
+            team.append(hero)
+            steps.append(("add", side, hero))
+        elif action == "remove" and team:
+            hero = rng.choice(team)
+            team.remove(hero)
+            steps.append(("remove", side, hero))
+        elif action == "swap" and team:
+            old, new = rng.choice(team), rng.choice(free)
+            team[team.index(old)] = new
+            steps.append(("swap", side, old, new))
+    return steps, teams
+
+
+@pytest.mark.parametrize("noise", [0.0, 3.0])
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_steps_match_predict(db, noise, seed):
+    predictor = MatchPredictor(noise=noise)
+    scorer = IncrementalScorer(predictor=predictor, db=db)
+    steps, teams = random_steps(db, 300, seed)
+
+    for step in steps:
+        getattr(scorer, step[0])(*step[1:])
+        got = scorer.score()
+        want = asyncio.run(predictor.predict(scorer.heroes(RADIANT), scorer.heroes(DIRE), db))
+
+        assert got.win_probability_radiant == pytest.approx(want.win_probability_radiant, abs=1e-9)
+        assert got.win_probability_dire == pytest.approx(want.win_probability_dire, abs=1e-9)
+        assert got.synergy == pytest.approx((want.radiant.synergy_score, want.dire.synergy_score), abs=1e-9)
+        assert got.draft == pytest.approx((want.radiant.draft_score, want.dire.draft_score), abs=1e-9)
+        assert got.meta == pytest.approx((want.radiant.meta_score, want.dire.meta_score), abs=1e-9)
+
+    # замена сохраняет место героя в команде
+    assert scorer.heroes(RADIANT) == teams[RADIANT]
+    assert scorer.heroes(DIRE) == teams[DIRE]
+
+
+def test_initial_draft_matches_added_heroes(db):
+    built = IncrementalScorer([0, 5, 10], [1, 7], db=db)
+    added = IncrementalScorer(db=db)
+    for hero in (0, 5, 10):
+        added.add(RADIANT, hero)
+    for hero in (1, 7):
+        added.add(DIRE, hero)
+
+    assert built.score() == added.score()
+
+
+@pytest.mark.parametrize("side, hero", [(RADIANT, 0), (DIRE, 0), (RADIANT, 1)])
+def test_add_hero_already_in_draft(db, side, hero):
+    scorer = IncrementalScorer([0, 5], [1, 7], db=db)
+    before = scorer.score()
+
+    with pytest.raises(ValueError, match="already in the draft"):
+        scorer.add(side, hero)
+
+    assert scorer.heroes(RADIANT) == [0, 5]
+    assert scorer.heroes(DIRE) == [1, 7]
+    assert scorer.score() == before
+
+
+@pytest.mark.parametrize("side, hero", [(RADIANT, 1), (DIRE, 0), (RADIANT, 20)])
+def test_remove_hero_not_in_team(db, side, hero):
+    scorer = IncrementalScorer([0, 5], [1, 7], db=db)
+
+    with pytest.raises(ValueError, match="is not in"):
+        scorer.remove(side, hero)
+
+    assert scorer.heroes(RADIANT) == [0, 5]
+    assert scorer.heroes(DIRE) == [1, 7]
+
+
+@pytest.mark.parametrize("old, new, message", [
+    (1, 20, "is not in"),
+    (20, 21, "is not in"),
+    (0, 5, "already in the draft"),
+    (0, 7, "already in the draft"),
+])
+def test_swap_errors_leave_draft_unchanged(db, old, new, message):
+    scorer = IncrementalScorer([0, 5], [1, 7], db=db)
+    before = scorer.score()
+
+    with pytest.raises(ValueError, match=message):
+        scorer.swap(RADIANT, old, new)
+
+    assert scorer.heroes(RADIANT) == [0, 5]
+    assert scorer.heroes(DIRE) == [1, 7]
+    assert scorer.score() == before
@@ -0,0 +1,94 @@
+import asyncio
+import random
+from pathlib import Path
+
+import pytest
+
+from src.data.heroes_db import HeroDatabase
+from src.ml.incremental import DIRE, RADIANT
+from src.ml.predictor import MatchPredictor
+from src.services.pick_service import PickService
+
+HEROES_FILE = Path(__file__).resolve().parent.parent / "src" / "data" / "heroes_extended.json"
+
+
+@pytest.fixture(scope="module")
+def db():
+    return HeroDatabase.load(HEROES_FILE)
+
+
+def random_draft(db: HeroDatabase, seed: int):
+    rng = random.Random(seed)
+    picked = rng.sample(range(len(db.index)), 9)
+    size = rng.randint(0, 4)
+    return picked[:size], picked[4:4 + rng.randint(1, 5)]
+
+
+def counter_pair(db: HeroDatabase):
+    """(герой, враг), где герой силён против врага по графу контрпиков"""
+    heroes = db.index.heroes
+    for hero in range(len(heroes)):
+        for enemy in range(len(heroes)):
+            if hero != enemy and db.counter_graph.matchup(heroes[hero].id, heroes[enemy].id) == (False, True):
+                return hero, enemy
+    pytest.skip("no counter pairs in the hero graph")
+
+
+@pytest.mark.parametrize("side", [RADIANT, DIRE])
+@pytest.mark.parametrize("noise", [0.0, 3.0])
+@pytest.mark.parametrize("seed", range(5))
+def test_rank_picks_matches_predict(db, side, noise, seed):
+    allies, enemies = random_draft(db, seed)
+    predictor = MatchPredictor(noise=noise)
+
+    picks = PickService.rank_picks(allies, enemies, side, predictor, db)
+
+    async def predict(team):
+        if side == RADIANT:
+            return await predictor.predict(team, enemies, db)
+        return await predictor.predict(enemies, team, db)
+
+    base = asyncio.run(predict(list(allies)))
+    base_win = base.win_probability_radiant if side == RADIANT else base.win_probability_dire
+    base_team = base.radiant if side == RADIANT else base.dire
+
+    for pick in picks:
+        want = asyncio.run(predict(list(allies) + [pick.index]))
+        win = want.win_probability_radiant if side == RADIANT else want.win_probability_dire
+        team = want.radiant if side == RADIANT else want.dire
+
+        assert pick.win_probability == pytest.approx(win, abs=1e-9)
+        assert pick.win_delta == pytest.approx(win - base_win, abs=1e-9)
+        assert pick.synergy == pytest.approx(team.synergy_score - base_team.synergy_score, abs=1e-9)
+        assert pick.draft == pytest.approx(team.draft_score - base_team.draft_score, abs=1e-9)
+        assert pick.meta == pytest.approx(team.meta_score - base_team.meta_score, abs=1e-9)
+
+
+@pytest.mark.parametrize("side", [RADIANT, DIRE])
+def test_taken_heroes_are_excluded(db, side):
+    allies, enemies = [0, 5, 10], [1, 7, 11]
+
+    picks = PickService.rank_picks(allies, enemies, side, db=db)
+
+    assert {pick.index for pick in picks} == set(range(len(db.index))) - set(allies) - set(enemies)
+    assert [pick.win_probability for pick in picks] == sorted((pick.win_probability for pick in picks), reverse=True)
+
+
+def test_counter_is_from_allies_side(db):
+    """Контрпик врага улучшает матчапы союзников за любую сторону"""
+    hero, enemy = counter_pair(db)
+
+    radiant = {pick.index: pick for pick in PickService.rank_picks([], [enemy], RADIANT, db=db)}
+    dire = {pick.index: pick for pick in PickService.rank_picks([], [enemy], DIRE, db=db)}
+
+    assert radiant[hero].counter > 0
+    assert dire[hero].counter == pytest.approx(radiant[hero].counter)
+
+
+def test_suggest_picks_takes_best(db):
+    allies, enemies = [0, 5], [1, 7, 11]
+
+    picks = PickService.rank_picks(allies, enemies, DIRE, db=db)
+    top = PickService.suggest_picks(allies, enemies, limit=3, side=DIRE, db=db)
+
+    assert [pick.index for pick in top] == [pick.index for pick in picks[:3]]
@@ -0,0 +1,71 @@
+import asyncio
+import time
+
+import pytest
+
+from src.api.rate_limiter import RateLimiter, RateLimitExceeded
+
+
+def drained_limiter(per_second: float, max_wait: float) -> RateLimiter:
+    """Лимитер без свободных токенов: каждый запрос ждёт 1 / per_second секунд за предыдущим"""
+    limiter = RateLimiter(per_minute=int(per_second * 60), per_day=100000, max_wait=max_wait)
+    limiter.per_minute.tokens = 0.0
+    return limiter
+
+
+async def timed_acquire(limiter: RateLimiter):
+    start = time.monotonic()
+    try:
+        await limiter.acquire()
+        return True, time.monotonic() - start
+    except RateLimitExceeded:
+        return False, time.monotonic() - start
+
+
+def test_burst_fails_fast_after_max_wait():
+    limiter = drained_limiter(per_second=20, max_wait=0.12)
+
+    async def run():
+        return await asyncio.gather(*(timed_acquire(limiter) for _ in range(6)))
+
+    results = asyncio.run(run())
+    granted = [elapsed for ok, elapsed in results if ok]
+    rejected = [elapsed for ok, elapsed in results if not ok]
+
+    # слоты через 0.05 и 0.10 с укладываются в max_wait, остальные — нет
+    assert len(granted) == 2
+    assert max(granted) < 0.12 + 0.05
+    # отказ сразу, без очереди за теми, кто уже ждёт
+    assert len(rejected) == 4
+    assert max(rejected) < 0.02
+
+
+def test_rejected_requests_do_not_reserve_slots():
+    limiter = drained_limiter(per_second=20, max_wait=0.06)
+
+    async def run():
+        first = await asyncio.gather(*(timed_acquire(limiter) for _ in range(5)))
+        second = await timed_acquire(limiter)
+        return first, second
+
+    first, (ok, elapsed) = asyncio.run(run())
+
+    assert [ok for ok, _ in first] == [True, False, False, False, False]
+    # после первого запроса очередь пуста: следующий ждёт один интервал, а не пять
+    assert ok
+    assert elapsed < 0.05 + 0.03
+
+
+def test_pause_during_wait_respects_deadline():
+    limiter = drained_limiter(per_second=20, max_wait=0.1)
+
+    async def run():
+        task = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0.01)
+        limiter.pause(1.0)
+        with pytest.raises(RateLimitExceeded):
+            await task
+
+    start = time.monotonic()
+    asyncio.run(run())
+    assert time.monotonic() - start < 0.1 + 0.05
@@ -0,0 +1,100 @@
+from pathlib import Path
+
+import pytest
+
+from src.data.heroes_db import HeroDatabase
+from src.ml.incremental import DIRE, RADIANT, IncrementalScorer
+from src.services.whatif_service import ADD, REMOVE, SWAP, DraftChange, WhatIfService
+
+HEROES_FILE = Path(__file__).resolve().parent.parent / "src" / "data" / "heroes_extended.json"
+
+
+@pytest.fixture(scope="module")
+def db():
+    return HeroDatabase.load(HEROES_FILE)
+
+
+def hero(db: HeroDatabase, name: str) -> int:
+    return db.index.of(db.by_name[name])
+
+
+@pytest.fixture
+def scorer(db):
+    radiant = [hero(db, name) for name in ("kez", "faceless_void", "slardar")]
+    dire = [hero(db, name) for name in ("muerta", "ember_spirit")]
+    return IncrementalScorer(radiant, dire, db=db)
+
+
+@pytest.mark.parametrize("text, changes", [
+    ("void>lion -kez +shaman", ["void>lion", "-kez", "+shaman"]),
+    (" void > lion  -kez ", ["void>lion", "-kez"]),
+    ("", []),
+])
+def test_split_changes(text, changes):
+    assert WhatIfService.split_changes(text) == changes
+
+
+def test_swap_keeps_position(db, scorer):
+    change = WhatIfService.apply_change(scorer, "void>lion", db)
+
+    assert change == DraftChange(SWAP, RADIANT, hero(db, "faceless_void"), hero(db, "lion"))
+    assert db.index.names(scorer.heroes(RADIANT)) == ["Kez", "Lion", "Slardar"]
+    assert WhatIfService.describe_change(change, db) == "🔁 Faceless Void → Lion (Свет)"
+
+
+def test_swap_on_dire(db, scorer):
+    change = WhatIfService.apply_change(scorer, "ember>tide", db)
+
+    assert change == DraftChange(SWAP, DIRE, hero(db, "ember_spirit"), hero(db, "tidehunter"))
+    assert db.index.names(scorer.heroes(DIRE)) == ["Muerta", "Tidehunter"]
+
+
+def test_remove(db, scorer):
+    change = WhatIfService.apply_change(scorer, "-muerta", db)
+
+    assert change == DraftChange(REMOVE, DIRE, hero(db, "muerta"))
+    assert db.index.names(scorer.heroes(DIRE)) == ["Ember Spirit"]
+    assert WhatIfService.describe_change(change, db) == "➖ Muerta (Тьма)"
+
+
+def test_add_goes_to_smaller_team(db, scorer):
+    first = WhatIfService.apply_change(scorer, "+shaman", db)
+    # команды сравнялись — следующий герой уходит Свету
+    second = WhatIfService.apply_change(scorer, "+lich", db)
+
+    assert first == DraftChange(ADD, DIRE, hero(db, "shadow_shaman"))
+    assert second == DraftChange(ADD, RADIANT, hero(db, "lich"))
+    assert WhatIfService.describe_change(first, db) == "➕ Shadow Shaman (Тьма)"
+
+
+@pytest.mark.parametrize("change", [
+    "void>nosuchhero",
+    "-nosuchhero",
+    "lion>pudge",       # lion не в драфте
+    "void>muerta",      # muerta уже у Тьмы
+    "+kez",             # kez уже у Света
+    "-lion",
+    "+void>lion",
+    "-void>lion",
+    "void>lion>pudge",
+    "lion",             # без знака и без замены
+])
+def test_rejected_changes_leave_draft_unchanged(db, scorer, change):
+    radiant, dire = scorer.heroes(RADIANT), scorer.heroes(DIRE)
+
+    assert WhatIfService.apply_change(scorer, change, db) is None
+    assert scorer.heroes(RADIANT) == radiant
+    assert scorer.heroes(DIRE) == dire
+
+
+def test_format_whatif_lists_changes(db, scorer):
+    before = scorer.score()
+    changes = [
+        WhatIfService.describe_change(WhatIfService.apply_change(scorer, change, db), db)
+        for change in WhatIfService.split_changes("void > lion +shaman")
+    ]
+    text = WhatIfService.format_whatif(scorer, changes, before, scorer.score(), db)
+
+    assert "🔁 Faceless Void → Lion (Свет)" in text
+    assert "🟢 *Свет:* Kez, Lion, Slardar" in text
+    assert "🔴 *Тьма:* Muerta, Ember Spirit, Shadow Shaman" in text